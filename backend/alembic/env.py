@@ -25,6 +25,12 @@ load_dotenv()
 # import models
 from app.db.database import Base
 from app.models.callback import Callback
+from app.models.callback_archive import CallbackArchive
+from app.models.callback_history import CallbackHistory
+from app.models.callback_stats import CallbackStat
+from app.models.callback_tombstone import CallbackTombstone
+from app.models.callback_reminder import CallbackReminder
+from app.models.job import Job
 
 # Override sqlalchemy.url with DATABASE_URL from environment
 database_url = os.getenv("DATABASE_URL", "sqlite:///./autoxpress_crm.db")
@@ -34,6 +40,25 @@ config.set_main_option("sqlalchemy.url", database_url)
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Objects created by raw DDL rather than declared on the metadata, which
+# autogenerate would otherwise propose to drop: the SQLite FTS5 search table
+# and its shadow tables and the PostgreSQL trigram indexes (SQLITE_SEARCH_DDL
+# and POSTGRESQL_SEARCH_DDL in app.models.callback), and the change feed log
+# that PostgresBroker creates (app.core.events).
+UNMANAGED_TABLE_PREFIXES = ("callbacks_fts",)
+UNMANAGED_TABLES = {"callback_event_log"}
+UNMANAGED_INDEX_SUFFIXES = ("_trgm",)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if not reflected or compare_to is not None:
+        return True
+    if type_ == "table":
+        return name not in UNMANAGED_TABLES and not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    if type_ == "index":
+        return not name.endswith(UNMANAGED_INDEX_SUFFIXES)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -58,6 +83,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -79,7 +105,8 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,24 @@
+"""Add keyset pagination index
+
+Revision ID: 8c1d4e2a9b7f
+Revises: 3f9b025794eb
+Create Date: 2026-10-17 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1d4e2a9b7f'
+down_revision = '3f9b025794eb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_callbacks_follow_up_keyset', 'callbacks', ['follow_up_date', 'last_modified', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_callbacks_follow_up_keyset', table_name='callbacks')
@@ -0,0 +1,56 @@
+"""Add background job queue and follow-up reminders tables
+
+Revision ID: a7d2e94c1b38
+Revises: f3c5d81e2a96
+Create Date: 2026-10-17 18:41:07.215334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e94c1b38'
+down_revision = 'f3c5d81e2a96'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=100), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_claim', 'jobs', ['status', 'kind', 'run_after', 'id'], unique=False)
+    op.create_index(op.f('ix_jobs_dedupe_key'), 'jobs', ['dedupe_key'], unique=False)
+    op.create_table('callback_reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('callback_id', sa.Integer(), nullable=False),
+    sa.Column('agent_name', sa.String(length=100), nullable=True),
+    sa.Column('remind_on', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('callback_id', 'remind_on', name='uq_callback_reminders_callback_date')
+    )
+    op.create_index(op.f('ix_callback_reminders_agent_name'), 'callback_reminders', ['agent_name'], unique=False)
+    op.create_index(op.f('ix_callback_reminders_remind_on'), 'callback_reminders', ['remind_on'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_callback_reminders_remind_on'), table_name='callback_reminders')
+    op.drop_index(op.f('ix_callback_reminders_agent_name'), table_name='callback_reminders')
+    op.drop_table('callback_reminders')
+    op.drop_index(op.f('ix_jobs_dedupe_key'), table_name='jobs')
+    op.drop_index('ix_jobs_claim', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,73 @@
+"""Never reuse callback ids on SQLite
+
+Revision ID: a9e3d5c7f214
+Revises: f7a2c9d4e168
+Create Date: 2026-10-18 14:05:12.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e3d5c7f214'
+down_revision = 'f7a2c9d4e168'
+branch_labels = None
+depends_on = None
+
+OPEN_STATUS_CLAUSE = "status IN ('Pending', 'No Answer', 'Follow-up Later')"
+
+SQLITE_DIGITS = (
+    "replace(replace(replace(replace(replace(replace("
+    "{row}.callback_number, '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+)
+SQLITE_FTS_INSERT = (
+    "INSERT INTO callbacks_fts(rowid, customer_name, car_make, car_model, callback_number, comments, callback_digits) "
+    "VALUES (new.id, new.customer_name, new.car_make, new.car_model, new.callback_number, new.comments, "
+    + SQLITE_DIGITS.format(row="new") + ");"
+)
+
+
+def _rebuild_callbacks(autoincrement):
+    # SQLite cannot alter a table's primary key, so the table is copied. The
+    # copy drops what batch mode cannot reflect: the search triggers and the
+    # expression index of the claim queue. Both are created again below.
+    with op.batch_alter_table('callbacks', recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    op.create_index(
+        'ix_callbacks_claim_queue', 'callbacks', ['follow_up_date', sa.text('coalesce(lead_score, -1) DESC'), 'id'],
+        unique=False, sqlite_where=sa.text(OPEN_STATUS_CLAUSE)
+    )
+    op.execute("CREATE TRIGGER callbacks_fts_ai AFTER INSERT ON callbacks BEGIN " + SQLITE_FTS_INSERT + " END")
+    op.execute(
+        "CREATE TRIGGER callbacks_fts_ad AFTER DELETE ON callbacks BEGIN "
+        "DELETE FROM callbacks_fts WHERE rowid = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER callbacks_fts_au AFTER UPDATE OF "
+        "customer_name, car_make, car_model, callback_number, comments ON callbacks BEGIN "
+        "DELETE FROM callbacks_fts WHERE rowid = old.id; " + SQLITE_FTS_INSERT + " END"
+    )
+
+
+def upgrade():
+    # PostgreSQL sequences never hand out an id twice
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild_callbacks(True)
+    # Start after every id already used, including deleted and archived callbacks
+    # whose history, tombstones and archive rows still carry their ids
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'callbacks'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'callbacks', max("
+        "(SELECT coalesce(max(id), 0) FROM callbacks), "
+        "(SELECT coalesce(max(id), 0) FROM callbacks_archive), "
+        "(SELECT coalesce(max(callback_id), 0) FROM callback_tombstones), "
+        "(SELECT coalesce(max(callback_id), 0) FROM callback_history))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild_callbacks(False)
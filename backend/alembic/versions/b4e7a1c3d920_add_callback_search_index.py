@@ -0,0 +1,81 @@
+"""Add callback search index
+
+Revision ID: b4e7a1c3d920
+Revises: 8c1d4e2a9b7f
+Create Date: 2026-10-17 11:03:27.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e7a1c3d920'
+down_revision = '8c1d4e2a9b7f'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_DIGITS = (
+    "replace(replace(replace(replace(replace(replace("
+    "{row}.callback_number, '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+)
+SQLITE_FTS_INSERT = (
+    "INSERT INTO callbacks_fts(rowid, customer_name, car_make, car_model, callback_number, comments, callback_digits) "
+    "VALUES (new.id, new.customer_name, new.car_make, new.car_model, new.callback_number, new.comments, "
+    + SQLITE_DIGITS.format(row="new") + ");"
+)
+
+TRGM_COLUMNS = ['customer_name', 'car_make', 'car_model', 'callback_number', 'comments']
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE callbacks_fts USING fts5("
+            "customer_name, car_make, car_model, callback_number, comments, callback_digits, tokenize='trigram')"
+        )
+        op.execute(
+            "INSERT INTO callbacks_fts(rowid, customer_name, car_make, car_model, callback_number, comments, callback_digits) "
+            "SELECT id, customer_name, car_make, car_model, callback_number, comments, "
+            + SQLITE_DIGITS.format(row="callbacks") + " FROM callbacks"
+        )
+        op.execute("CREATE TRIGGER callbacks_fts_ai AFTER INSERT ON callbacks BEGIN " + SQLITE_FTS_INSERT + " END")
+        op.execute(
+            "CREATE TRIGGER callbacks_fts_ad AFTER DELETE ON callbacks BEGIN "
+            "DELETE FROM callbacks_fts WHERE rowid = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER callbacks_fts_au AFTER UPDATE OF "
+            "customer_name, car_make, car_model, callback_number, comments ON callbacks BEGIN "
+            "DELETE FROM callbacks_fts WHERE rowid = old.id; " + SQLITE_FTS_INSERT + " END"
+        )
+
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in TRGM_COLUMNS:
+            op.create_index(
+                f'ix_callbacks_{column}_trgm', 'callbacks', [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+        op.execute(
+            "CREATE INDEX ix_callbacks_callback_digits_trgm ON callbacks "
+            "USING gin ((regexp_replace(callback_number, '\\D', '', 'g')) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER callbacks_fts_au")
+        op.execute("DROP TRIGGER callbacks_fts_ad")
+        op.execute("DROP TRIGGER callbacks_fts_ai")
+        op.execute("DROP TABLE callbacks_fts")
+
+    elif dialect == 'postgresql':
+        op.drop_index('ix_callbacks_callback_digits_trgm', table_name='callbacks')
+        for column in TRGM_COLUMNS:
+            op.drop_index(f'ix_callbacks_{column}_trgm', table_name='callbacks')
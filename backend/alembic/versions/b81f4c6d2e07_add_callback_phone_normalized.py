@@ -0,0 +1,75 @@
+"""Add normalized phone number column for duplicate lookups
+
+Revision ID: b81f4c6d2e07
+Revises: a7d2e94c1b38
+Create Date: 2026-10-17 19:26:44.803152
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81f4c6d2e07'
+down_revision = 'a7d2e94c1b38'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(number):
+    # Frozen copy of app.core.phone.normalize_phone as of this revision, so
+    # later changes to the app's rules do not alter what this backfill writes
+    if not number:
+        return None
+    digits = _NON_DIGITS.sub('', number)
+    if not digits:
+        return None
+    stripped = number.strip()
+    country = settings.DEFAULT_PHONE_COUNTRY_CODE
+    if stripped.startswith('+'):
+        return '+' + digits
+    if stripped.startswith('00') and len(digits) > 10:
+        return '+' + digits[2:]
+    if len(digits) == 10:
+        return '+' + country + digits
+    if len(digits) == 10 + len(country) and digits.startswith(country):
+        return '+' + digits
+    return digits
+
+
+def upgrade():
+    op.add_column('callbacks', sa.Column('phone_normalized', sa.String(length=20), nullable=True))
+
+    # Backfill in id order, one executemany per batch
+    callbacks = sa.table('callbacks', sa.column('id', sa.Integer), sa.column('callback_number', sa.String),
+                         sa.column('phone_normalized', sa.String))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(callbacks.c.id, callbacks.c.callback_number)
+            .where(callbacks.c.id > last_id).order_by(callbacks.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            callbacks.update().where(callbacks.c.id == sa.bindparam('row_id'))
+            .values(phone_normalized=sa.bindparam('normalized')),
+            [{'row_id': row.id, 'normalized': normalize_phone(row.callback_number)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    op.create_index(op.f('ix_callbacks_phone_normalized'), 'callbacks', ['phone_normalized'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_callbacks_phone_normalized'), table_name='callbacks')
+    op.drop_column('callbacks', 'phone_normalized')
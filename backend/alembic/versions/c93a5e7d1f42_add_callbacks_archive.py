@@ -0,0 +1,53 @@
+"""Add callbacks_archive for closed callbacks
+
+Revision ID: c93a5e7d1f42
+Revises: b81f4c6d2e07
+Create Date: 2026-10-17 20:41:08.217364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c93a5e7d1f42'
+down_revision = 'b81f4c6d2e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Partitions are created by archive_callbacks for each year it moves rows into
+    partitioned = settings.ARCHIVE_PARTITIONED and op.get_bind().dialect.name == 'postgresql'
+    op.create_table('callbacks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('product', sa.String(length=255), nullable=True),
+    sa.Column('vehicle_year', sa.Integer(), nullable=True),
+    sa.Column('car_make', sa.String(length=100), nullable=True),
+    sa.Column('car_model', sa.String(length=100), nullable=True),
+    sa.Column('zip_code', sa.String(length=10), nullable=True),
+    sa.Column('customer_name', sa.String(length=255), nullable=False),
+    sa.Column('callback_number', sa.String(length=20), nullable=False),
+    sa.Column('phone_normalized', sa.String(length=20), nullable=True),
+    sa.Column('follow_up_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('agent_name', sa.String(length=100), nullable=True),
+    sa.Column('lead_score', sa.Float(), nullable=True),
+    sa.Column('comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_modified', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_modified_by', sa.String(length=100), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    **({'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {})
+    )
+    op.create_index('ix_callbacks_archive_follow_up_keyset', 'callbacks_archive', ['follow_up_date', 'last_modified', 'id'], unique=False)
+    op.create_index('ix_callbacks_archive_phone_normalized', 'callbacks_archive', ['phone_normalized'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_callbacks_archive_phone_normalized', table_name='callbacks_archive')
+    op.drop_index('ix_callbacks_archive_follow_up_keyset', table_name='callbacks_archive')
+    op.drop_table('callbacks_archive')
@@ -0,0 +1,44 @@
+"""Add callback_stats summary table
+
+Revision ID: d2f8c6a41e57
+Revises: b4e7a1c3d920
+Create Date: 2026-10-17 14:36:51.227480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f8c6a41e57'
+down_revision = 'b4e7a1c3d920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('callback_stats',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('lead_score_sum', sa.Float(), nullable=False),
+    sa.Column('lead_score_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+
+    # Backfill from the existing callbacks
+    for dimension, column in [('status', 'status'), ('agent', 'agent_name'), ('follow_up_date', 'follow_up_date')]:
+        op.execute(
+            "INSERT INTO callback_stats (dimension, value, count, lead_score_sum, lead_score_count) "
+            f"SELECT '{dimension}', COALESCE(CAST({column} AS VARCHAR(100)), ''), COUNT(*), "
+            "COALESCE(SUM(lead_score), 0.0), COUNT(lead_score) "
+            f"FROM callbacks GROUP BY COALESCE(CAST({column} AS VARCHAR(100)), '')"
+        )
+    op.execute(
+        "INSERT INTO callback_stats (dimension, value, count, lead_score_sum, lead_score_count) "
+        "SELECT 'total', '', COUNT(*), COALESCE(SUM(lead_score), 0.0), COUNT(lead_score) FROM callbacks"
+    )
+
+
+def downgrade():
+    op.drop_table('callback_stats')
@@ -0,0 +1,39 @@
+"""Add callback_history for field-level change history
+
+Revision ID: d4b8f2a6c315
+Revises: c93a5e7d1f42
+Create Date: 2026-10-17 21:18:52.604913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b8f2a6c315'
+down_revision = 'c93a5e7d1f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('callback_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('callback_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('from_status', sa.String(length=50), nullable=True),
+    sa.Column('to_status', sa.String(length=50), nullable=True),
+    sa.Column('agent_name', sa.String(length=100), nullable=True),
+    sa.Column('changed_by', sa.String(length=100), nullable=True),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_callback_history_callback', 'callback_history', ['callback_id', 'id'], unique=False)
+    op.create_index('ix_callback_history_transitions', 'callback_history', ['changed_at', 'from_status', 'to_status', 'agent_name'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_callback_history_transitions', table_name='callback_history')
+    op.drop_index('ix_callback_history_callback', table_name='callback_history')
+    op.drop_table('callback_history')
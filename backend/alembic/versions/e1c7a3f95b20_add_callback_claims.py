@@ -0,0 +1,36 @@
+"""Add callback claim columns and claim queue index
+
+Revision ID: e1c7a3f95b20
+Revises: d4b8f2a6c315
+Create Date: 2026-10-17 23:04:17.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1c7a3f95b20'
+down_revision = 'd4b8f2a6c315'
+branch_labels = None
+depends_on = None
+
+
+OPEN_STATUS_CLAUSE = "status IN ('Pending', 'No Answer', 'Follow-up Later')"
+
+
+def upgrade():
+    op.add_column('callbacks', sa.Column('claimed_by', sa.String(length=100), nullable=True))
+    op.add_column('callbacks', sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_callbacks_claim_queue', 'callbacks', ['follow_up_date', sa.text('coalesce(lead_score, -1) DESC'), 'id'],
+        unique=False, sqlite_where=sa.text(OPEN_STATUS_CLAUSE), postgresql_where=sa.text(OPEN_STATUS_CLAUSE)
+    )
+    # Give the planner row counts for the new index
+    op.execute('ANALYZE callbacks')
+
+
+def downgrade():
+    op.drop_index('ix_callbacks_claim_queue', table_name='callbacks')
+    op.drop_column('callbacks', 'claimed_until')
+    op.drop_column('callbacks', 'claimed_by')
@@ -0,0 +1,42 @@
+"""Add callback filter indexes
+
+Revision ID: e6a93b1f7c24
+Revises: d2f8c6a41e57
+Create Date: 2026-10-17 16:08:42.731264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a93b1f7c24'
+down_revision = 'd2f8c6a41e57'
+branch_labels = None
+depends_on = None
+
+
+OPEN_STATUS_CLAUSE = "status IN ('Pending', 'No Answer', 'Follow-up Later')"
+
+KEYSET_INDEXES = {
+    'ix_callbacks_status_keyset': ['status', 'follow_up_date', 'last_modified', 'id'],
+    'ix_callbacks_agent_keyset': ['agent_name', 'follow_up_date', 'last_modified', 'id'],
+    'ix_callbacks_agent_status_keyset': ['agent_name', 'status', 'follow_up_date', 'last_modified', 'id'],
+}
+
+
+def upgrade():
+    for name, columns in KEYSET_INDEXES.items():
+        op.create_index(name, 'callbacks', columns, unique=False)
+    op.create_index(
+        'ix_callbacks_open_follow_up', 'callbacks', ['follow_up_date', 'id'], unique=False,
+        sqlite_where=sa.text(OPEN_STATUS_CLAUSE), postgresql_where=sa.text(OPEN_STATUS_CLAUSE)
+    )
+    # Give the planner row counts for the new indexes
+    op.execute('ANALYZE callbacks')
+
+
+def downgrade():
+    op.drop_index('ix_callbacks_open_follow_up', table_name='callbacks')
+    for name in reversed(list(KEYSET_INDEXES)):
+        op.drop_index(name, table_name='callbacks')
@@ -0,0 +1,33 @@
+"""Add callback tombstones and last_modified index for incremental sync
+
+Revision ID: f3c5d81e2a96
+Revises: e6a93b1f7c24
+Create Date: 2026-10-17 17:02:15.448120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c5d81e2a96'
+down_revision = 'e6a93b1f7c24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('callback_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('callback_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_callback_tombstones_deleted_keyset', 'callback_tombstones', ['deleted_at', 'id'], unique=False)
+    op.create_index('ix_callbacks_last_modified_keyset', 'callbacks', ['last_modified', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_callbacks_last_modified_keyset', table_name='callbacks')
+    op.drop_index('ix_callback_tombstones_deleted_keyset', table_name='callback_tombstones')
+    op.drop_table('callback_tombstones')
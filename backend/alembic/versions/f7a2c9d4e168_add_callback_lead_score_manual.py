@@ -0,0 +1,26 @@
+"""Add callbacks.lead_score_manual
+
+Revision ID: f7a2c9d4e168
+Revises: e1c7a3f95b20
+Create Date: 2026-10-18 09:12:40.551873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a2c9d4e168'
+down_revision = 'e1c7a3f95b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('callbacks', sa.Column('lead_score_manual', sa.Boolean(), server_default=sa.false(), nullable=False))
+    # Existing scores were set by clients; keep the scoring job from overwriting them
+    op.execute("UPDATE callbacks SET lead_score_manual = (lead_score IS NOT NULL)")
+
+
+def downgrade():
+    op.drop_column('callbacks', 'lead_score_manual')
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from app.api.endpoints import callbacks
+from app.api.endpoints import callbacks, system
 
 api_router = APIRouter()
-api_router.include_router(callbacks.router, prefix="/callbacks", tags=["callbacks"])
\ No newline at end of file
+api_router.include_router(callbacks.router, prefix="/callbacks", tags=["callbacks"])
+api_router.include_router(system.router, prefix="/system", tags=["system"])
\ No newline at end of file
@@ -1,27 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
 
-from app.db.database import get_db
-from app.crud import get_callback, get_callbacks, create_callback, update_callback, delete_callback, search_callbacks
-from app.schemas.callback import CallbackCreate, CallbackResponse, CallbackUpdate, CallbackFilterParams
+from app.core import metrics
+from app.core.config import settings
+from app.core.ratelimit import rate_limit
+from app.core.singleflight import SingleFlight
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db, replica_lag
+from app.crud import callback_cache, callback_events
+from app.crud.callback_async import get_callback, get_callbacks, create_callback, update_callback, delete_callback, search_callbacks, stream_callbacks, get_callback_stats, bulk_update_callbacks, bulk_delete_callbacks, get_changes, enqueue_scoring, get_reminders, find_duplicates, get_duplicate_groups, merge_callbacks, enqueue_dedupe, enqueue_archive, is_archived, get_history, get_status_transitions, claim_next_callback, release_callback
+from app.schemas.callback import CallbackCreate, CallbackResponse, CallbackUpdate, CallbackFilterParams, CallbackImportResult, CallbackStats, CallbackBulkSelection, CallbackBulkUpdate, CallbackBulkResult, CallbackChanges, CallbackScoreRequest, CallbackJobAccepted, CallbackReminderResponse, CallbackDuplicateGroup, CallbackMerge, CallbackHistoryEntry, CallbackStatusTransition, CallbackClaimRequest, CallbackClaim, CallbackRelease
+from app.services.callback_export import EXPORT_COLUMNS, EXPORT_MEDIA_TYPES, aiter_export
+from app.services.callback_import import CallbackImporter, CONTENT_TYPE_FORMATS, IMPORT_FORMATS, make_record_parser
+from app.services.callback_serialization import dumps, rows_to_json, select_columns
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.get("/", response_model=List[CallbackResponse])
-def read_callbacks(
+_callback_adapter = TypeAdapter(CallbackResponse)
+
+_in_flight = SingleFlight()
+
+FIELDS_DESCRIPTION = "Comma-separated response fields to return (id is always included); defaults to all"
+ARCHIVED_DESCRIPTION = "Also return closed callbacks moved to the archive"
+
+
+def _response_columns(fields: Optional[str]) -> List[str]:
+    try:
+        return select_columns(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def _coalesced(route: str, key, load):
+    """
+    Run load(), sharing it with identical requests already in flight in this worker
+    """
+    if not settings.COALESCE_ENABLED:
+        return await load()
+    result, shared = await _in_flight.do((route, key), load)
+    if shared:
+        metrics.requests_coalesced.inc(1, route)
+    return result
+
+
+async def _not_found(db: AsyncSession, callback_id: int) -> HTTPException:
+    """
+    404 for an unknown callback, 410 for one moved to the archive
+    """
+    if await is_archived(db, callback_id):
+        return HTTPException(status_code=410, detail="Callback archived")
+    return HTTPException(status_code=404, detail="Callback not found")
+
+
+def _cached_json_response(request: Request, entry: dict) -> Response:
+    """
+    Serve a cached JSON body, or 304 with no body when the client's ETag matches
+    """
+    headers = {"ETag": entry["etag"]}
+    if entry.get("next_cursor"):
+        headers[NEXT_CURSOR_HEADER] = entry["next_cursor"]
+    if _etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+@router.get("/", response_model=List[CallbackResponse], dependencies=[Depends(rate_limit("list"))])
+async def read_callbacks(
+    request: Request,
     follow_up_date_start: Optional[date] = None,
     follow_up_date_end: Optional[date] = None,
     status: Optional[str] = None,
     agent_name: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Retrieve all callbacks with optional filtering
+    Retrieve all callbacks with optional filtering.
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one.
+    Pages are cached until a write touches a matching row and carry an ETag;
+    identical requests arriving while the page is being read share that read.
+    Rows are read as plain tuples and encoded directly, without per-row validation.
     """
     filters = CallbackFilterParams(
         follow_up_date_start=follow_up_date_start,
@@ -30,73 +106,446 @@ def read_callbacks(
         agent_name=agent_name
     )
     
-    callbacks = get_callbacks(db, skip=skip, limit=limit, filters=filters)
-    return callbacks
+    columns = _response_columns(fields)
+    key = callback_cache.list_cache_key(filters, skip, limit, cursor, columns, include_archived)
+    entry = callback_cache.lookup(key)
+    if entry is None:
+        lag = replica_lag(db)
+        token = callback_cache.begin_read(lag)
+
+        async def load() -> dict:
+            try:
+                rows, next_cursor = await get_callbacks(
+                    db, skip=skip, limit=limit, filters=filters, cursor=cursor, columns=columns,
+                    include_archived=include_archived
+                )
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            return callback_cache.store(key, rows_to_json(rows, columns), next_cursor, token)
+
+        # Only join reads started after the last write and on the same kind of database
+        entry = await _coalesced("list", (key, token, lag), load)
+    return _cached_json_response(request, entry)
+
+
+@router.get("/stats", response_model=CallbackStats)
+async def read_callback_stats(
+    today: Optional[date] = Query(None, description="Date the follow-up buckets are relative to; defaults to the server's date"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Counts by status, agent and follow-up bucket (overdue/today/upcoming/unscheduled)
+    plus the average lead score, served from the incrementally maintained summary table
+    """
+    return await get_callback_stats(db, today=today)
+
+
+@router.get("/export")
+async def export_callbacks(
+    follow_up_date_start: Optional[date] = None,
+    follow_up_date_end: Optional[date] = None,
+    status: Optional[str] = None,
+    agent_name: Optional[str] = None,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Stream every callback matching the filters as NDJSON or CSV, in id order.
+    Rows are read from a server-side cursor and written as they arrive.
+    """
+    filters = CallbackFilterParams(
+        follow_up_date_start=follow_up_date_start,
+        follow_up_date_end=follow_up_date_end,
+        status=status,
+        agent_name=agent_name
+    )
+    batches = stream_callbacks(db, EXPORT_COLUMNS, filters=filters)
+    return StreamingResponse(
+        aiter_export(batches, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="callbacks.{fmt}"'}
+    )
+
+
+@router.get("/changes", response_model=CallbackChanges)
+async def read_callback_changes(
+    since: Optional[str] = Query(None, description="`next` from the previous call, or an ISO timestamp; omit for a full snapshot"),
+    limit: int = Query(1000, ge=1, le=10000),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Callbacks created or updated, and ids deleted, since a high-water mark.
+    Keep calling with `next` while `has_more` is true.
+    """
+    columns = _response_columns(fields)
+    try:
+        changes = await get_changes(db, since=since, limit=limit, columns=columns)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    changes["upserts"] = [dict(zip(columns, row)) for row in changes["upserts"]]
+    return Response(content=dumps(changes), media_type="application/json")
+
+
+def _sse_message(event: Optional[dict]) -> bytes:
+    """
+    Encode a change event as a server-sent event; None becomes a keepalive comment
+    """
+    if event is None:
+        return b": keepalive\n\n"
+    data = {key: value for key, value in event.items() if key != "id"}
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event["id"], event["type"].encode(), dumps(data))
+
+
+@router.get("/events")
+async def stream_callback_events(
+    request: Request,
+    status: Optional[str] = None,
+    agent_name: Optional[str] = None,
+    last_event_id: Optional[int] = Query(None, description="Resume after this event; the Last-Event-ID header wins"),
+):
+    """
+    Server-sent events for callback writes (created, updated, deleted, bulk_updated,
+    bulk_deleted, imported, scored, merged), optionally only those touching a status and/or agent.
+    Reconnecting with Last-Event-ID replays what was missed; a `reset` event means
+    the gap is too old to replay and the client should reload.
+    """
+    if not callback_events.enabled():
+        raise HTTPException(status_code=404, detail="Change feed is disabled")
+    header = request.headers.get("last-event-id")
+    if header:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    async def messages():
+        async for event in callback_events.listen(last_event_id, status=status, agent_name=agent_name):
+            yield _sse_message(event)
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/reminders", response_model=List[CallbackReminderResponse])
+async def read_callback_reminders(
+    remind_on: Optional[date] = Query(None, description="Defaults to today"),
+    agent_name: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Follow-up reminders generated for a day by the reminders job
+    """
+    return await get_reminders(db, remind_on or date.today(), agent_name)
+
+
+@router.get("/history/transitions", response_model=List[CallbackStatusTransition])
+async def read_status_transitions(
+    start: Optional[date] = Query(None, description="First day (UTC) to count"),
+    end: Optional[date] = Query(None, description="Last day (UTC) to count"),
+    agent_name: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Number of status changes per agent and (from_status, to_status) pair,
+    most frequent first
+    """
+    return await get_status_transitions(db, start=start, end=end, agent_name=agent_name)
+
+
+@router.get("/duplicates", response_model=List[CallbackResponse])
+async def read_duplicates(
+    phone: str = Query(..., description="Phone number in any format"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Callbacks whose number is the same as `phone` once normalized, most recently modified first
+    """
+    columns = _response_columns(fields)
+    rows = await find_duplicates(db, phone, columns=columns)
+    return Response(content=rows_to_json(rows, columns), media_type="application/json")
+
+
+@router.get("/duplicates/groups", response_model=List[CallbackDuplicateGroup])
+async def read_duplicate_groups(
+    after: Optional[str] = Query(None, description="phone_normalized of the last group on the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Numbers shared by more than one callback, with the callback ids (kept callback first)
+    """
+    return await get_duplicate_groups(db, limit=limit, after=after)
 
 
 @router.post("/", response_model=CallbackResponse)
-def create_new_callback(
+async def create_new_callback(
     callback: CallbackCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new callback
     """
-    return create_callback(db=db, callback=callback)
+    return await create_callback(db=db, callback=callback)
 
 
-@router.get("/{callback_id}", response_model=CallbackResponse)
-def read_callback(
-    callback_id: int,
-    db: Session = Depends(get_db)
+@router.post("/bulk", response_model=CallbackImportResult)
+async def import_callbacks(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format", description="csv, ndjson or json; defaults from Content-Type"),
+    upsert: bool = False,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get a specific callback by ID
+    Bulk import callbacks from a streamed CSV, NDJSON or JSON array body.
+    Rows are validated individually and written in batches, one transaction per batch.
+    With upsert, rows matching an existing callback_number update it instead.
+    """
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        fmt = CONTENT_TYPE_FORMATS.get(content_type)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=415, detail=f"Upload must be one of: {', '.join(IMPORT_FORMATS)}")
+
+    parser = make_record_parser(fmt)
+    importer = CallbackImporter(upsert=upsert)
+    batch = []
+    row = 0
+    try:
+        async for chunk in request.stream():
+            for record in parser.feed(chunk):
+                row += 1
+                batch.append((row, record))
+                if len(batch) >= batch_size:
+                    await db.run_sync(importer.import_batch, batch)
+                    batch = []
+        for record in parser.close():
+            row += 1
+            batch.append((row, record))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Malformed {fmt} upload after row {row}: {exc} ({importer.result.processed} rows already processed)"
+        )
+    if batch:
+        await db.run_sync(importer.import_batch, batch)
+    return importer.finish()
+
+
+@router.patch("/bulk", response_model=CallbackBulkResult)
+async def bulk_update_existing_callbacks(
+    selection: CallbackBulkUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Set status, agent, follow-up date and/or last_modified_by on every callback
+    picked by `ids` or `filters`, as one UPDATE statement
+    """
+    changes = selection.model_dump(exclude_unset=True, exclude={"ids", "filters"})
+    affected = await bulk_update_callbacks(db, changes, ids=selection.ids, filters=selection.filters)
+    return CallbackBulkResult(affected=affected)
+
+
+@router.delete("/bulk", response_model=CallbackBulkResult)
+async def bulk_delete_existing_callbacks(
+    selection: CallbackBulkSelection,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete every callback picked by `ids` or `filters`, as one DELETE statement
+    """
+    affected = await bulk_delete_callbacks(db, ids=selection.ids, filters=selection.filters)
+    return CallbackBulkResult(affected=affected)
+
+
+@router.post("/score", response_model=CallbackJobAccepted, status_code=202)
+async def score_callbacks(
+    request: CallbackScoreRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Queue a lead score recompute and return without waiting for it.
+    Without ids, every callback that has no lead_score yet is scored.
+    """
+    if not settings.JOBS_ENABLED:
+        raise HTTPException(status_code=404, detail="Background jobs are disabled")
+    job = await enqueue_scoring(db, request.ids)
+    if job is None:
+        # An identical run is already waiting
+        return CallbackJobAccepted(kind="score_leads", status="queued")
+    return CallbackJobAccepted(job_id=job.id, kind=job.kind, status=job.status)
+
+
+@router.post("/merge", response_model=CallbackResponse)
+async def merge_duplicate_callbacks(
+    merge: CallbackMerge,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fold duplicates into keep_id: missing fields are filled from them,
+    comments appended, and the duplicates deleted
     """
-    db_callback = get_callback(db, callback_id=callback_id)
+    db_callback = await merge_callbacks(db, merge.keep_id, merge.merge_ids)
     if db_callback is None:
         raise HTTPException(status_code=404, detail="Callback not found")
     return db_callback
 
 
+@router.post("/dedupe", response_model=CallbackJobAccepted, status_code=202)
+async def dedupe_all_callbacks(db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue a background merge of every group of callbacks sharing a number
+    (see /duplicates/groups for what would be merged)
+    """
+    if not settings.JOBS_ENABLED:
+        raise HTTPException(status_code=404, detail="Background jobs are disabled")
+    job = await enqueue_dedupe(db)
+    if job is None:
+        return CallbackJobAccepted(kind="dedupe_callbacks", status="queued")
+    return CallbackJobAccepted(job_id=job.id, kind=job.kind, status=job.status)
+
+
+@router.post("/claim-next", response_model=CallbackClaim, responses={204: {"description": "Nothing due"}})
+async def claim_next(claim: CallbackClaimRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Hand the agent the most urgent due callback (earliest follow-up, then best
+    lead score) that is theirs or unassigned and not claimed by anyone else.
+    The claim lasts ttl_seconds or until the status is updated or the
+    callback released. 204 when nothing is due.
+    """
+    callback = await claim_next_callback(db, claim.agent_name, claim.ttl_seconds)
+    if callback is None:
+        metrics.callback_claims.inc(1, "empty")
+        return Response(status_code=204)
+    metrics.callback_claims.inc(1, "claimed")
+    return callback
+
+
+@router.post("/{callback_id}/release", response_model=bool)
+async def release_claimed_callback(callback_id: int, release: CallbackRelease, db: AsyncSession = Depends(get_async_db)):
+    """
+    Give back a callback claimed through /claim-next before its claim expires
+    """
+    if not await release_callback(db, callback_id, release.agent_name):
+        raise HTTPException(status_code=404, detail="Callback not claimed by this agent")
+    return True
+
+
+@router.post("/archive", response_model=CallbackJobAccepted, status_code=202)
+async def archive_closed_callbacks(db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue a move of closed callbacks older than ARCHIVE_AFTER_DAYS to the archive
+    """
+    if not settings.JOBS_ENABLED:
+        raise HTTPException(status_code=404, detail="Background jobs are disabled")
+    job = await enqueue_archive(db)
+    if job is None:
+        return CallbackJobAccepted(kind="archive_callbacks", status="queued")
+    return CallbackJobAccepted(job_id=job.id, kind=job.kind, status=job.status)
+
+
+@router.get("/{callback_id}", response_model=CallbackResponse)
+async def read_callback(
+    request: Request,
+    callback_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a specific callback by ID
+    """
+    key = callback_cache.detail_cache_key(callback_id)
+    entry = callback_cache.lookup(key)
+    if entry is None:
+        lag = replica_lag(db)
+        token = callback_cache.begin_read(lag)
+
+        async def load() -> dict:
+            db_callback = await get_callback(db, callback_id=callback_id)
+            if db_callback is None:
+                raise await _not_found(db, callback_id)
+            body = _callback_adapter.dump_json(_callback_adapter.validate_python(db_callback, from_attributes=True))
+            return callback_cache.store(key, body, token=token)
+
+        entry = await _coalesced("detail", (key, token, lag), load)
+    return _cached_json_response(request, entry)
+
+
+@router.get("/{callback_id}/history", response_model=List[CallbackHistoryEntry])
+async def read_callback_history(
+    callback_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    before: Optional[int] = Query(None, description="id of the last entry seen, for the next page"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Recorded changes to a callback, newest first; kept after it is deleted
+    """
+    return await get_history(db, callback_id, limit=limit, before_id=before)
+
+
 @router.put("/{callback_id}", response_model=CallbackResponse)
-def update_existing_callback(
+async def update_existing_callback(
     callback_id: int,
     callback: CallbackUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a callback
     """
-    db_callback = update_callback(db, callback_id=callback_id, callback=callback)
+    db_callback = await update_callback(db, callback_id=callback_id, callback=callback)
     if db_callback is None:
-        raise HTTPException(status_code=404, detail="Callback not found")
+        raise await _not_found(db, callback_id)
     return db_callback
 
 
 @router.delete("/{callback_id}", response_model=bool)
-def delete_existing_callback(
+async def delete_existing_callback(
     callback_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a callback
     """
-    success = delete_callback(db, callback_id=callback_id)
+    success = await delete_callback(db, callback_id=callback_id)
     if not success:
-        raise HTTPException(status_code=404, detail="Callback not found")
+        raise await _not_found(db, callback_id)
     return success
 
 
-@router.get("/search/", response_model=List[CallbackResponse])
-def search_for_callbacks(
+@router.get("/search/", response_model=List[CallbackResponse], dependencies=[Depends(rate_limit("search"))])
+async def search_for_callbacks(
     query: str = Query(..., min_length=3),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Search callbacks by customer name, car make/model, callback number or comments
+    Search callbacks by customer name, car make/model, callback number or comments.
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one.
+    Identical searches arriving while one is running share its result.
     """
-    callbacks = search_callbacks(db, search_term=query, skip=skip, limit=limit)
-    return callbacks
\ No newline at end of file
+    columns = _response_columns(fields)
+    lag = replica_lag(db)
+    token = callback_cache.begin_read(lag)
+
+    async def load():
+        try:
+            rows, next_cursor = await search_callbacks(
+                db, search_term=query, skip=skip, limit=limit, cursor=cursor, columns=columns,
+                include_archived=include_archived
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return rows_to_json(rows, columns), next_cursor
+
+    body, next_cursor = await _coalesced("search", (query, skip, limit, cursor, tuple(columns), include_archived, token, lag), load)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
\ No newline at end of file
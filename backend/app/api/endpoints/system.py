@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core import metrics, runtime
+from app.crud.jobs import queue_depth
+from app.db.database import async_engine, engine, get_async_db, pool_stats, read_async_engine
+from app.db.routing import replica_enabled
+from app.schemas.system import JobStats, PoolStats, RuntimeStats, SlowQuery
+from app.services.callback_jobs import worker
+
+router = APIRouter()
+
+
+@router.get("/pool-stats", response_model=List[PoolStats])
+async def read_pool_stats():
+    """
+    Connection pool usage for the async API engine, the sync engine and the read replica
+    """
+    stats = [
+        PoolStats(engine="async", **pool_stats(async_engine.sync_engine)),
+        PoolStats(engine="sync", **pool_stats(engine)),
+    ]
+    if replica_enabled():
+        stats.append(PoolStats(engine="replica", **pool_stats(read_async_engine.sync_engine)))
+    return stats
+
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+async def read_slow_queries():
+    """
+    Most recent statements slower than SLOW_QUERY_MS, newest first
+    """
+    return list(reversed(metrics.slow_queries))
+
+
+@router.get("/jobs", response_model=JobStats)
+async def read_job_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Background job queue depth and this process's worker throughput
+    """
+    return JobStats(depth=await db.run_sync(queue_depth), **worker.stats())
+
+
+@router.get("/runtime", response_model=RuntimeStats)
+async def read_runtime_stats():
+    """
+    Start-up time and memory of the worker that served this request
+    """
+    return runtime.snapshot()
@@ -0,0 +1,170 @@
+"""
+Command line tools for the AutoXpress CRM backend.
+
+Usage:
+    python -m app.cli import-callbacks leads.csv [--upsert] [--batch-size 1000]
+    python -m app.cli rebuild-stats
+    python -m app.cli purge-tombstones [--days 30]
+    python -m app.cli run-jobs [--concurrency 2]
+    python -m app.cli dedupe-callbacks [--dry-run]
+    python -m app.cli archive-callbacks [--older-than-days 180] [--batch-size 500] [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from app.core.config import settings
+from app.crud.callback_archive import archive_callbacks as move_closed_callbacks
+from app.crud.callback_duplicates import dedupe_callbacks as merge_duplicate_callbacks
+from app.crud.callback_sync import purge_tombstones as purge_callback_tombstones
+from app.crud.callback_stats import rebuild_callback_stats
+from app.db.database import SessionLocal
+from app.services.callback_jobs import worker as job_worker
+from app.services.callback_import import CallbackImporter, IMPORT_FORMATS, iter_records, make_record_parser
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _guess_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"jsonl": "ndjson"}.get(extension, extension)
+
+
+def import_callbacks(args: argparse.Namespace) -> int:
+    fmt = args.format or _guess_format(args.path)
+    if fmt not in IMPORT_FORMATS:
+        print(f"Cannot tell the format of {args.path}; pass --format ({', '.join(IMPORT_FORMATS)})", file=sys.stderr)
+        return 2
+
+    db = SessionLocal()
+    importer = CallbackImporter(upsert=args.upsert)
+    try:
+        with open(args.path, "rb") as upload:
+            chunks = iter(lambda: upload.read(CHUNK_SIZE), b"")
+            result = importer.run(db, iter_records(make_record_parser(fmt), chunks), batch_size=args.batch_size)
+    except ValueError as exc:
+        print(f"Malformed {fmt} file: {exc}", file=sys.stderr)
+        result = importer.finish()
+    finally:
+        db.close()
+
+    print(result.model_dump_json(indent=2))
+    return 1 if result.failed or result.processed == 0 else 0
+
+
+def rebuild_stats(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        rebuild_callback_stats(db)
+    finally:
+        db.close()
+    print("callback_stats rebuilt")
+    return 0
+
+
+def purge_tombstones(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        removed = purge_callback_tombstones(db, days=args.days)
+    finally:
+        db.close()
+    print(f"{removed} tombstones purged")
+    return 0
+
+
+def dedupe_callbacks(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        totals = merge_duplicate_callbacks(db, dry_run=args.dry_run)
+    finally:
+        db.close()
+    verb = "would merge" if args.dry_run else "merged"
+    print(f"{totals['groups']} duplicate numbers, {verb} {totals['merged']} callbacks")
+    return 0
+
+
+def archive_callbacks(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        moved = move_closed_callbacks(db, older_than_days=args.older_than_days, batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+    print(f"{moved} closed callbacks {'due for archiving' if args.dry_run else 'archived'}")
+    return 0
+
+
+def _warn_unshared_state() -> None:
+    # Jobs invalidate the cache and publish events through the configured
+    # backends, which only reach the API processes when they are shared
+    if settings.CACHE_ENABLED and not settings.CACHE_BACKEND:
+        print(
+            "The response cache is in-memory: API processes keep serving callbacks changed by jobs "
+            "for up to CACHE_TTL_SECONDS. Set CACHE_BACKEND to a shared backend, or disable the cache.",
+            file=sys.stderr
+        )
+    if settings.EVENTS_ENABLED and not settings.EVENTS_BROKER:
+        print(
+            "The event broker is in-memory: /callbacks/events clients will not hear about changes made by jobs. "
+            "Set EVENTS_BROKER to a shared broker (on PostgreSQL, app.core.events.PostgresBroker).",
+            file=sys.stderr
+        )
+
+
+def run_jobs(args: argparse.Namespace) -> int:
+    _warn_unshared_state()
+    if args.concurrency:
+        job_worker.concurrency = args.concurrency
+
+    async def serve():
+        job_worker.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await job_worker.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="AutoXpress CRM tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-callbacks", help="Bulk import callback leads from a CSV/NDJSON/JSON file")
+    importer.add_argument("path", help="File to import")
+    importer.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults from the file extension")
+    importer.add_argument("--upsert", action="store_true", help="Update existing callbacks with the same callback_number")
+    importer.add_argument("--batch-size", type=int, default=1000)
+    importer.set_defaults(handler=import_callbacks)
+
+    stats = commands.add_parser("rebuild-stats", help="Recompute the callback_stats summary table from callbacks")
+    stats.set_defaults(handler=rebuild_stats)
+
+    tombstones = commands.add_parser("purge-tombstones", help="Delete callback tombstones older than the sync retention")
+    tombstones.add_argument("--days", type=int, help="Defaults to SYNC_TOMBSTONE_DAYS")
+    tombstones.set_defaults(handler=purge_tombstones)
+
+    dedupe = commands.add_parser("dedupe-callbacks", help="Merge callbacks that share a normalized phone number")
+    dedupe.add_argument("--dry-run", action="store_true", help="Only count the duplicates")
+    dedupe.set_defaults(handler=dedupe_callbacks)
+
+    archive = commands.add_parser("archive-callbacks", help="Move closed callbacks to callbacks_archive")
+    archive.add_argument("--older-than-days", type=float, help="Defaults to ARCHIVE_AFTER_DAYS")
+    archive.add_argument("--batch-size", type=int, help="Defaults to ARCHIVE_BATCH_SIZE")
+    archive.add_argument("--dry-run", action="store_true", help="Only count the callbacks due")
+    archive.set_defaults(handler=archive_callbacks)
+
+    worker = commands.add_parser("run-jobs", help="Process background jobs until interrupted (for JOBS_IN_PROCESS=false)")
+    worker.add_argument("--concurrency", type=int, help="Defaults to JOBS_CONCURRENCY")
+    worker.set_defaults(handler=run_jobs)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
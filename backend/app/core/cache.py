@@ -0,0 +1,127 @@
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """
+    Interface for response cache storage.
+    Values are plain dicts of bytes/str so shared backends can serialize them.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def iter_keys(self, prefix: str) -> Iterator[str]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def iter_keys(self, prefix: str) -> Iterator[str]:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+        return iter(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class NullCache(CacheBackend):
+    """
+    Backend used when caching is disabled
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        pass
+
+    def iter_keys(self, prefix: str) -> Iterator[str]:
+        return iter(())
+
+    def clear(self) -> None:
+        pass
+
+
+def _load_backend() -> CacheBackend:
+    if not settings.CACHE_ENABLED:
+        return NullCache()
+    if settings.CACHE_BACKEND:
+        module_name, _, class_name = settings.CACHE_BACKEND.rpartition(".")
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        return backend_class()
+    return MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """
+    The configured cache backend, created on first use
+    """
+    global _backend
+    if _backend is None:
+        _backend = _load_backend()
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Replace the cache backend, e.g. with a shared one for multi-worker deployments
+    """
+    global _backend
+    _backend = backend
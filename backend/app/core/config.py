@@ -1,18 +1,144 @@
 import os
-from typing import List
+from typing import List, Optional
 import json
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     APP_NAME: str = os.getenv("APP_NAME", "AutoXpress CRM")
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     
     # API settings
     API_V1_STR: str = "/api/v1"
+
+    # Database settings
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./autoxpress_crm.db")
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL") or None
+    # Optional read replica for the list, detail, search and export endpoints
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    ASYNC_DATABASE_READ_URL: Optional[str] = os.getenv("ASYNC_DATABASE_READ_URL") or None
+    # After a client writes, its reads go to the primary for this long (should exceed replica lag)
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    DB_ECHO: bool = _env_bool("DB_ECHO", False)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", True)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # PostgreSQL only, 0 disables
+    DB_STARTUP_TIMEOUT: float = float(os.getenv("DB_STARTUP_TIMEOUT", "30"))  # seconds to wait for the DB on boot
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", "2"))  # connections opened per worker on boot
+    # create_all on startup; deployed environments run `alembic upgrade head` instead
+    AUTO_CREATE_TABLES: bool = _env_bool("AUTO_CREATE_TABLES", ENVIRONMENT == "development")
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
     
+    # Response cache settings
+    CACHE_ENABLED: bool = _env_bool("CACHE_ENABLED", True)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "")  # dotted path to a CacheBackend class
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+
+    # Identical concurrent list/detail/search reads share one query (per worker process)
+    COALESCE_ENABLED: bool = _env_bool("COALESCE_ENABLED", True)
+
+    # Per-client token bucket for list and search, off by default: behind NAT
+    # or a proxy many agents share an address unless RATE_LIMIT_KEY_HEADER is set.
+    # Buckets live in each worker process, so the deployment-wide budget is
+    # WEB_CONCURRENCY times these numbers.
+    RATE_LIMIT_ENABLED: bool = _env_bool("RATE_LIMIT_ENABLED", False)
+    # Request header naming the client (e.g. X-Agent-Name), set by a proxy in FORWARDED_ALLOW_IPS;
+    # the client address when unset, absent or sent by anyone else
+    RATE_LIMIT_KEY_HEADER: str = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "10"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "30"))
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+
+    # Incremental sync settings
+    # Seconds /callbacks/changes re-reads behind the database clock (see get_changes)
+    SYNC_SETTLE_SECONDS: float = float(os.getenv("SYNC_SETTLE_SECONDS", "5"))
+    # Tombstones older than this are purged; older `since` values must resync (0 keeps them)
+    SYNC_TOMBSTONE_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+
+    # Country code assumed for 10-digit phone numbers when normalizing callback_number
+    DEFAULT_PHONE_COUNTRY_CODE: str = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "1")
+
+    # How long a callback handed out by /claim-next stays with the agent
+    CLAIM_TTL_SECONDS: float = float(os.getenv("CLAIM_TTL_SECONDS", "900"))
+
+    # Background jobs (lead scoring, follow-up reminders)
+    JOBS_ENABLED: bool = _env_bool("JOBS_ENABLED", True)
+    JOBS_CONCURRENCY: int = int(os.getenv("JOBS_CONCURRENCY", "2"))
+    JOBS_POLL_SECONDS: float = float(os.getenv("JOBS_POLL_SECONDS", "1"))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+    JOBS_RETRY_BASE_SECONDS: float = float(os.getenv("JOBS_RETRY_BASE_SECONDS", "5"))
+    JOBS_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("JOBS_LOCK_TIMEOUT_SECONDS", "300"))
+    JOBS_RETENTION_DAYS: float = float(os.getenv("JOBS_RETENTION_DAYS", "7"))
+    # Run the worker pool inside each API process; turn off to use `python -m app.cli run-jobs`.
+    # Jobs run there invalidate the cache and publish events in that process, so the API only
+    # sees them through a shared CACHE_BACKEND and EVENTS_BROKER
+    JOBS_IN_PROCESS: bool = _env_bool("JOBS_IN_PROCESS", True)
+    LEAD_SCORING_CHUNK: int = int(os.getenv("LEAD_SCORING_CHUNK", "500"))
+    REMINDERS_INTERVAL_SECONDS: float = float(os.getenv("REMINDERS_INTERVAL_SECONDS", "3600"))
+
+    # Field-level change history of callbacks (callback_history), written with each write
+    HISTORY_ENABLED: bool = _env_bool("HISTORY_ENABLED", True)
+
+    # Periodic archival of closed callbacks into callbacks_archive (opt-in)
+    ARCHIVE_ENABLED: bool = _env_bool("ARCHIVE_ENABLED", False)
+    # Statuses that are final; callbacks in them untouched for ARCHIVE_AFTER_DAYS are archived.
+    # Open statuses (OPEN_STATUSES in app.models.callback) are never archived.
+    ARCHIVE_STATUSES: List[str] = [
+        status.strip() for status in os.getenv("ARCHIVE_STATUSES", "Sale").split(",") if status.strip()
+    ]
+    ARCHIVE_AFTER_DAYS: float = float(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    # Pause between batches so the mover never holds the write lock for long stretches
+    ARCHIVE_BATCH_PAUSE_SECONDS: float = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+    # PostgreSQL: create callbacks_archive partitioned by year of created_at (read when the table is created)
+    ARCHIVE_PARTITIONED: bool = _env_bool("ARCHIVE_PARTITIONED", False)
+
+    # Change feed settings
+    EVENTS_ENABLED: bool = _env_bool("EVENTS_ENABLED", True)
+    EVENTS_BROKER: str = os.getenv("EVENTS_BROKER", "")
+    EVENTS_HISTORY: int = int(os.getenv("EVENTS_HISTORY", "1000"))
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "1000"))
+    EVENTS_KEEPALIVE_SECONDS: float = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+
+    # Instrumentation settings
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", True)
+    SERVER_TIMING_ENABLED: bool = _env_bool("SERVER_TIMING_ENABLED", True)
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_SAMPLES: int = int(os.getenv("SLOW_QUERY_SAMPLES", "50"))
+    # Keep bound parameters with slow statements; they hold customer data, so off by default
+    SLOW_QUERY_PARAMETERS: bool = _env_bool("SLOW_QUERY_PARAMETERS", False)
+
+    # Production server (python -m app.server)
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    # Worker processes. Metrics, rate-limit buckets and request coalescing stay
+    # per worker (see app.server), and so does the cache unless CACHE_BACKEND is set
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    WORKER_TIMEOUT: int = int(os.getenv("WORKER_TIMEOUT", "60"))  # seconds
+    GRACEFUL_TIMEOUT: int = int(os.getenv("GRACEFUL_TIMEOUT", "30"))  # seconds
+    KEEPALIVE_SECONDS: int = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
+    # Proxies whose X-Forwarded-For/-Proto (and RATE_LIMIT_KEY_HEADER) are trusted ("*" for any)
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
     # CORS settings
     BACKEND_CORS_ORIGINS_STR: str = os.getenv("BACKEND_CORS_ORIGINS", '["http://localhost:3000"]')
     
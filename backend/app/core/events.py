@@ -0,0 +1,296 @@
+import importlib
+import itertools
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[dict], None]
+
+
+class EventBroker:
+    """
+    Interface for change-event fan-out.
+
+    publish() assigns the event an increasing integer "id" and hands it to every
+    subscribed listener, in every process that shares the broker. Listeners are
+    called from whichever thread publishes and must not block. replay() returns
+    the events after an id, or None once that id has fallen out of the retained
+    history, which tells a resuming client to reload instead.
+
+    publish() is called from request handlers and must not block. subscribe(),
+    replay() and last_id() may wait on a shared store; callback_events.listen
+    runs them in a thread, off the event loop.
+    """
+
+    def publish(self, event: dict) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """
+        Register a listener; returns a function that unregisters it
+        """
+        raise NotImplementedError
+
+    def replay(self, after_id: int) -> Optional[List[dict]]:
+        raise NotImplementedError
+
+    def last_id(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryBroker(EventBroker):
+    """
+    In-process broker keeping the last `history` events for resuming clients.
+    Each worker process has its own; point EVENTS_BROKER at a shared broker
+    such as PostgresBroker when running several.
+    """
+
+    def __init__(self, history: int = 1000):
+        self._history: deque = deque(maxlen=history)
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def publish(self, event: dict) -> None:
+        with self._lock:
+            self._last_id = next(self._ids)
+            event = {"id": self._last_id, **event}
+            self._history.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def replay(self, after_id: int) -> Optional[List[dict]]:
+        with self._lock:
+            if after_id > self._last_id:
+                # An id from before a restart
+                return None
+            if after_id < self._last_id and (not self._history or after_id < self._history[0]["id"] - 1):
+                return None
+            return [event for event in self._history if event["id"] > after_id]
+
+    def last_id(self) -> int:
+        return self._last_id
+
+
+class PostgresBroker(EventBroker):
+    """
+    Broker shared by every worker through PostgreSQL LISTEN/NOTIFY, for
+    multi-worker deployments: EVENTS_BROKER=app.core.events.PostgresBroker.
+
+    Events are appended to the callback_event_log table, which hands out their
+    ids and keeps the last EVENTS_HISTORY of them for replay, and announced
+    with NOTIFY. Publishers take a transaction-level advisory lock, so ids
+    commit in order and a listener reading "everything after the last id it
+    saw" never skips one. publish() only queues the event for this process's
+    publisher thread, so a request does not wait on the write; a listener
+    thread on one dedicated connection hands new events to the subscribers.
+    Opt-in: nothing selects it automatically.
+    """
+
+    CHANNEL = "callback_events"
+    TABLE = "callback_event_log"
+    # Arbitrary key of the advisory lock serializing publishers
+    LOCK_KEY = 7305844127
+
+    def __init__(self, url: Optional[str] = None, history: Optional[int] = None):
+        self._engine = create_engine(url or settings.DATABASE_URL, pool_size=3, max_overflow=0, pool_pre_ping=True)
+        if self._engine.dialect.name != "postgresql":
+            raise RuntimeError("PostgresBroker needs a PostgreSQL DATABASE_URL")
+        self._history = history or settings.EVENTS_HISTORY
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._outbox: queue.Queue = queue.Queue()
+        self._ready = threading.Event()
+        self._pid: Optional[int] = None
+        with self._engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} "
+                "(id bigserial PRIMARY KEY, event jsonb NOT NULL, created_at timestamptz NOT NULL DEFAULT now())"
+            )
+
+    def _query(self, statement: str, **params) -> list:
+        with self._engine.connect() as connection:
+            return connection.execute(text(statement), params).all()
+
+    def _start(self) -> threading.Event:
+        """
+        Start this process's publisher and listener threads (again after a
+        fork) without waiting on the database. Returns an Event set once the
+        listener knows the latest id, from which on it delivers every event.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                # Connections inherited from the parent process belong to it
+                self._engine.dispose(close=False)
+                self._outbox = queue.Queue()
+                self._ready = threading.Event()
+                threading.Thread(target=self._publish_loop, name="event-publisher", daemon=True).start()
+                threading.Thread(target=self._listen_loop, args=(self._ready,), name="event-listener", daemon=True).start()
+            return self._ready
+
+    def publish(self, event: dict) -> None:
+        self._start()
+        self._outbox.put(event)
+
+    def _publish_loop(self) -> None:
+        while True:
+            event = self._outbox.get()
+            try:
+                with self._engine.begin() as connection:
+                    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": self.LOCK_KEY})
+                    event_id = connection.execute(
+                        text(f"INSERT INTO {self.TABLE} (event) VALUES (CAST(:event AS jsonb)) RETURNING id"),
+                        {"event": json.dumps(event, default=str)}
+                    ).scalar()
+                    connection.execute(text("SELECT pg_notify(:channel, :id)"), {"channel": self.CHANNEL, "id": str(event_id)})
+                    if event_id % 100 == 0:
+                        connection.execute(
+                            text(f"DELETE FROM {self.TABLE} WHERE id <= :oldest"), {"oldest": event_id - self._history}
+                        )
+            except Exception:
+                logger.exception("Could not publish a change event")
+
+    def _listen_loop(self, ready: threading.Event) -> None:
+        last_seen = None
+        while True:
+            connection = None
+            try:
+                connection = self._engine.raw_connection()
+                connection.detach()
+                driver = connection.driver_connection
+                driver.autocommit = True
+                with driver.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CHANNEL}")
+                    if last_seen is None:
+                        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {self.TABLE}")
+                        last_seen, = cursor.fetchone()
+                        ready.set()
+                    # Catch up on anything published while (re)connecting
+                    last_seen = self._deliver(cursor, last_seen)
+                    while True:
+                        if select.select([driver], [], [], settings.EVENTS_KEEPALIVE_SECONDS) == ([], [], []):
+                            continue
+                        driver.poll()
+                        if driver.notifies:
+                            driver.notifies.clear()
+                            last_seen = self._deliver(cursor, last_seen)
+            except Exception:
+                logger.exception("Change event listener lost its connection; reconnecting")
+                time.sleep(1)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _deliver(self, cursor, last_seen: int) -> int:
+        cursor.execute(f"SELECT id, event FROM {self.TABLE} WHERE id > %s ORDER BY id", (last_seen,))
+        rows = cursor.fetchall()
+        with self._lock:
+            listeners = list(self._listeners)
+        for event_id, event in rows:
+            event = {"id": event_id, **event}
+            for listener in listeners:
+                listener(event)
+            last_seen = event_id
+        return last_seen
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        # Blocks until the listener is up, so events published after subscribe() are delivered
+        if not self._start().wait(settings.EVENTS_KEEPALIVE_SECONDS):
+            logger.warning("Change event listener is not connected yet; subscribing anyway")
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def replay(self, after_id: int) -> Optional[List[dict]]:
+        (oldest, newest), = self._query(f"SELECT min(id), max(id) FROM {self.TABLE}")
+        newest = newest or 0
+        if after_id > newest:
+            # An id from before the log was emptied
+            return None
+        if after_id < newest and (oldest is None or after_id < oldest - 1):
+            return None
+        rows = self._query(f"SELECT id, event FROM {self.TABLE} WHERE id > :after ORDER BY id", after=after_id)
+        return [{"id": event_id, **event} for event_id, event in rows]
+
+    def last_id(self) -> int:
+        (newest,), = self._query(f"SELECT coalesce(max(id), 0) FROM {self.TABLE}")
+        return newest
+
+
+class NullBroker(EventBroker):
+    """
+    Broker used when the change feed is disabled
+    """
+
+    def publish(self, event: dict) -> None:
+        pass
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        return lambda: None
+
+    def replay(self, after_id: int) -> Optional[List[dict]]:
+        return []
+
+    def last_id(self) -> int:
+        return 0
+
+
+def _load_broker() -> EventBroker:
+    if not settings.EVENTS_ENABLED:
+        return NullBroker()
+    if settings.EVENTS_BROKER:
+        module_name, _, class_name = settings.EVENTS_BROKER.rpartition(".")
+        broker_class = getattr(importlib.import_module(module_name), class_name)
+        return broker_class()
+    return MemoryBroker(history=settings.EVENTS_HISTORY)
+
+
+_broker: Optional[EventBroker] = None
+
+
+def get_broker() -> EventBroker:
+    """
+    The configured event broker, created on first use
+    """
+    global _broker
+    if _broker is None:
+        _broker = _load_broker()
+    return _broker
+
+
+def set_broker(broker: EventBroker) -> None:
+    """
+    Replace the event broker, e.g. with a shared one for multi-worker deployments
+    """
+    global _broker
+    _broker = broker
@@ -0,0 +1,213 @@
+"""
+Lightweight request and SQL instrumentation exposed in Prometheus text format.
+
+MetricsMiddleware times each request and opens a RequestStats in a context
+variable; the engine hooks in app.db.database add every statement's time to
+it. Per-route histograms, a Server-Timing header and a ring buffer of slow
+statements are produced from those numbers. Everything is in-process, so
+each worker reports its own series.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by label values
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-1]}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter keyed by label values
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = ",".join(f'{name}="{_escape(v)}"' for name, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}" if labels else f"{self.name} {value}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route", "status"), LATENCY_BUCKETS
+)
+request_db_duration = Histogram(
+    "http_request_db_seconds", "Total SQL time per request by route", ("method", "route"), LATENCY_BUCKETS
+)
+request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements per request by route", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+db_statements = Counter("db_statements_total", "SQL statements executed")
+db_slow_statements = Counter("db_slow_statements_total", "SQL statements slower than SLOW_QUERY_MS")
+jobs_processed = Counter("jobs_processed_total", "Background jobs finished by kind and outcome", ("kind", "outcome"))
+job_batch_duration = Histogram(
+    "job_batch_duration_seconds", "Time to run one claimed batch of jobs by kind", ("kind",), LATENCY_BUCKETS
+)
+requests_coalesced = Counter(
+    "http_requests_coalesced_total", "Requests answered from an identical in-flight query", ("route",)
+)
+requests_throttled = Counter("http_requests_throttled_total", "Requests rejected by the rate limiter", ("route",))
+callback_claims = Counter("callback_claims_total", "claim-next calls by outcome", ("outcome",))
+
+REGISTRY = [
+    request_duration, request_db_duration, request_db_queries, db_statements, db_slow_statements,
+    jobs_processed, job_batch_duration, requests_coalesced, requests_throttled,
+    callback_claims,
+]
+
+
+class RequestStats:
+    """
+    SQL totals for the request in progress
+    """
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+slow_queries: Deque[dict] = deque(maxlen=settings.SLOW_QUERY_SAMPLES)
+
+
+def record_statement(statement: str, parameters, elapsed: float) -> None:
+    """
+    Account one SQL statement; called from the engine hooks
+    """
+    db_statements.inc()
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        db_slow_statements.inc()
+        slow_queries.append({
+            "statement": statement,
+            "parameters": repr(parameters)[:1000] if settings.SLOW_QUERY_PARAMETERS else None,
+            "duration_ms": round(elapsed * 1000, 3),
+            "at": time.time(),
+        })
+
+
+def render_metrics(extra_lines: Sequence[str] = ()) -> str:
+    """
+    Prometheus text exposition of every registered metric
+    """
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and SQL totals and adding a
+    Server-Timing header (db time and statement count, total app time)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", '
+                        f"app;dur={elapsed_ms:.2f}"
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            request_duration.observe(elapsed, method, route_path, str(status_code))
+            request_db_duration.observe(stats.db_seconds, method, route_path)
+            request_db_queries.observe(stats.queries, method, route_path)
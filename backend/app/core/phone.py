@@ -0,0 +1,37 @@
+"""
+Phone number normalization for callback_number.
+
+Numbers arrive as "555-123-4567", "(555)1234567" or "+1 555 123 4567". The
+normalized form is E.164 ("+15551234567") when the country can be told:
+10-digit numbers are taken to be in DEFAULT_PHONE_COUNTRY_CODE, and numbers
+written with a leading "+" or "00" keep their own code. Anything else keeps
+its bare digits, so the same input always maps to the same key.
+"""
+import re
+from typing import Optional
+
+from app.core.config import settings
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(number: Optional[str]) -> Optional[str]:
+    """
+    Normalized lookup key for a phone number, or None if it has no digits
+    """
+    if not number:
+        return None
+    digits = _NON_DIGITS.sub("", number)
+    if not digits:
+        return None
+    stripped = number.strip()
+    country = settings.DEFAULT_PHONE_COUNTRY_CODE
+    if stripped.startswith("+"):
+        return "+" + digits
+    if stripped.startswith("00") and len(digits) > 10:
+        return "+" + digits[2:]
+    if len(digits) == 10:
+        return "+" + country + digits
+    if len(digits) == 10 + len(country) and digits.startswith(country):
+        return "+" + digits
+    return digits
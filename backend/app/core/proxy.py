@@ -0,0 +1,32 @@
+"""
+Reverse proxy handling.
+
+The app, rather than the server, applies X-Forwarded-For/-Proto from the
+proxies in FORWARDED_ALLOW_IPS, so it still knows whether a request came
+through one of them once the client address has been replaced. Headers a
+trusted proxy sets on the client's behalf, such as RATE_LIMIT_KEY_HEADER,
+are only believed on those requests (see via_trusted_proxy). app.server
+turns the server's own proxy handling off accordingly.
+"""
+from starlette.requests import Request
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+# Scope key holding whether the connecting peer is a trusted proxy
+TRUSTED_PROXY = "trusted_proxy"
+
+
+class TrustedProxyMiddleware(ProxyHeadersMiddleware):
+    """
+    Uvicorn's ProxyHeadersMiddleware that also records in the scope whether
+    the connection came from a trusted proxy
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            peer = scope.get("client")
+            scope[TRUSTED_PROXY] = self.always_trust or (peer is not None and peer[0] in self.trusted_hosts)
+        await super().__call__(scope, receive, send)
+
+
+def via_trusted_proxy(request: Request) -> bool:
+    return bool(request.scope.get(TRUSTED_PROXY))
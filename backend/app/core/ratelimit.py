@@ -0,0 +1,94 @@
+"""
+Per-client token-bucket rate limiting for the hot read endpoints.
+
+Each (scope, client) pair gets a bucket of RATE_LIMIT_BURST tokens refilled
+at RATE_LIMIT_PER_SECOND; a request takes one token or is rejected with the
+time until the next one. Buckets live in this process, so with several
+workers a client's effective limit is per worker. The least recently seen
+clients are dropped beyond RATE_LIMIT_MAX_CLIENTS.
+
+Limiting is off unless RATE_LIMIT_ENABLED is set. A call center behind NAT
+shares one address, so set RATE_LIMIT_KEY_HEADER to limit per agent instead,
+or FORWARDED_ALLOW_IPS so the address is the one the proxy saw. The header is
+only believed on requests from a proxy in FORWARDED_ALLOW_IPS, which must set
+it itself; otherwise any client could pick a fresh identity per request, or
+spend another agent's budget.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import HTTPException, Request
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.proxy import via_trusted_proxy
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """
+        Take a token for key; returns 0 if allowed, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+limiter = TokenBucketLimiter(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST, settings.RATE_LIMIT_MAX_CLIENTS)
+
+
+def client_key(request: Request) -> str:
+    """
+    Identity a client is limited by: the RATE_LIMIT_KEY_HEADER value when
+    configured and sent by a trusted proxy, otherwise its address (the real
+    one behind a proxy listed in FORWARDED_ALLOW_IPS)
+    """
+    if settings.RATE_LIMIT_KEY_HEADER and via_trusted_proxy(request):
+        identity = request.headers.get(settings.RATE_LIMIT_KEY_HEADER)
+        if identity:
+            return f"id:{identity}"
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(route: str):
+    """
+    Dependency that rejects a client over its budget for route with 429 and Retry-After
+    """
+    # async: no blocking work, so FastAPI need not hand it to the threadpool
+    async def check(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = limiter.acquire(f"{route}:{client_key(request)}")
+        if wait:
+            metrics.requests_throttled.inc(1, route)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+    return check
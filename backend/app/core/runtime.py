@@ -0,0 +1,117 @@
+"""
+Process start-up timing and memory figures for capacity planning.
+
+Each worker records how long it took from process start (the fork, under
+Gunicorn) to serving traffic, and reports its resident memory, so the cost
+of adding a worker or a pod can be read off /api/v1/system/runtime and
+/metrics instead of guessed.
+"""
+import logging
+import os
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_LOADED_AT = time.time()
+_imported_at: Optional[float] = None
+_ready_at: Optional[float] = None
+
+
+def process_started_at() -> float:
+    """
+    Wall-clock start of this process; falls back to when this module was loaded
+    """
+    try:
+        with open("/proc/self/stat") as stat:
+            # Field 22 counts clock ticks since boot; the command name may contain spaces
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            uptime_seconds = float(uptime.read().split()[0])
+        return time.time() - uptime_seconds + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return _LOADED_AT
+
+
+_STARTED_AT = process_started_at()
+
+
+def _after_fork() -> None:
+    # A Gunicorn worker forked from a preloaded master starts its own clock;
+    # the import happened in the master, so it has no import time of its own
+    global _STARTED_AT, _imported_at, _ready_at
+    _STARTED_AT = time.time()
+    _imported_at = None
+    _ready_at = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def rss_bytes() -> Optional[int]:
+    """
+    Current resident set size, or None where it cannot be read
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Highest resident set size so far
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def mark_imported() -> None:
+    """
+    Record that the application module finished importing
+    """
+    global _imported_at
+    _imported_at = time.time()
+
+
+def mark_ready() -> None:
+    """
+    Record that start-up finished and log how long it took and the memory used
+    """
+    global _ready_at
+    _ready_at = time.time()
+    rss = rss_bytes()
+    logger.info(
+        "Worker %d ready in %.2fs (rss %s MB)", os.getpid(), _ready_at - _STARTED_AT,
+        f"{rss / 1048576:.1f}" if rss is not None else "?"
+    )
+
+
+def is_ready() -> bool:
+    return _ready_at is not None
+
+
+def snapshot() -> dict:
+    """
+    Start-up timing and memory of this process. import_seconds is None in
+    workers forked from a master that had already imported the app.
+    """
+    return {
+        "pid": os.getpid(),
+        "started_at": _STARTED_AT,
+        "import_seconds": round(_imported_at - _STARTED_AT, 3) if _imported_at is not None else None,
+        "startup_seconds": round(_ready_at - _STARTED_AT, 3) if _ready_at is not None else None,
+        "uptime_seconds": round(time.time() - _STARTED_AT, 3),
+        "rss_bytes": rss_bytes(),
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
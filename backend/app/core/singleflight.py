@@ -0,0 +1,59 @@
+"""
+Single-flight execution of identical concurrent reads.
+
+When many clients ask for the same page at once (every agent opening the
+dashboard at the start of a shift), the first request runs the query and the
+others wait for its result instead of sending the same query to the database.
+Only requests that overlap in time share work; nothing is kept once the
+leader finishes, that is the response cache's job.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time on the event loop; concurrent
+    callers with the same key get the leader's result or exception
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Result of call() for key, and whether it was shared from another caller
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (client went away); run the call ourselves
+                return await call(), False
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; keep an unretrieved exception from being logged
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._calls[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -5,7 +5,21 @@ from app.crud.callback import (
     update_callback,
     delete_callback,
     search_callbacks,
+    bulk_create_callbacks,
+    stream_callbacks,
+    bulk_update_callbacks,
+    bulk_delete_callbacks,
+    enqueue_scoring,
 )
+from app.crud.callback_duplicates import (
+    find_duplicates,
+    get_duplicate_groups,
+    merge_callbacks,
+    dedupe_callbacks,
+    enqueue_dedupe,
+)
+from app.crud.callback_sync import get_changes, purge_tombstones
+from app.crud.callback_stats import get_callback_stats, rebuild_callback_stats
 
 __all__ = [
     "get_callback",
@@ -14,4 +28,18 @@ __all__ = [
     "update_callback", 
     "delete_callback",
     "search_callbacks",
+    "bulk_create_callbacks",
+    "stream_callbacks",
+    "bulk_update_callbacks",
+    "bulk_delete_callbacks",
+    "get_changes",
+    "purge_tombstones",
+    "enqueue_scoring",
+    "find_duplicates",
+    "get_duplicate_groups",
+    "merge_callbacks",
+    "dedupe_callbacks",
+    "enqueue_dedupe",
+    "get_callback_stats",
+    "rebuild_callback_stats",
 ]
\ No newline at end of file
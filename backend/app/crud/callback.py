@@ -1,11 +1,26 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
-from datetime import date
+from sqlalchemy.orm import Session, Query, aliased
+from sqlalchemy.engine import Row
+from sqlalchemy import and_, or_, tuple_, type_coerce, String, func, select, table, column, literal_column, insert, update, delete, union_all, null
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import base64
+import binascii
+import json
+import re
 
-from app.models.callback import Callback
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.crud import callback_cache, callback_events, callback_history, callback_stats, jobs
+from app.models.callback import Callback, SCORING_FIELDS
+from app.models.callback_archive import CallbackArchive
+from app.models.callback_tombstone import CallbackTombstone
+from app.models.job import Job
 from app.schemas.callback import CallbackCreate, CallbackUpdate, CallbackFilterParams
 
+SCORE_JOB = "score_leads"
+# At most one queued "score everything unscored" job
+UNSCORED_DEDUPE_KEY = "score_leads:unscored"
+
 
 def get_callback(db: Session, callback_id: int) -> Optional[Callback]:
     """
@@ -14,46 +29,359 @@ def get_callback(db: Session, callback_id: int) -> Optional[Callback]:
     return db.query(Callback).filter(Callback.id == callback_id).first()
 
 
-def get_callbacks(
-    db: Session, 
-    skip: int = 0, 
-    limit: int = 100,
-    filters: Optional[CallbackFilterParams] = None
-) -> List[Callback]:
+def _apply_filters(query, filters: Optional[CallbackFilterParams], model=Callback):
     """
-    Get all callbacks with optional filtering
+    Apply the list filters to a callbacks Query or select()
     """
-    query = db.query(Callback)
-    
     if filters:
         # Apply filters if provided
         if filters.follow_up_date_start:
-            query = query.filter(Callback.follow_up_date >= filters.follow_up_date_start)
+            query = query.filter(model.follow_up_date >= filters.follow_up_date_start)
         
         if filters.follow_up_date_end:
-            query = query.filter(Callback.follow_up_date <= filters.follow_up_date_end)
+            query = query.filter(model.follow_up_date <= filters.follow_up_date_end)
         
         if filters.status:
-            query = query.filter(Callback.status == filters.status)
+            query = query.filter(model.status == filters.status)
         
         if filters.agent_name:
-            query = query.filter(Callback.agent_name == filters.agent_name)
+            query = query.filter(model.agent_name == filters.agent_name)
+    return query
+
+
+def _callbacks_source(include_archived: bool = False):
+    """
+    Entity list and search queries read from: Callback, or with include_archived
+    Callback aliased over callbacks UNION ALL callbacks_archive
+    """
+    if not include_archived:
+        return Callback
+    hot = select(*Callback.__table__.c)
+    # Claim columns are not archived
+    archived = select(*(
+        CallbackArchive.__table__.c[col.name] if col.name in CallbackArchive.__table__.c
+        else null().cast(col.type).label(col.name)
+        for col in Callback.__table__.c
+    ))
+    return aliased(Callback, union_all(hot, archived).subquery("callbacks_all"))
+
+
+def _callbacks_query(db: Session, columns: Optional[List[str]] = None, model=Callback) -> Query:
+    """
+    Query for Callback objects, or for plain row tuples of the given columns
+    """
+    if columns is None:
+        return db.query(model)
+    return db.query(*(getattr(model, name) for name in columns))
+
+
+def _timestamp_key(db: Session, column):
+    """
+    Column expression used for a timestamp in a keyset.
+    SQLite keeps timestamps as text and server-generated values have no
+    microseconds, so the raw text is compared there instead of re-bound datetimes.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+
+def _last_modified_key(db: Session, model=Callback):
+    return _timestamp_key(db, model.last_modified)
+
+
+def _encode_cursor(values: list) -> str:
+    """
+    Build an opaque cursor from the sort key of the last row on a page
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by _encode_cursor, raising ValueError if it is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _decode_keyset_cursor(db: Session, cursor: str) -> Tuple[Optional[date], object, int]:
+    """
+    Decode a (follow_up_date, last_modified, id) cursor
+    """
+    follow_up_date, last_modified, callback_id = _decode_cursor(cursor, 3)
+    try:
+        follow_up_date = date.fromisoformat(follow_up_date) if follow_up_date else None
+        if db.get_bind().dialect.name != "sqlite":
+            last_modified = datetime.fromisoformat(last_modified)
+        return follow_up_date, last_modified, int(callback_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _paginate(
+    db: Session,
+    query: Query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    as_rows: bool = False,
+    model=Callback
+) -> Tuple[list, Optional[str]]:
+    """
+    Page a callbacks query ordered by (follow_up_date, last_modified, id) descending.
+    Returns Callback objects, or the query's row tuples when as_rows is set.
+
+    With a cursor the page starts right after the encoded row using a row-value
+    comparison, so the database seeks into the sort index instead of scanning
+    and discarding skipped rows. Rows without a follow-up date are paged as a
+    separate partition, placed where the dialect sorts NULLs (first on
+    PostgreSQL, last on SQLite).
+    """
+    last_modified = _last_modified_key(db, model)
+    width = len(query.column_descriptions)
+    query = query.add_columns(model.follow_up_date, last_modified, model.id)
+    ordering = (model.follow_up_date.desc(), model.last_modified.desc(), model.id.desc())
+
+    if cursor is None:
+        rows = query.order_by(*ordering).offset(skip).limit(limit).all()
+    else:
+        cursor_date, cursor_modified, cursor_id = _decode_keyset_cursor(db, cursor)
+        dated = query.filter(model.follow_up_date.isnot(None))
+        undated = query.filter(model.follow_up_date.is_(None))
+        if cursor_date is None:
+            undated = undated.filter(
+                tuple_(last_modified, model.id) < tuple_(cursor_modified, cursor_id)
+            )
+        else:
+            dated = dated.filter(
+                tuple_(model.follow_up_date, last_modified, model.id)
+                < tuple_(cursor_date, cursor_modified, cursor_id)
+            )
+
+        nulls_first = db.get_bind().dialect.name == "postgresql"
+        partitions = [undated, dated] if nulls_first else [dated, undated]
+        if (cursor_date is None) != nulls_first:
+            # The cursor is already past the first partition
+            partitions = partitions[1:]
+
+        rows = []
+        for partition in partitions:
+            rows.extend(partition.order_by(*ordering).limit(limit - len(rows)).all())
+            if len(rows) >= limit:
+                break
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        follow_up_date, last_key, last_id = rows[-1][width:]
+        if isinstance(last_key, datetime):
+            last_key = last_key.isoformat()
+        follow_up_date = follow_up_date.isoformat() if follow_up_date else None
+        next_cursor = _encode_cursor([follow_up_date, last_key, last_id])
+    return _strip_keys(rows, width, as_rows), next_cursor
+
+
+def _strip_keys(rows: List[Row], width: int, as_rows: bool) -> list:
+    """
+    Drop the sort key columns _paginate and _paginate_ranked append to each row
+    """
+    if as_rows:
+        return [tuple(row[:width]) for row in rows]
+    return [row[0] for row in rows]
+
+
+def get_callbacks(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    filters: Optional[CallbackFilterParams] = None,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    include_archived: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Get all callbacks with optional filtering.
+    Returns the page and a cursor for the next page (None on the last page).
+    With columns, the page holds plain row tuples of those columns instead of
+    Callback objects, skipping ORM identity-map bookkeeping.
+    Archived callbacks are only included with include_archived.
+    """
+    model = _callbacks_source(include_archived)
+    query = _apply_filters(_callbacks_query(db, columns, model), filters, model)
     
     # Order by follow-up date (most recent first) and then by last modified date
-    return query.order_by(Callback.follow_up_date.desc(), Callback.last_modified.desc()).offset(skip).limit(limit).all()
+    return _paginate(db, query, skip, limit, cursor, as_rows=columns is not None, model=model)
+
+
+def stream_callbacks(
+    db: Session,
+    columns: List[str],
+    filters: Optional[CallbackFilterParams] = None,
+    batch_size: int = 1000
+) -> Iterator[Row]:
+    """
+    Yield matching callbacks as plain row tuples of the given columns, in id order.
+    Rows come from a server-side cursor in batches of batch_size, so memory
+    stays flat however many rows match.
+    """
+    query = db.query(*(getattr(Callback, name) for name in columns))
+    query = _apply_filters(query, filters).order_by(Callback.id)
+    yield from query.yield_per(batch_size)
+
+
+def _db_time(db: Session, seconds_ago: float):
+    """
+    The database clock minus seconds_ago, comparable with _timestamp_key values
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return db.execute(select(func.datetime("now", f"-{int(seconds_ago)} seconds"))).scalar()
+    return db.execute(select(func.now() - timedelta(seconds=seconds_ago))).scalar()
+
+
+def _score_source(values: dict) -> dict:
+    """
+    lead_score_manual for a write: a score a client sets is kept by the
+    scoring job, and clearing it hands the callback back to the job
+    """
+    if "lead_score" not in values:
+        return {}
+    return {"lead_score_manual": values["lead_score"] is not None}
 
 
 def create_callback(db: Session, callback: CallbackCreate) -> Callback:
     """
     Create a new callback
     """
-    db_callback = Callback(**callback.model_dump())
+    db_callback = Callback(
+        **callback.model_dump(), phone_normalized=normalize_phone(callback.callback_number),
+        lead_score_manual=callback.lead_score is not None
+    )
     db.add(db_callback)
+    callback_stats.record_changes(db, added=[callback_stats.stats_snapshot(db_callback)])
+    if settings.JOBS_ENABLED or callback_history.enabled():
+        db.flush()
+    callback_history.record(db, [callback_history.entry(
+        callback_history.CREATED, db_callback.id, None, callback_history.snapshot(db_callback),
+        changed_by=db_callback.last_modified_by
+    )])
+    if settings.JOBS_ENABLED:
+        jobs.enqueue(db, SCORE_JOB, {"ids": [db_callback.id]})
     db.commit()
     db.refresh(db_callback)
+    callback_cache.invalidate(rows=[callback_cache.filter_snapshot(db_callback)])
+    callback_events.publish(callback_events.CREATED, [db_callback], callback=callback_events.payload(db_callback))
     return db_callback
 
 
+def bulk_create_callbacks(
+    db: Session,
+    callbacks: List[CallbackCreate],
+    upsert: bool = False
+) -> Tuple[int, int]:
+    """
+    Write a batch of callbacks in a single transaction using executemany.
+    With upsert, rows whose phone number (compared in normalized form)
+    already exists update the most recent callback with that number instead
+    of inserting a new one. Returns (inserted, updated).
+    """
+    existing: Dict[str, int] = {}
+    current: Dict[int, dict] = {}
+    history_current: Dict[int, dict] = {}
+    history: List[Optional[dict]] = []
+    keys = [normalize_phone(callback.callback_number) for callback in callbacks]
+    if upsert:
+        existing = dict(
+            db.query(Callback.phone_normalized, func.max(Callback.id))
+            .filter(Callback.phone_normalized.in_({key for key in keys if key}))
+            .group_by(Callback.phone_normalized)
+            .all()
+        )
+        if existing:
+            # Previous values of the rows about to be updated, for the derived data and history
+            fields = dict.fromkeys(("status", "agent_name", "follow_up_date", "lead_score", *callback_history.HISTORY_FIELDS))
+            for row in db.query(Callback.id, *(getattr(Callback, name) for name in fields)).filter(
+                Callback.id.in_(existing.values())
+            ):
+                current[row.id] = callback_stats.stats_snapshot(row._asdict())
+                history_current[row.id] = callback_history.snapshot(row._asdict())
+
+    new_rows: List[dict] = []
+    updates: List[dict] = []
+    removed: List[dict] = []
+    added: List[dict] = []
+    pending: Dict[str, dict] = {}
+    merged = 0
+    for callback, key in zip(callbacks, keys):
+        if key in existing:
+            callback_id = existing[key]
+            changes = callback.model_dump(exclude_unset=True)
+            updates.append({"id": callback_id, **changes, **_score_source(changes), "phone_normalized": key})
+            removed.append(current[callback_id])
+            current[callback_id] = callback_stats.stats_snapshot({**current[callback_id], **changes})
+            added.append(current[callback_id])
+            history_before = history_current[callback_id]
+            history_current[callback_id] = {**history_before, **callback_history.snapshot(changes)}
+            history.append(callback_history.entry(
+                callback_history.UPDATED, callback_id, history_before, history_current[callback_id],
+                changed_by=changes.get("last_modified_by")
+            ))
+        elif key in pending:
+            # Repeated number within the batch: the later row wins
+            changes = callback.model_dump(exclude_unset=True)
+            pending[key].update(changes, **_score_source(changes))
+            merged += 1
+        else:
+            row = {**callback.model_dump(), "phone_normalized": key, "lead_score_manual": callback.lead_score is not None}
+            new_rows.append(row)
+            if upsert and key:
+                pending[key] = row
+    added.extend(new_rows)
+
+    try:
+        if new_rows and callback_history.enabled():
+            # insertmanyvalues keeps this batched while handing back the new ids
+            new_ids = db.execute(insert(Callback).returning(Callback.id, sort_by_parameter_order=True), new_rows).scalars()
+            history += [
+                callback_history.entry(
+                    callback_history.CREATED, callback_id, None, callback_history.snapshot(row),
+                    changed_by=row.get("last_modified_by")
+                )
+                for callback_id, row in zip(new_ids, new_rows)
+            ]
+        elif new_rows:
+            db.execute(insert(Callback), new_rows)
+        if updates:
+            db.execute(update(Callback), updates)
+        callback_stats.record_changes(db, removed=removed, added=added)
+        callback_history.record(db, history)
+        if settings.JOBS_ENABLED:
+            rescored = [row["id"] for row in updates if any(name in row for name in SCORING_FIELDS)]
+            if rescored:
+                jobs.enqueue(db, SCORE_JOB, {"ids": rescored})
+            if new_rows:
+                jobs.enqueue(db, SCORE_JOB, {"unscored": True}, dedupe_key=UNSCORED_DEDUPE_KEY)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    callback_cache.invalidate(
+        [row["id"] for row in updates],
+        rows=[callback_cache.filter_snapshot(row) for row in removed + added]
+    )
+    callback_events.publish(
+        callback_events.IMPORTED, removed + added,
+        inserted=len(new_rows), updated=len(updates) + merged, ids=[row["id"] for row in updates]
+    )
+    return len(new_rows), len(updates) + merged
+
+
 def update_callback(db: Session, callback_id: int, callback: CallbackUpdate) -> Optional[Callback]:
     """
     Update an existing callback
@@ -62,13 +390,33 @@ def update_callback(db: Session, callback_id: int, callback: CallbackUpdate) ->
     if not db_callback:
         return None
     
+    before = callback_cache.filter_snapshot(db_callback)
+    stats_before = callback_stats.stats_snapshot(db_callback)
+    history_before = callback_history.snapshot(db_callback)
+
     # Update callback with provided fields, skipping None values
     update_data = callback.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
+    for key, value in {**update_data, **_score_source(update_data)}.items():
         setattr(db_callback, key, value)
+    if "callback_number" in update_data:
+        db_callback.phone_normalized = normalize_phone(db_callback.callback_number)
+    if "status" in update_data:
+        # The call has an outcome; the callback goes back to the queue
+        db_callback.claimed_by = db_callback.claimed_until = None
     
+    callback_stats.record_changes(db, removed=[stats_before], added=[callback_stats.stats_snapshot(db_callback)])
+    callback_history.record(db, [callback_history.entry(
+        callback_history.UPDATED, callback_id, history_before, callback_history.snapshot(db_callback),
+        changed_by=update_data.get("last_modified_by")
+    )])
+    if settings.JOBS_ENABLED and any(name in update_data for name in SCORING_FIELDS):
+        jobs.enqueue(db, SCORE_JOB, {"ids": [callback_id]})
     db.commit()
     db.refresh(db_callback)
+    callback_cache.invalidate([callback_id], rows=[before, callback_cache.filter_snapshot(db_callback)])
+    callback_events.publish(
+        callback_events.UPDATED, [before, db_callback], callback=callback_events.payload(db_callback)
+    )
     return db_callback
 
 
@@ -80,22 +428,282 @@ def delete_callback(db: Session, callback_id: int) -> bool:
     if not db_callback:
         return False
     
+    before = callback_cache.filter_snapshot(db_callback)
+    deleted = callback_events.payload(db_callback) if callback_events.enabled() else None
+    callback_stats.record_changes(db, removed=[callback_stats.stats_snapshot(db_callback)])
+    callback_history.record(db, [
+        callback_history.entry(callback_history.DELETED, callback_id, callback_history.snapshot(db_callback), None)
+    ])
+    db.add(CallbackTombstone(callback_id=callback_id))
     db.delete(db_callback)
     db.commit()
+    callback_cache.invalidate([callback_id], rows=[before])
+    callback_events.publish(callback_events.DELETED, [before], callback=deleted)
     return True
 
 
-def search_callbacks(db: Session, search_term: str, skip: int = 0, limit: int = 100) -> List[Callback]:
+def enqueue_scoring(db: Session, ids: Optional[List[int]] = None) -> Optional[Job]:
     """
-    Search callbacks by customer name, car make/model, or callback number
+    Queue a lead score recompute for the given callbacks, or for all unscored
+    ones. Returns None when an unscored run is already queued.
+    """
+    if ids is not None:
+        job = jobs.enqueue(db, SCORE_JOB, {"ids": sorted(set(ids))})
+    else:
+        job = jobs.enqueue(db, SCORE_JOB, {"unscored": True}, dedupe_key=UNSCORED_DEDUPE_KEY)
+    db.commit()
+    return job
+
+
+def _apply_selection(statement, ids: Optional[List[int]], filters: Optional[CallbackFilterParams]):
+    """
+    Restrict a statement to the callbacks picked by an ID list or list filters
+    """
+    if ids is not None:
+        return statement.filter(Callback.id.in_(ids))
+    return _apply_filters(statement, filters)
+
+
+def _selection_groups(
+    db: Session,
+    ids: Optional[List[int]],
+    filters: Optional[CallbackFilterParams]
+) -> List[Tuple[dict, int, float, int]]:
     """
+    Aggregate the selected rows by (status, agent_name, follow_up_date) before
+    a set-based write, locking them on PostgreSQL so the totals stay exact
+    """
+    target = _apply_selection(
+        select(Callback.status, Callback.agent_name, Callback.follow_up_date, Callback.lead_score),
+        ids, filters
+    ).with_for_update().subquery()
+    keys = (target.c.status, target.c.agent_name, target.c.follow_up_date)
+    rows = db.execute(
+        select(*keys, func.count(), func.sum(target.c.lead_score), func.count(target.c.lead_score)).group_by(*keys)
+    )
+    return [
+        ({"status": status, "agent_name": agent_name, "follow_up_date": follow_up_date}, count, score_sum, score_count)
+        for status, agent_name, follow_up_date, count, score_sum, score_count in rows
+    ]
+
+
+def _record_bulk_update_history(
+    db: Session,
+    changes: dict,
+    ids: Optional[List[int]],
+    filters: Optional[CallbackFilterParams]
+) -> None:
+    """
+    History rows for a bulk update, from the selected rows' current values of
+    the changed fields (already locked by _selection_groups)
+    """
+    fields = dict.fromkeys(("status", "agent_name", *(name for name in changes if name in callback_history.HISTORY_FIELDS)))
+    rows = db.execute(_apply_selection(select(Callback.id, *(getattr(Callback, name) for name in fields)), ids, filters))
+    after = callback_history.snapshot(changes)
+    callback_history.record(db, (
+        callback_history.entry(
+            callback_history.UPDATED, row.id, callback_history.snapshot(row._asdict()),
+            {**callback_history.snapshot(row._asdict()), **after}, changed_by=changes.get("last_modified_by")
+        )
+        for row in rows
+    ))
+
+
+def bulk_update_callbacks(
+    db: Session,
+    changes: dict,
+    ids: Optional[List[int]] = None,
+    filters: Optional[CallbackFilterParams] = None
+) -> int:
+    """
+    Apply the same changes to every selected callback with one UPDATE in one
+    transaction, stamping last_modified. Returns the number of rows changed.
+    """
+    if not changes:
+        return 0
+    groups = _selection_groups(db, ids, filters)
+    if not groups:
+        db.rollback()
+        return 0
+
+    values = {**changes, "last_modified": func.now()}
+    if "status" in changes:
+        # The calls have an outcome; the callbacks go back to the queue, as in update_callback
+        values.update(claimed_by=None, claimed_until=None)
+    statement = _apply_selection(update(Callback), ids, filters).values(
+        **values
+    ).execution_options(synchronize_session=False)
+    try:
+        if callback_history.enabled():
+            _record_bulk_update_history(db, changes, ids, filters)
+        affected = db.execute(statement).rowcount
+        callback_stats.record_group_changes(db, groups, sign=-1)
+        callback_stats.record_group_changes(db, [({**row, **changes}, *totals) for row, *totals in groups], sign=1)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    snapshots = [row for row, *_ in groups] + [{**row, **changes} for row, *_ in groups]
+    callback_cache.invalidate(ids, rows=[callback_cache.filter_snapshot(row) for row in snapshots])
+    callback_events.publish(
+        callback_events.BULK_UPDATED, snapshots,
+        count=affected, ids=ids, changes=changes
+    )
+    return affected
+
+
+def bulk_delete_callbacks(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    filters: Optional[CallbackFilterParams] = None
+) -> int:
+    """
+    Delete every selected callback with one DELETE in one transaction.
+    Returns the number of rows deleted.
+    """
+    groups = _selection_groups(db, ids, filters)
+    if not groups:
+        db.rollback()
+        return 0
+
+    statement = _apply_selection(delete(Callback), ids, filters).execution_options(synchronize_session=False)
+    try:
+        db.execute(insert(CallbackTombstone).from_select(
+            ["callback_id"], _apply_selection(select(Callback.id), ids, filters)
+        ))
+        callback_history.record_selection(db, callback_history.DELETED, _apply_selection(select(Callback.id), ids, filters))
+        affected = db.execute(statement).rowcount
+        callback_stats.record_group_changes(db, groups, sign=-1)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    callback_cache.invalidate(ids, rows=[callback_cache.filter_snapshot(row) for row, *_ in groups])
+    callback_events.publish(callback_events.BULK_DELETED, [row for row, *_ in groups], count=affected, ids=ids)
+    return affected
+
+
+def _paginate_ranked(
+    query: Query,
+    rank,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    as_rows: bool = False,
+    model=Callback
+) -> Tuple[list, Optional[str]]:
+    """
+    Page a query by ascending rank (best match first), ties broken by id.
+    The cursor carries the (rank, id) of the last row on the page.
+    """
+    width = len(query.column_descriptions)
+    query = query.add_columns(rank, model.id)
+    ordering = (rank, model.id)
+
+    if cursor is None:
+        rows = query.order_by(*ordering).offset(skip).limit(limit).all()
+    else:
+        cursor_rank, cursor_id = _decode_cursor(cursor, 2)
+        try:
+            cursor_rank, cursor_id = float(cursor_rank), int(cursor_id)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        rows = query.filter(
+            or_(rank > cursor_rank, and_(rank == cursor_rank, model.id > cursor_id))
+        ).order_by(*ordering).limit(limit).all()
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last_rank, last_id = rows[-1][width:]
+        next_cursor = _encode_cursor([last_rank, last_id])
+    return _strip_keys(rows, width, as_rows), next_cursor
+
+
+_PHONE_LIKE = re.compile(r"[\d\s().+-]+")
+
+# bm25 column weights for callbacks_fts: names and numbers outrank comments
+_FTS_WEIGHTS = (10.0, 5.0, 5.0, 10.0, 1.0, 10.0)
+
+_callbacks_fts = table("callbacks_fts", column("rowid"))
+_callbacks_fts_match = literal_column("callbacks_fts")
+
+
+def _phone_digits(search_term: str) -> Optional[str]:
+    """
+    Digits of a phone-like search term such as "(555) 123", or None
+    """
+    if not _PHONE_LIKE.fullmatch(search_term):
+        return None
+    digits = re.sub(r"\D", "", search_term)
+    return digits if len(digits) >= 3 else None
+
+
+def _fts_query(search_term: str) -> str:
+    """
+    Build an FTS5 query matching the term as a substring of any column,
+    or its digits inside callback_digits
+    """
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    digits = _phone_digits(search_term)
+    if digits:
+        return f'{phrase} OR callback_digits : "{digits}"'
+    return phrase
+
+
+def search_callbacks(
+    db: Session,
+    search_term: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    include_archived: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Search callbacks by customer name, car make/model, callback number or comments,
+    best matches first. Phone-like terms also match the callback number's digits.
+    Returns the page and a cursor for the next page (None on the last page);
+    with columns the page holds row tuples, as in get_callbacks.
+    With include_archived, archived callbacks are searched too. The archive
+    has no search index, so those searches scan it; on SQLite they also fall
+    back to substring matching in list order.
+    """
+    dialect = db.get_bind().dialect.name
+    as_rows = columns is not None
+    model = _callbacks_source(include_archived)
+
+    if dialect == "sqlite" and not include_archived:
+        matches = select(
+            _callbacks_fts.c.rowid.label("id"),
+            func.bm25(_callbacks_fts_match, *_FTS_WEIGHTS).label("rank")
+        ).where(_callbacks_fts_match.op("MATCH")(_fts_query(search_term))).subquery()
+        query = _callbacks_query(db, columns).join(matches, matches.c.id == Callback.id)
+        return _paginate_ranked(query, matches.c.rank, skip, limit, cursor, as_rows)
+
     search_pattern = f"%{search_term}%"
-    return db.query(Callback).filter(
-        or_(
-            Callback.customer_name.ilike(search_pattern),
-            Callback.car_make.ilike(search_pattern),
-            Callback.car_model.ilike(search_pattern),
-            Callback.callback_number.ilike(search_pattern),
-            Callback.comments.ilike(search_pattern)
+    searched = (
+        model.customer_name,
+        model.car_make,
+        model.car_model,
+        model.callback_number,
+        model.comments,
+    )
+    conditions = [col.ilike(search_pattern) for col in searched]
+
+    if dialect != "postgresql":
+        query = _callbacks_query(db, columns, model).filter(or_(*conditions))
+        return _paginate(db, query, skip, limit, cursor, as_rows, model=model)
+
+    # On the hot table every predicate below is served by a pg_trgm GIN index
+    digits = _phone_digits(search_term)
+    if digits:
+        # Rendered with literals so it matches the ix_callbacks_callback_digits_trgm expression
+        callback_digits = func.regexp_replace(
+            model.callback_number, literal_column("'\\D'"), literal_column("''"), literal_column("'g'")
         )
-    ).order_by(Callback.follow_up_date.desc()).offset(skip).limit(limit).all()
\ No newline at end of file
+        conditions.append(callback_digits.like(f"%{digits}%"))
+    rank = 1 - func.greatest(*(func.word_similarity(search_term, col) for col in searched))
+    query = _callbacks_query(db, columns, model).filter(or_(*conditions))
+    return _paginate_ranked(query, rank, skip, limit, cursor, as_rows, model=model)
@@ -0,0 +1,138 @@
+"""
+Archiving of closed callbacks into callbacks_archive.
+
+Callbacks in a final status that nobody has touched for ARCHIVE_AFTER_DAYS
+are moved out of the hot table in short batches. They keep their ids, leave
+the stats and a tombstone for /changes, and stay readable through
+include_archived on list and search.
+"""
+import time
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import callback_cache, callback_events, callback_history, callback_stats, jobs
+from app.crud.callback import _db_time, _last_modified_key, _selection_groups
+from app.models.callback import Callback, OPEN_STATUSES
+from app.models.callback_archive import CallbackArchive
+from app.models.callback_tombstone import CallbackTombstone
+from app.models.job import Job
+
+
+ARCHIVE_JOB = "archive_callbacks"
+
+
+def _ensure_archive_partitions(db: Session, ids: List[int]) -> None:
+    """
+    With ARCHIVE_PARTITIONED on PostgreSQL, create the yearly callbacks_archive
+    partitions the given callbacks fall into
+    """
+    if not settings.ARCHIVE_PARTITIONED or db.get_bind().dialect.name != "postgresql":
+        return
+    years = db.execute(
+        select(func.extract("year", func.coalesce(Callback.created_at, Callback.last_modified, func.now())))
+        .where(Callback.id.in_(ids)).distinct()
+    ).scalars()
+    for year in sorted({int(year) for year in years}):
+        name = f"callbacks_archive_y{year}"
+        if db.execute(select(func.to_regclass(name))).scalar() is None:
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF callbacks_archive "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            ))
+
+
+def _archive_batch(db: Session, ids: List[int]) -> int:
+    """
+    Copy the callbacks to callbacks_archive, tombstone and delete them in one transaction
+    """
+    groups = _selection_groups(db, ids, None)
+    names = [col.name for col in Callback.__table__.c if col.name in CallbackArchive.__table__.c]
+    source = select(*(
+        func.coalesce(Callback.created_at, Callback.last_modified, func.now()).label(name)
+        if name == "created_at" else Callback.__table__.c[name]
+        for name in names
+    )).where(Callback.id.in_(ids))
+    try:
+        _ensure_archive_partitions(db, ids)
+        db.execute(insert(CallbackArchive).from_select(names, source))
+        db.execute(insert(CallbackTombstone).from_select(["callback_id"], select(Callback.id).where(Callback.id.in_(ids))))
+        callback_history.record_selection(db, callback_history.ARCHIVED, select(Callback.id).where(Callback.id.in_(ids)))
+        affected = db.execute(
+            delete(Callback).where(Callback.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        callback_stats.record_group_changes(db, groups, sign=-1)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    callback_cache.invalidate(ids, rows=[callback_cache.filter_snapshot(row) for row, *_ in groups])
+    callback_events.publish(callback_events.ARCHIVED, [row for row, *_ in groups], count=affected, ids=ids)
+    return affected
+
+
+def archive_statuses() -> List[str]:
+    """
+    ARCHIVE_STATUSES without the open statuses: a callback still being worked is never archived
+    """
+    return [status for status in settings.ARCHIVE_STATUSES if status not in OPEN_STATUSES]
+
+
+def is_archived(db: Session, callback_id: int) -> bool:
+    """
+    Whether a callback id was moved to callbacks_archive
+    """
+    return db.query(CallbackArchive.id).filter(CallbackArchive.id == callback_id).first() is not None
+
+
+def archive_callbacks(
+    db: Session,
+    older_than_days: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False
+) -> int:
+    """
+    Move closed callbacks (status in archive_statuses(), not modified for
+    older_than_days, ARCHIVE_AFTER_DAYS by default) to callbacks_archive,
+    batch_size rows per transaction so locks stay short. Rows locked by
+    another writer are skipped until the next run (PostgreSQL). Archived
+    callbacks drop out of the stats and leave a tombstone for /changes, like
+    deleted ones. Returns the number moved, or with dry_run the number due.
+    """
+    statuses = archive_statuses()
+    if not statuses:
+        return 0
+    days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    closed = and_(
+        Callback.status.in_(statuses),
+        _last_modified_key(db) < _db_time(db, days * 86400)
+    )
+    if dry_run:
+        due = db.query(func.count(Callback.id)).filter(closed).scalar()
+        db.rollback()
+        return due
+
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(Callback.id).where(closed).order_by(Callback.id).limit(batch_size).with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            db.rollback()
+            return moved
+        moved += _archive_batch(db, ids)
+        if settings.ARCHIVE_BATCH_PAUSE_SECONDS:
+            time.sleep(settings.ARCHIVE_BATCH_PAUSE_SECONDS)
+
+
+def enqueue_archive(db: Session) -> Optional[Job]:
+    """
+    Queue an archive_callbacks run; returns None when one is already queued
+    """
+    job = jobs.enqueue(db, ARCHIVE_JOB, dedupe_key=ARCHIVE_JOB)
+    db.commit()
+    return job
@@ -0,0 +1,260 @@
+"""
+Async versions of the callback CRUD functions for use with AsyncSession.
+
+Each function runs its counterpart from app.crud.callback (or one of its
+callback_* siblings) through
+AsyncSession.run_sync, so statements go out over the async driver while the
+query building and write logic live in one place.
+"""
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from app.crud import callback as crud, callback_archive, callback_claims, callback_duplicates, callback_history, callback_reminders, callback_stats, callback_sync
+from app.models.callback import Callback
+from app.models.callback_history import CallbackHistory
+from app.models.callback_reminder import CallbackReminder
+from app.models.job import Job
+from app.schemas.callback import CallbackCreate, CallbackUpdate, CallbackFilterParams
+
+# SQLite has one writer at a time and its lock wait polls rather than queues,
+# so in a burst of claims an unlucky one can outwait busy_timeout. Claims in
+# this process take turns here instead; PostgreSQL claims run concurrently.
+_sqlite_claims = asyncio.Lock()
+
+
+async def get_callback(db: AsyncSession, callback_id: int) -> Optional[Callback]:
+    """
+    Get a callback by ID
+    """
+    return await db.run_sync(crud.get_callback, callback_id)
+
+
+async def get_callbacks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[CallbackFilterParams] = None,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    include_archived: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Get all callbacks with optional filtering, plus the next-page cursor.
+    With columns the page holds row tuples instead of Callback objects.
+    """
+    return await db.run_sync(
+        crud.get_callbacks, skip=skip, limit=limit, filters=filters, cursor=cursor, columns=columns,
+        include_archived=include_archived
+    )
+
+
+async def stream_callbacks(
+    db: AsyncSession,
+    columns: List[str],
+    filters: Optional[CallbackFilterParams] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Yield batches of matching callbacks as plain row tuples, in id order,
+    from a server-side cursor
+    """
+    statement = select(*(getattr(Callback, name) for name in columns))
+    statement = crud._apply_filters(statement, filters).order_by(Callback.id)
+    result = await db.stream(statement.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def get_changes(
+    db: AsyncSession,
+    since: Optional[str] = None,
+    limit: int = 1000,
+    columns: Optional[List[str]] = None
+) -> dict:
+    """
+    Callbacks changed and deleted since a high-water mark, plus the next one
+    """
+    return await db.run_sync(callback_sync.get_changes, since=since, limit=limit, columns=columns)
+
+
+async def create_callback(db: AsyncSession, callback: CallbackCreate) -> Callback:
+    """
+    Create a new callback
+    """
+    return await db.run_sync(crud.create_callback, callback)
+
+
+async def bulk_create_callbacks(
+    db: AsyncSession,
+    callbacks: List[CallbackCreate],
+    upsert: bool = False
+) -> Tuple[int, int]:
+    """
+    Write a batch of callbacks in a single transaction
+    """
+    return await db.run_sync(crud.bulk_create_callbacks, callbacks, upsert=upsert)
+
+
+async def update_callback(db: AsyncSession, callback_id: int, callback: CallbackUpdate) -> Optional[Callback]:
+    """
+    Update an existing callback
+    """
+    return await db.run_sync(crud.update_callback, callback_id, callback)
+
+
+async def delete_callback(db: AsyncSession, callback_id: int) -> bool:
+    """
+    Delete a callback
+    """
+    return await db.run_sync(crud.delete_callback, callback_id)
+
+
+async def bulk_update_callbacks(
+    db: AsyncSession,
+    changes: dict,
+    ids: Optional[List[int]] = None,
+    filters: Optional[CallbackFilterParams] = None
+) -> int:
+    """
+    Apply the same changes to every selected callback with one UPDATE
+    """
+    return await db.run_sync(crud.bulk_update_callbacks, changes, ids=ids, filters=filters)
+
+
+async def bulk_delete_callbacks(
+    db: AsyncSession,
+    ids: Optional[List[int]] = None,
+    filters: Optional[CallbackFilterParams] = None
+) -> int:
+    """
+    Delete every selected callback with one DELETE
+    """
+    return await db.run_sync(crud.bulk_delete_callbacks, ids=ids, filters=filters)
+
+
+async def search_callbacks(
+    db: AsyncSession,
+    search_term: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    include_archived: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Search callbacks, best matches first, plus the next-page cursor.
+    With columns the page holds row tuples instead of Callback objects.
+    """
+    return await db.run_sync(
+        crud.search_callbacks, search_term, skip=skip, limit=limit, cursor=cursor, columns=columns,
+        include_archived=include_archived
+    )
+
+
+async def get_callback_stats(db: AsyncSession, today: Optional[date] = None) -> dict:
+    """
+    Dashboard totals from the callback_stats summary table
+    """
+    return await db.run_sync(callback_stats.get_callback_stats, today)
+
+
+async def enqueue_scoring(db: AsyncSession, ids: Optional[List[int]] = None) -> Optional[Job]:
+    """
+    Queue a lead score recompute for the given callbacks, or for all unscored ones
+    """
+    return await db.run_sync(crud.enqueue_scoring, ids)
+
+
+async def find_duplicates(db: AsyncSession, phone: str, columns: Optional[List[str]] = None) -> list:
+    """
+    Callbacks with the same normalized number as `phone`, most recently modified first
+    """
+    return await db.run_sync(callback_duplicates.find_duplicates, phone, columns=columns)
+
+
+async def get_duplicate_groups(db: AsyncSession, limit: int = 100, after: Optional[str] = None) -> List[dict]:
+    """
+    Numbers shared by more than one callback, with their callback ids
+    """
+    return await db.run_sync(callback_duplicates.get_duplicate_groups, limit=limit, after=after)
+
+
+async def merge_callbacks(db: AsyncSession, keep_id: int, merge_ids: List[int]) -> Optional[Callback]:
+    """
+    Fold duplicate callbacks into keep_id
+    """
+    return await db.run_sync(callback_duplicates.merge_callbacks, keep_id, merge_ids)
+
+
+async def enqueue_dedupe(db: AsyncSession) -> Optional[Job]:
+    """
+    Queue a background merge of every duplicate group
+    """
+    return await db.run_sync(callback_duplicates.enqueue_dedupe)
+
+
+async def claim_next_callback(db: AsyncSession, agent_name: str, ttl_seconds: Optional[float] = None) -> Optional[Callback]:
+    """
+    Claim the next due callback for an agent
+    """
+    if db.bind.dialect.name == "sqlite":
+        async with _sqlite_claims:
+            return await db.run_sync(callback_claims.claim_next_callback, agent_name, ttl_seconds)
+    return await db.run_sync(callback_claims.claim_next_callback, agent_name, ttl_seconds)
+
+
+async def release_callback(db: AsyncSession, callback_id: int, agent_name: str) -> bool:
+    """
+    Give back a claim held by an agent
+    """
+    return await db.run_sync(callback_claims.release_callback, callback_id, agent_name)
+
+
+async def is_archived(db: AsyncSession, callback_id: int) -> bool:
+    """
+    Whether a callback was moved to the archive
+    """
+    return await db.run_sync(callback_archive.is_archived, callback_id)
+
+
+async def enqueue_archive(db: AsyncSession) -> Optional[Job]:
+    """
+    Queue a background archive of closed callbacks
+    """
+    return await db.run_sync(callback_archive.enqueue_archive)
+
+
+async def get_reminders(db: AsyncSession, remind_on: date, agent_name: Optional[str] = None) -> List[CallbackReminder]:
+    """
+    Follow-up reminders for a day, optionally for one agent
+    """
+    return await db.run_sync(callback_reminders.get_reminders, remind_on, agent_name)
+
+
+async def get_history(
+    db: AsyncSession,
+    callback_id: int,
+    limit: int = 100,
+    before_id: Optional[int] = None
+) -> List[CallbackHistory]:
+    """
+    History of one callback, newest first
+    """
+    return await db.run_sync(callback_history.get_history, callback_id, limit=limit, before_id=before_id)
+
+
+async def get_status_transitions(
+    db: AsyncSession,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    agent_name: Optional[str] = None
+) -> List[dict]:
+    """
+    Status change counts per agent between two days
+    """
+    return await db.run_sync(callback_history.get_status_transitions, start, end, agent_name)
@@ -0,0 +1,143 @@
+"""
+Cache of serialized callback list pages and detail reads.
+
+List entries are keyed on the normalized filters plus pagination, and the
+filters are kept in the key so a write only evicts lists whose filters match
+the row before or after the change.
+"""
+import hashlib
+import itertools
+import json
+import time
+from typing import Iterable, List, Optional
+
+from app.core.cache import get_cache
+from app.schemas.callback import CallbackFilterParams
+
+LIST_PREFIX = "callbacks:list:"
+DETAIL_PREFIX = "callbacks:detail:"
+
+# Bumped on every invalidation; a read only stores its result if no write
+# landed while it was querying, so a stale page cannot be cached after eviction
+_generation = itertools.count(1)
+_current_generation = 0
+_invalidated_at = 0.0
+
+# Token that never matches, for reads whose result must not be cached
+_UNCACHEABLE = -1
+
+
+def _normalize_filters(filters: Optional[CallbackFilterParams]) -> dict:
+    return filters.model_dump(mode="json", exclude_none=True) if filters else {}
+
+
+def list_cache_key(
+    filters: Optional[CallbackFilterParams],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    columns: Optional[List[str]] = None,
+    include_archived: bool = False
+) -> str:
+    """
+    Cache key for one page of get_callbacks
+    """
+    filter_key = json.dumps(_normalize_filters(filters), sort_keys=True, separators=(",", ":"))
+    page_key = f"{skip}:{limit}:{cursor or ''}:{','.join(columns or ())}"
+    return f"{LIST_PREFIX}{filter_key}|{page_key}{':archived' if include_archived else ''}"
+
+
+def detail_cache_key(callback_id: int) -> str:
+    """
+    Cache key for get_callback
+    """
+    return f"{DETAIL_PREFIX}{callback_id}"
+
+
+def begin_read(stale_window: float = 0) -> int:
+    """
+    Token to pass to store() once the read has been served from the database.
+    stale_window is how long after a write the database read from may still
+    lack it (a lagging replica); reads started inside it are not cached.
+    """
+    if stale_window and time.monotonic() - _invalidated_at < stale_window:
+        return _UNCACHEABLE
+    return _current_generation
+
+
+def store(key: str, body: bytes, next_cursor: Optional[str] = None, token: Optional[int] = None) -> dict:
+    """
+    Cache a serialized response body with its ETag and return the entry
+    """
+    entry = {
+        "body": body,
+        "etag": '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        "next_cursor": next_cursor,
+    }
+    if token is None or token == _current_generation:
+        get_cache().set(key, entry)
+    return entry
+
+
+def lookup(key: str) -> Optional[dict]:
+    """
+    Cached entry for a key, if any
+    """
+    return get_cache().get(key)
+
+
+def filter_snapshot(callback) -> dict:
+    """
+    The fields of a callback (model instance or column dict) that decide
+    which list filters it matches
+    """
+    if isinstance(callback, dict):
+        follow_up_date, status, agent_name = (callback.get(name) for name in ("follow_up_date", "status", "agent_name"))
+    else:
+        follow_up_date, status, agent_name = callback.follow_up_date, callback.status, callback.agent_name
+    return {
+        "follow_up_date": follow_up_date.isoformat() if follow_up_date else None,
+        "status": status,
+        "agent_name": agent_name,
+    }
+
+
+def _matches(filters: dict, row: dict) -> bool:
+    follow_up_date = row["follow_up_date"]
+    if "follow_up_date_start" in filters and (follow_up_date is None or follow_up_date < filters["follow_up_date_start"]):
+        return False
+    if "follow_up_date_end" in filters and (follow_up_date is None or follow_up_date > filters["follow_up_date_end"]):
+        return False
+    if "status" in filters and row["status"] != filters["status"]:
+        return False
+    if "agent_name" in filters and row["agent_name"] != filters["agent_name"]:
+        return False
+    return True
+
+
+def _bump_generation() -> None:
+    global _current_generation, _invalidated_at
+    _current_generation = next(_generation)
+    _invalidated_at = time.monotonic()
+
+
+def invalidate(callback_ids: Optional[Iterable[int]] = (), rows: Optional[List[dict]] = None) -> None:
+    """
+    Evict detail entries for callback_ids and every list whose filters match
+    one of the filter snapshots in rows. callback_ids=None evicts every
+    detail entry and rows=None every list.
+    """
+    _bump_generation()
+    cache = get_cache()
+    if callback_ids is None:
+        stale = list(cache.iter_keys(DETAIL_PREFIX))
+    else:
+        stale = [detail_cache_key(callback_id) for callback_id in callback_ids]
+    for key in cache.iter_keys(LIST_PREFIX):
+        if rows is None:
+            stale.append(key)
+            continue
+        filters = json.loads(key[len(LIST_PREFIX):].rpartition("|")[0])
+        if any(_matches(filters, row) for row in rows):
+            stale.append(key)
+    cache.delete_many(stale)
@@ -0,0 +1,95 @@
+"""
+Claim-next work queue: agents take the next due callback and hold it until
+its claim expires, they release it, or they record an outcome.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.callback import Callback, claim_order, open_status_filter
+
+
+def _db_now(db: Session):
+    """
+    SQL expression for the database clock, comparable with stored claim times
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.datetime("now")
+    return func.now()
+
+
+def _claim_deadline(db: Session, seconds: float):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.datetime("now", f"+{int(seconds)} seconds")
+    return func.now() + timedelta(seconds=seconds)
+
+
+def _unclaimed(db: Session):
+    return or_(Callback.claimed_until.is_(None), Callback.claimed_until < _db_now(db))
+
+
+def claim_queue(db: Session, agent_name: str):
+    """
+    select() of the ids an agent may claim, in claim order: open callbacks due
+    today or earlier, assigned to the agent or to nobody, with no live claim.
+    Walks the ix_callbacks_claim_queue partial index in order and stops at the
+    first match; the agent test is written with coalesce() so the planner is
+    not tempted into an agent index plus a sort of every due row.
+    """
+    return (
+        select(Callback.id)
+        .where(
+            open_status_filter(),
+            Callback.follow_up_date <= date.today(),
+            func.coalesce(Callback.agent_name, agent_name) == agent_name,
+            _unclaimed(db),
+        )
+        .order_by(*claim_order())
+    )
+
+
+def claim_next_callback(db: Session, agent_name: str, ttl_seconds: Optional[float] = None) -> Optional[Callback]:
+    """
+    Claim the first callback in claim_queue for agent_name until ttl_seconds
+    (CLAIM_TTL_SECONDS by default) from now, or return None if none is due.
+
+    One UPDATE ... WHERE id = (SELECT ... LIMIT 1) RETURNING statement. On
+    PostgreSQL the subquery takes the row FOR UPDATE SKIP LOCKED, so
+    concurrent claims pass over each other's rows instead of queueing on
+    them. SQLite runs writes one at a time, and the same statement is atomic
+    there. Either way a row is handed to at most one agent while its claim
+    lives. last_modified is left alone: a claim is not an edit.
+    """
+    ttl_seconds = settings.CLAIM_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    candidate = claim_queue(db, agent_name).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+    statement = (
+        update(Callback)
+        .where(Callback.id == candidate, _unclaimed(db))
+        .values(claimed_by=agent_name, claimed_until=_claim_deadline(db, ttl_seconds), last_modified=Callback.last_modified)
+        .returning(Callback)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        claimed = db.scalars(statement).first()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return claimed
+
+
+def release_callback(db: Session, callback_id: int, agent_name: str) -> bool:
+    """
+    Give back a claim held by agent_name; False if the agent does not hold it
+    """
+    released = db.execute(
+        update(Callback)
+        .where(Callback.id == callback_id, Callback.claimed_by == agent_name)
+        .values(claimed_by=None, claimed_until=None, last_modified=Callback.last_modified)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return bool(released)
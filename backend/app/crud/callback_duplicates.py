@@ -0,0 +1,154 @@
+"""
+Duplicate leads: callbacks whose numbers normalize to the same
+phone_normalized key, and merging them into one callback.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.crud import callback_cache, callback_events, callback_history, callback_stats, jobs
+from app.crud.callback import SCORE_JOB, _callbacks_query, get_callback
+from app.models.callback import Callback, SCORING_FIELDS
+from app.models.callback_tombstone import CallbackTombstone
+from app.models.job import Job
+
+
+# Filled on the kept callback from its duplicates when it has no value of its own
+MERGE_FIELDS = (
+    "product", "vehicle_year", "car_make", "car_model", "zip_code",
+    "follow_up_date", "agent_name", "last_modified_by",
+)
+DEDUPE_JOB = "dedupe_callbacks"
+
+
+def find_duplicates(db: Session, phone: str, columns: Optional[List[str]] = None) -> list:
+    """
+    Callbacks whose number normalizes to the same key as `phone`, most
+    recently modified first. One probe of ix_callbacks_phone_normalized.
+    """
+    key = normalize_phone(phone)
+    if key is None:
+        return []
+    return (
+        _callbacks_query(db, columns)
+        .filter(Callback.phone_normalized == key)
+        .order_by(Callback.last_modified.desc(), Callback.id.desc())
+        .all()
+    )
+
+
+def get_duplicate_groups(db: Session, limit: int = 100, after: Optional[str] = None) -> List[dict]:
+    """
+    Numbers shared by more than one callback, in phone_normalized order after
+    `after`, each with its callback ids, most recently modified first
+    """
+    keys = db.query(Callback.phone_normalized).filter(Callback.phone_normalized.isnot(None))
+    if after is not None:
+        keys = keys.filter(Callback.phone_normalized > after)
+    keys = [
+        key for key, in keys.group_by(Callback.phone_normalized)
+        .having(func.count() > 1).order_by(Callback.phone_normalized).limit(limit)
+    ]
+    if not keys:
+        return []
+    groups: Dict[str, List[int]] = {key: [] for key in keys}
+    members = (
+        db.query(Callback.phone_normalized, Callback.id)
+        .filter(Callback.phone_normalized.in_(keys))
+        .order_by(Callback.phone_normalized, Callback.last_modified.desc(), Callback.id.desc())
+    )
+    for key, callback_id in members:
+        groups[key].append(callback_id)
+    return [{"phone_normalized": key, "ids": ids} for key, ids in groups.items()]
+
+
+def merge_callbacks(db: Session, keep_id: int, merge_ids: List[int]) -> Optional[Callback]:
+    """
+    Fold duplicate callbacks into `keep_id`: fields it lacks are taken from the
+    most recently modified duplicate that has them, comments are appended, and
+    the duplicates are deleted. Returns None if keep_id does not exist.
+    """
+    db_callback = get_callback(db, keep_id)
+    if not db_callback:
+        return None
+    duplicates = (
+        db.query(Callback)
+        .filter(Callback.id.in_([callback_id for callback_id in merge_ids if callback_id != keep_id]))
+        .order_by(Callback.last_modified.desc(), Callback.id.desc())
+        .all()
+    )
+    if not duplicates:
+        return db_callback
+
+    before = callback_cache.filter_snapshot(db_callback)
+    duplicates_before = [callback_cache.filter_snapshot(duplicate) for duplicate in duplicates]
+    stats_before = [callback_stats.stats_snapshot(row) for row in [db_callback, *duplicates]]
+    history_before = callback_history.snapshot(db_callback)
+    filled = set()
+    for name in MERGE_FIELDS:
+        if getattr(db_callback, name) is None:
+            value = next((getattr(row, name) for row in duplicates if getattr(row, name) is not None), None)
+            if value is not None:
+                setattr(db_callback, name, value)
+                filled.add(name)
+    comments = [db_callback.comments] + [row.comments for row in duplicates]
+    comments = [text for text in dict.fromkeys(comment.strip() for comment in comments if comment) if text]
+    db_callback.comments = "\n".join(comments) or None
+
+    merged_ids = [row.id for row in duplicates]
+    callback_stats.record_changes(db, removed=stats_before, added=[callback_stats.stats_snapshot(db_callback)])
+    callback_history.record(db, [
+        callback_history.entry(callback_history.UPDATED, keep_id, history_before, callback_history.snapshot(db_callback)),
+        *(
+            callback_history.entry(callback_history.MERGED, row.id, callback_history.snapshot(row), None)
+            for row in duplicates
+        ),
+    ])
+    db.add_all([CallbackTombstone(callback_id=callback_id) for callback_id in merged_ids])
+    for duplicate in duplicates:
+        db.delete(duplicate)
+    if settings.JOBS_ENABLED and filled.intersection(SCORING_FIELDS):
+        jobs.enqueue(db, SCORE_JOB, {"ids": [keep_id]})
+    db.commit()
+    db.refresh(db_callback)
+    callback_cache.invalidate(
+        [keep_id, *merged_ids], rows=[before, callback_cache.filter_snapshot(db_callback), *duplicates_before]
+    )
+    callback_events.publish(
+        callback_events.MERGED, [before, db_callback, *duplicates_before],
+        callback=callback_events.payload(db_callback), ids=merged_ids
+    )
+    return db_callback
+
+
+def dedupe_callbacks(db: Session, dry_run: bool = False, batch_size: int = 100) -> Dict[str, int]:
+    """
+    Merge every group of callbacks sharing a normalized number into its most
+    recently modified callback, one transaction per group. With dry_run,
+    only count. Returns {"groups": ..., "merged": ...}.
+    """
+    totals = {"groups": 0, "merged": 0}
+    after = None
+    while True:
+        groups = get_duplicate_groups(db, limit=batch_size, after=after)
+        if not groups:
+            return totals
+        for group in groups:
+            keep_id, *merge_ids = group["ids"]
+            if not dry_run:
+                merge_callbacks(db, keep_id, merge_ids)
+            totals["groups"] += 1
+            totals["merged"] += len(merge_ids)
+        after = groups[-1]["phone_normalized"]
+
+
+def enqueue_dedupe(db: Session) -> Optional[Job]:
+    """
+    Queue a dedupe_callbacks run; returns None when one is already queued
+    """
+    job = jobs.enqueue(db, DEDUPE_JOB, dedupe_key=DEDUPE_JOB)
+    db.commit()
+    return job
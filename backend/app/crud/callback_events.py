@@ -0,0 +1,140 @@
+"""
+Change feed of callback writes.
+
+The CRUD functions publish an event after each commit. Single-row events carry
+the CallbackResponse payload. Bulk events carry counts and, when the selection
+was by id, the ids. Every event lists the (status, agent_name) scopes it
+touched, before and after the change, so a subscriber filtered by agent or
+status also hears about rows leaving its view.
+"""
+import asyncio
+from typing import AsyncIterator, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.events import get_broker
+from app.schemas.callback import CallbackResponse
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+BULK_UPDATED = "bulk_updated"
+BULK_DELETED = "bulk_deleted"
+IMPORTED = "imported"
+# Duplicates folded into one callback; carries the kept callback and the removed ids
+MERGED = "merged"
+# Lead scores written by the background scoring job
+SCORED = "scored"
+# Closed callbacks moved to callbacks_archive; carries the count and ids
+ARCHIVED = "archived"
+
+# Sent instead of a replay when the client's last event is no longer retained,
+# or when it fell too far behind; the client should reload its data
+RESET = "reset"
+
+
+def enabled() -> bool:
+    return settings.EVENTS_ENABLED
+
+
+def payload(callback) -> dict:
+    """
+    JSON-ready CallbackResponse dict for a model instance
+    """
+    return CallbackResponse.model_validate(callback).model_dump(mode="json")
+
+
+def _scopes(rows: Iterable) -> List[dict]:
+    scopes = []
+    for row in rows:
+        if isinstance(row, dict):
+            scope = {"status": row.get("status"), "agent_name": row.get("agent_name")}
+        else:
+            scope = {"status": row.status, "agent_name": row.agent_name}
+        if scope not in scopes:
+            scopes.append(scope)
+    return scopes
+
+
+def publish(kind: str, rows: Iterable, **data) -> None:
+    """
+    Publish a change event touching `rows` (model instances or column dicts);
+    data holds the event body, e.g. callback=payload(...) or count=...
+    """
+    if not enabled():
+        return
+    get_broker().publish({"type": kind, "scopes": _scopes(rows), **data})
+
+
+def matches(event: dict, status: Optional[str] = None, agent_name: Optional[str] = None) -> bool:
+    """
+    Whether an event concerns callbacks with this status and/or agent
+    """
+    if status is None and agent_name is None:
+        return True
+    return any(
+        (status is None or scope["status"] == status) and (agent_name is None or scope["agent_name"] == agent_name)
+        for scope in event.get("scopes", ())
+    )
+
+
+async def listen(
+    last_event_id: Optional[int] = None,
+    status: Optional[str] = None,
+    agent_name: Optional[str] = None
+) -> AsyncIterator[Optional[dict]]:
+    """
+    Yield matching events: first those after last_event_id, then live ones.
+    Yields None when EVENTS_KEEPALIVE_SECONDS pass quietly. A RESET event ends
+    the stream when the client cannot be caught up.
+    """
+    broker = get_broker()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+    overflowed = False
+
+    def put(event: dict):
+        nonlocal overflowed
+        if queue.full():
+            overflowed = True
+        else:
+            queue.put_nowait(event)
+
+    def deliver(event: dict):
+        # Called from the publishing thread
+        if matches(event, status, agent_name):
+            loop.call_soon_threadsafe(put, event)
+
+    # Subscribe before replaying so nothing published in between is lost. A
+    # shared broker answers these from its store, so they run off the event loop.
+    unsubscribe = await asyncio.to_thread(broker.subscribe, deliver)
+    try:
+        # Only events published after subscribe() are queued
+        sent = 0
+        if last_event_id is not None:
+            replayed = await asyncio.to_thread(broker.replay, last_event_id)
+            if replayed is None:
+                yield {"id": await asyncio.to_thread(broker.last_id), "type": RESET}
+                return
+            for event in replayed:
+                if matches(event, status, agent_name):
+                    yield event
+                sent = event["id"]
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if overflowed:
+                    yield {"id": await asyncio.to_thread(broker.last_id), "type": RESET}
+                    return
+                yield None
+                continue
+            if event["id"] <= sent:
+                continue
+            yield event
+            sent = event["id"]
+            if overflowed and queue.empty():
+                yield {"id": await asyncio.to_thread(broker.last_id), "type": RESET}
+                return
+    finally:
+        unsubscribe()
@@ -0,0 +1,163 @@
+"""
+Append-only change history of callbacks, in the callback_history table.
+
+Every callback write passes the before and after values of the rows it
+touched to record() inside its own transaction. All entries of one write go
+out as a single executemany INSERT and are committed with the write, so
+history costs one statement and no extra commit per request. Set-based
+writes (bulk delete, archive) copy straight from their selection with
+INSERT ... SELECT.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import String, func, insert, literal, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.callback import Callback
+from app.models.callback_history import CallbackHistory
+
+# Fields whose changes are recorded; derived columns and timestamps are not
+HISTORY_FIELDS = (
+    "product", "vehicle_year", "car_make", "car_model", "zip_code", "customer_name",
+    "callback_number", "follow_up_date", "status", "agent_name", "comments",
+)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+MERGED = "merged"
+ARCHIVED = "archived"
+
+
+def enabled() -> bool:
+    return settings.HISTORY_ENABLED
+
+
+def snapshot(callback) -> dict:
+    """
+    The recorded fields of a callback (model instance or column dict)
+    """
+    if isinstance(callback, dict):
+        return {name: callback.get(name) for name in HISTORY_FIELDS if name in callback}
+    return {name: getattr(callback, name) for name in HISTORY_FIELDS}
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def entry(
+    action: str,
+    callback_id: int,
+    before: Optional[dict],
+    after: Optional[dict],
+    changed_by: Optional[str] = None
+) -> Optional[dict]:
+    """
+    History row for one write from snapshot()s of the callback before it
+    (None on create) and after it (None on delete); None if nothing changed
+    """
+    old = before or {}
+    changes = None
+    if after is not None:
+        changes = {
+            name: [_json_value(old.get(name)), _json_value(value)]
+            for name, value in after.items()
+            if value != old.get(name)
+        }
+        if not changes and before is not None:
+            return None
+    from_status = old.get("status")
+    to_status = after.get("status") if after is not None else None
+    if from_status == to_status:
+        from_status = to_status = None
+    agent_name = (after if after is not None else old).get("agent_name")
+    return {
+        "callback_id": callback_id,
+        "action": action,
+        "changes": changes or None,
+        "from_status": from_status,
+        "to_status": to_status,
+        "agent_name": agent_name,
+        "changed_by": changed_by,
+    }
+
+
+def record(db: Session, entries: Iterable[Optional[dict]]) -> None:
+    """
+    Write history rows built by entry() with one executemany, in the caller's transaction
+    """
+    if not enabled():
+        return
+    rows = [row for row in entries if row is not None]
+    if rows:
+        db.execute(insert(CallbackHistory), rows)
+
+
+def record_selection(db: Session, action: str, selection) -> None:
+    """
+    Write one history row per callback picked by selection (a select() of
+    Callback ids) with INSERT ... SELECT, for rows leaving the table
+    """
+    if not enabled():
+        return
+    source = select(
+        Callback.id, literal(action), Callback.status, Callback.agent_name
+    ).where(Callback.id.in_(selection))
+    db.execute(insert(CallbackHistory).from_select(
+        ["callback_id", "action", "from_status", "agent_name"], source
+    ))
+
+
+def get_history(
+    db: Session,
+    callback_id: int,
+    limit: int = 100,
+    before_id: Optional[int] = None
+) -> List[CallbackHistory]:
+    """
+    History of one callback, newest first; pass the last id seen as before_id for the next page
+    """
+    query = db.query(CallbackHistory).filter(CallbackHistory.callback_id == callback_id)
+    if before_id is not None:
+        query = query.filter(CallbackHistory.id < before_id)
+    return query.order_by(CallbackHistory.id.desc()).limit(limit).all()
+
+
+def _day_start(db: Session, day: date):
+    """
+    Midnight UTC of a day, comparable with changed_at (raw text on SQLite)
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return day.isoformat()
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def get_status_transitions(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    agent_name: Optional[str] = None
+) -> List[dict]:
+    """
+    Number of status changes per (agent, from_status, to_status) between
+    start and end inclusive (UTC days), most frequent first. A from_status of
+    None is a callback created in to_status; a to_status of None one deleted.
+    """
+    changed_at = CallbackHistory.changed_at
+    if db.get_bind().dialect.name == "sqlite":
+        changed_at = type_coerce(changed_at, String)
+    keys = (CallbackHistory.agent_name, CallbackHistory.from_status, CallbackHistory.to_status)
+    query = select(*keys, func.count().label("count")).where(
+        or_(CallbackHistory.from_status.isnot(None), CallbackHistory.to_status.isnot(None))
+    )
+    if start:
+        query = query.where(changed_at >= _day_start(db, start))
+    if end:
+        query = query.where(changed_at < _day_start(db, end + timedelta(days=1)))
+    if agent_name:
+        query = query.where(CallbackHistory.agent_name == agent_name)
+    query = query.group_by(*keys).order_by(func.count().desc(), *keys)
+    return [row._asdict() for row in db.execute(query)]
@@ -0,0 +1,42 @@
+"""
+Follow-up reminders generated from callbacks' follow_up_date.
+
+The reminders job writes one row per open callback due on a day, so agents
+can pull their list for the day without scanning callbacks. Generation is
+idempotent: callbacks that already have a reminder for the day are skipped.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import and_, exists, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.callback import Callback, open_status_filter
+from app.models.callback_reminder import CallbackReminder
+
+
+def create_follow_up_reminders(db: Session, remind_on: date) -> int:
+    """
+    Add reminders for the open callbacks due on `remind_on`; returns how many were added
+    """
+    already = exists().where(and_(
+        CallbackReminder.callback_id == Callback.id, CallbackReminder.remind_on == remind_on
+    ))
+    due = select(Callback.id, Callback.agent_name, literal(remind_on)).where(
+        Callback.follow_up_date == remind_on, open_status_filter(), ~already
+    )
+    added = db.execute(
+        insert(CallbackReminder).from_select(["callback_id", "agent_name", "remind_on"], due)
+    ).rowcount
+    db.commit()
+    return added
+
+
+def get_reminders(db: Session, remind_on: date, agent_name: Optional[str] = None) -> List[CallbackReminder]:
+    """
+    Reminders for a day, optionally for one agent
+    """
+    query = db.query(CallbackReminder).filter(CallbackReminder.remind_on == remind_on)
+    if agent_name:
+        query = query.filter(CallbackReminder.agent_name == agent_name)
+    return query.order_by(CallbackReminder.agent_name, CallbackReminder.callback_id).all()
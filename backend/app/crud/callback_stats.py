@@ -0,0 +1,187 @@
+"""
+Incremental maintenance of the callback_stats summary table.
+
+Every callback write passes the rows it removed and added to record_changes()
+inside its own transaction; the deltas are folded per (dimension, value) and
+applied with a single upsert, so the dashboard totals never need a scan of
+the callbacks table.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, case, cast, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.callback import Callback
+from app.models.callback_stats import CallbackStat
+
+DIMENSIONS = {
+    "status": "status",
+    "agent": "agent_name",
+    "follow_up_date": "follow_up_date",
+}
+
+# (dimension, value) -> [count, lead_score_sum, lead_score_count]
+Deltas = Dict[Tuple[str, str], List[float]]
+
+
+def stats_snapshot(callback) -> dict:
+    """
+    The fields of a callback (model instance or column dict) that feed the stats
+    """
+    if isinstance(callback, dict):
+        return {name: callback.get(name) for name in ("status", "agent_name", "follow_up_date", "lead_score")}
+    return {
+        "status": callback.status,
+        "agent_name": callback.agent_name,
+        "follow_up_date": callback.follow_up_date,
+        "lead_score": callback.lead_score,
+    }
+
+
+def _keys(row: dict) -> List[Tuple[str, str]]:
+    keys = [("total", "")]
+    for dimension, field in DIMENSIONS.items():
+        value = row.get(field)
+        if isinstance(value, date):
+            value = value.isoformat()
+        keys.append((dimension, value or ""))
+    return keys
+
+
+def _add(deltas: Deltas, row: dict, sign: int, count: int = 1) -> None:
+    score = row.get("lead_score")
+    for key in _keys(row):
+        delta = deltas.setdefault(key, [0, 0.0, 0])
+        delta[0] += sign * count
+        if score is not None:
+            delta[1] += sign * score * count
+            delta[2] += sign * count
+
+
+def _apply(db: Session, deltas: Deltas) -> None:
+    rows = [
+        {"dimension": dimension, "value": value, "count": count, "lead_score_sum": score_sum, "lead_score_count": score_count}
+        for (dimension, value), (count, score_sum, score_count) in deltas.items()
+        if count or score_sum or score_count
+    ]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        statement = dialect_insert(CallbackStat)
+        statement = statement.on_conflict_do_update(
+            index_elements=[CallbackStat.dimension, CallbackStat.value],
+            set_={
+                "count": CallbackStat.count + statement.excluded.count,
+                "lead_score_sum": CallbackStat.lead_score_sum + statement.excluded.lead_score_sum,
+                "lead_score_count": CallbackStat.lead_score_count + statement.excluded.lead_score_count,
+            },
+        )
+        db.execute(statement, rows)
+        return
+
+    for row in rows:
+        stat = db.get(CallbackStat, (row["dimension"], row["value"]))
+        if stat is None:
+            db.add(CallbackStat(**row))
+        else:
+            stat.count += row["count"]
+            stat.lead_score_sum += row["lead_score_sum"]
+            stat.lead_score_count += row["lead_score_count"]
+
+
+def record_changes(db: Session, removed: Iterable[dict] = (), added: Iterable[dict] = ()) -> None:
+    """
+    Fold the stats snapshots of removed and added rows into callback_stats.
+    An update is one removal of the old values plus one addition of the new.
+    Must run inside the write's transaction, before its commit.
+    """
+    deltas: Deltas = {}
+    for row in removed:
+        _add(deltas, row, -1)
+    for row in added:
+        _add(deltas, row, 1)
+    _apply(db, deltas)
+
+
+def record_group_changes(db: Session, groups: Iterable[Tuple[dict, int, float, int]], sign: int) -> None:
+    """
+    Fold pre-aggregated groups of rows into callback_stats.
+    Each group is (snapshot without lead_score, row count, lead_score sum,
+    count of rows with a lead_score), e.g. from a GROUP BY over rows a
+    set-based write is about to change; sign is -1 for rows leaving and +1
+    for rows arriving.
+    """
+    deltas: Deltas = {}
+    for row, count, score_sum, score_count in groups:
+        for key in _keys(row):
+            delta = deltas.setdefault(key, [0, 0.0, 0])
+            delta[0] += sign * count
+            delta[1] += sign * (score_sum or 0.0)
+            delta[2] += sign * (score_count or 0)
+    _apply(db, deltas)
+
+
+def rebuild_callback_stats(db: Session) -> None:
+    """
+    Recompute callback_stats from scratch with one GROUP BY per dimension
+    """
+    db.query(CallbackStat).delete()
+    for dimension, field in [("total", None)] + list(DIMENSIONS.items()):
+        value = func.coalesce(cast(getattr(Callback, field), String), "") if field else literal("")
+        totals = select(
+            literal(dimension),
+            value,
+            func.count(),
+            func.coalesce(func.sum(Callback.lead_score), 0.0),
+            func.count(Callback.lead_score),
+        )
+        if field:
+            totals = totals.group_by(value)
+        db.execute(insert(CallbackStat).from_select(
+            ["dimension", "value", "count", "lead_score_sum", "lead_score_count"], totals
+        ))
+    db.commit()
+
+
+def get_callback_stats(db: Session, today: Optional[date] = None) -> dict:
+    """
+    Dashboard totals read from callback_stats only
+    """
+    today = (today or date.today()).isoformat()
+    result = {
+        "total": 0,
+        "by_status": {},
+        "by_agent": {},
+        "by_follow_up": {"overdue": 0, "today": 0, "upcoming": 0, "unscheduled": 0},
+        "average_lead_score": None,
+    }
+
+    for stat in db.query(CallbackStat).filter(
+        CallbackStat.dimension.in_(("total", "status", "agent")), CallbackStat.count > 0
+    ):
+        if stat.dimension == "total":
+            result["total"] = stat.count
+            if stat.lead_score_count:
+                result["average_lead_score"] = stat.lead_score_sum / stat.lead_score_count
+        elif stat.dimension == "status":
+            result["by_status"][stat.value] = stat.count
+        else:
+            result["by_agent"][stat.value] = stat.count
+
+    bucket = case(
+        (CallbackStat.value == "", "unscheduled"),
+        (CallbackStat.value < today, "overdue"),
+        (CallbackStat.value == today, "today"),
+        else_="upcoming",
+    )
+    for name, count in db.query(bucket, func.sum(CallbackStat.count)).filter(
+        CallbackStat.dimension == "follow_up_date"
+    ).group_by(bucket):
+        result["by_follow_up"][name] = int(count or 0)
+    return result
@@ -0,0 +1,138 @@
+"""
+Incremental sync for offline clients: GET /callbacks/changes.
+
+Clients pass back the token from their previous call and get the callbacks
+changed since then, in (last_modified, id) order, plus the ids deleted or
+archived since then from the tombstone table. Tombstones older than
+SYNC_TOMBSTONE_DAYS are purged; a client whose token predates them is told
+to resync from scratch.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.callback import _callbacks_query, _db_time, _decode_cursor, _encode_cursor, _last_modified_key, _timestamp_key
+from app.models.callback import Callback
+from app.models.callback_tombstone import CallbackTombstone
+
+
+def _timestamp_value(db: Session, value: str):
+    """
+    Parse an ISO timestamp into a value comparable with _timestamp_key,
+    raising ValueError if it is malformed; naive timestamps are UTC
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if db.get_bind().dialect.name == "sqlite":
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None).isoformat(sep=" ")
+    return parsed
+
+
+def _decode_changes_token(db: Session, since: str) -> Tuple[tuple, tuple]:
+    """
+    (callbacks key, tombstones key) from a /changes token or an ISO timestamp
+    """
+    try:
+        start = _timestamp_value(db, since)
+        return (start, 0), (start, 0)
+    except ValueError:
+        pass
+    modified, callback_id, deleted_at, tombstone_id = _decode_cursor(since, 4)
+    try:
+        if db.get_bind().dialect.name != "sqlite":
+            modified, deleted_at = datetime.fromisoformat(modified), datetime.fromisoformat(deleted_at)
+        return (modified, int(callback_id)), (deleted_at, int(tombstone_id))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid since token") from exc
+
+
+def _settled_key(key: Optional[tuple], boundary) -> tuple:
+    """
+    High-water mark of an exhausted stream: the settle boundary. Everything
+    before it has been read, so the mark moves up to it even when nothing new
+    arrived; otherwise an idle delete stream would fall behind the tombstone
+    retention and force a reset. A newer mark is held back to it: on
+    PostgreSQL last_modified is the transaction's start time, so a row can
+    commit after newer ones, and re-reading the last few seconds catches it.
+    """
+    if key is None or key[0] > boundary:
+        return boundary, 0
+    return max(key, (boundary, 0))
+
+
+def get_changes(
+    db: Session,
+    since: Optional[str] = None,
+    limit: int = 1000,
+    columns: Optional[List[str]] = None
+) -> dict:
+    """
+    Callbacks changed and deleted since a high-water mark.
+
+    since is a token from a previous call or an ISO timestamp; None starts a
+    full snapshot. Upserts are row tuples of the given columns in
+    (last_modified, id) order and deletes are callback ids from the tombstone
+    table, each up to limit per call. Returns a dict with upserts, deletes,
+    next (the token to pass back), has_more, and reset. reset is set when since
+    predates the tombstone retention, in which case the client must resync
+    from scratch.
+    """
+    columns = columns or ["id"]
+    boundary = _db_time(db, settings.SYNC_SETTLE_SECONDS)
+    if since is None:
+        callback_key, tombstone_key = None, (boundary, 0)
+    else:
+        callback_key, tombstone_key = _decode_changes_token(db, since)
+        if settings.SYNC_TOMBSTONE_DAYS and tombstone_key[0] < _db_time(db, settings.SYNC_TOMBSTONE_DAYS * 86400):
+            return {"upserts": [], "deletes": [], "next": None, "has_more": False, "reset": True}
+
+    modified = _last_modified_key(db)
+    query = _callbacks_query(db, columns).add_columns(modified, Callback.id)
+    if callback_key is not None:
+        query = query.filter(tuple_(modified, Callback.id) > tuple_(*callback_key))
+    rows = query.order_by(Callback.last_modified, Callback.id).limit(limit + 1).all()
+
+    deleted_at = _timestamp_key(db, CallbackTombstone.deleted_at)
+    tombstones = db.query(CallbackTombstone.callback_id, deleted_at, CallbackTombstone.id).filter(
+        tuple_(deleted_at, CallbackTombstone.id) > tuple_(*tombstone_key)
+    ).order_by(CallbackTombstone.deleted_at, CallbackTombstone.id).limit(limit + 1).all()
+
+    more_upserts, more_deletes = len(rows) > limit, len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        callback_key = tuple(rows[-1][-2:])
+    if tombstones:
+        tombstone_key = tuple(tombstones[-1][-2:])
+    if not more_upserts:
+        callback_key = _settled_key(callback_key, boundary)
+    if not more_deletes:
+        tombstone_key = _settled_key(tombstone_key, boundary)
+
+    token = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in (*callback_key, *tombstone_key)
+    ]
+    return {
+        "upserts": [tuple(row[:-2]) for row in rows],
+        "deletes": [callback_id for callback_id, _, _ in tombstones],
+        "next": _encode_cursor(token),
+        "has_more": more_upserts or more_deletes,
+        "reset": False,
+    }
+
+
+def purge_tombstones(db: Session, days: Optional[int] = None) -> int:
+    """
+    Delete tombstones older than `days` (SYNC_TOMBSTONE_DAYS by default).
+    Returns the number removed.
+    """
+    days = settings.SYNC_TOMBSTONE_DAYS if days is None else days
+    cutoff = _db_time(db, days * 86400)
+    deleted_at = _timestamp_key(db, CallbackTombstone.deleted_at)
+    removed = db.execute(delete(CallbackTombstone).where(deleted_at < cutoff)).rowcount
+    db.commit()
+    return removed
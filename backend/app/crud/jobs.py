@@ -0,0 +1,139 @@
+"""
+Persistent job queue operations.
+
+enqueue() only adds the job to the caller's session, so it commits (or rolls
+back) together with the write that needed it. Workers claim due jobs in
+batches; on PostgreSQL the claim uses FOR UPDATE SKIP LOCKED, so several
+processes can share the queue.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job, QUEUED, RUNNING, DONE, FAILED
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Optional[dict] = None,
+    dedupe_key: Optional[str] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None
+) -> Optional[Job]:
+    """
+    Add a job to the session without committing. With dedupe_key, nothing is
+    added while a job with that key is still queued; returns None then.
+    """
+    if dedupe_key is not None:
+        queued = db.query(Job.id).filter(Job.dedupe_key == dedupe_key, Job.status == QUEUED).first()
+        if queued is not None:
+            return None
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        status=QUEUED,
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_after=_now() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    return job
+
+
+def claim_jobs(db: Session, kind: str, limit: int) -> List[Job]:
+    """
+    Mark up to `limit` due jobs of a kind as running and return them, oldest first
+    """
+    now = _now()
+    candidates = select(Job.id).where(
+        Job.status == QUEUED, Job.kind == kind, Job.run_after <= now
+    ).order_by(Job.run_after, Job.id).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+    ids = list(db.execute(candidates).scalars())
+    if not ids:
+        db.rollback()
+        return []
+    # The status check keeps a job claimed by a racing worker from being taken twice
+    db.execute(
+        update(Job).where(Job.id.in_(ids), Job.status == QUEUED)
+        .values(status=RUNNING, locked_at=now, attempts=Job.attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.query(Job).filter(Job.id.in_(ids), Job.status == RUNNING, Job.locked_at == now).order_by(Job.id).all()
+
+
+def complete_jobs(db: Session, jobs: List[Job]) -> None:
+    """
+    Mark jobs as done
+    """
+    db.execute(
+        update(Job).where(Job.id.in_([job.id for job in jobs]))
+        .values(status=DONE, finished_at=_now(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def fail_jobs(db: Session, jobs: List[Job], error: str) -> None:
+    """
+    Requeue jobs with exponential backoff, or mark them failed once they are out of attempts
+    """
+    now = _now()
+    for job in jobs:
+        if job.attempts >= job.max_attempts:
+            values = {"status": FAILED, "finished_at": now}
+        else:
+            delay = settings.JOBS_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            values = {"status": QUEUED, "run_after": now + timedelta(seconds=delay), "locked_at": None}
+        db.execute(
+            update(Job).where(Job.id == job.id).values(last_error=error[:2000], **values)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """
+    Put back jobs left running by a worker that died, after JOBS_LOCK_TIMEOUT_SECONDS
+    """
+    cutoff = _now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    requeued = db.execute(
+        update(Job).where(Job.status == RUNNING, or_(Job.locked_at.is_(None), Job.locked_at < cutoff))
+        .values(status=QUEUED, locked_at=None, run_after=_now())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return requeued
+
+
+def queue_depth(db: Session) -> Dict[str, Dict[str, int]]:
+    """
+    Job counts by kind and status
+    """
+    depth: Dict[str, Dict[str, int]] = {}
+    for kind, status, count in db.execute(select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)):
+        depth.setdefault(kind, {})[status] = count
+    return depth
+
+
+def purge_finished_jobs(db: Session, days: Optional[float] = None) -> int:
+    """
+    Delete done and failed jobs that finished more than `days` ago (JOBS_RETENTION_DAYS by default)
+    """
+    days = settings.JOBS_RETENTION_DAYS if days is None else days
+    cutoff = _now() - timedelta(days=days)
+    removed = db.execute(
+        Job.__table__.delete().where(Job.status.in_((DONE, FAILED)), Job.finished_at < cutoff)
+    ).rowcount
+    db.commit()
+    return removed
@@ -1,4 +1,4 @@
 # Database package initialization
-from app.db.database import Base, engine, get_db
+from app.db.database import Base, engine, get_db, async_engine, get_async_db
 
-__all__ = ["Base", "engine", "get_db"]
\ No newline at end of file
+__all__ = ["Base", "engine", "get_db", "async_engine", "get_async_db"]
@@ -1,20 +1,141 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-load_dotenv()
+from app.core import metrics
+from app.core.config import settings
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./autoxpress_crm.db")
+logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    DATABASE_URL, 
-    echo=True,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+DATABASE_URL = settings.DATABASE_URL
+
+# Async drivers used for DATABASE_URL's backend unless ASYNC_DATABASE_URL is set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Swap the sync driver of a database URL for its asyncio counterpart
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    create_engine keyword arguments for a URL, built from the DB_* settings
+    """
+    parsed = make_url(url)
+    options = {"echo": settings.DB_ECHO}
+    connect_args = {}
+
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases live and die with their single connection
+            return options
+        if is_async:
+            # aiosqlite defaults to NullPool, which reopens the file per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+        else:
+            connect_args["check_same_thread"] = False
+    elif parsed.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers proceed alongside a writer; NORMAL sync is safe under WAL
+    and avoids an fsync per commit; busy_timeout waits on locks instead of failing
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    metrics.record_statement(statement, parameters, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # The after hook does not fire for failed statements; drop their start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """
+    Install per-connection setup and statement timing on a (sync) engine
+    """
+    if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+# Sync engine, kept for Alembic, the CLI and scripts
+engine = configure_engine(create_engine(DATABASE_URL, **engine_options(DATABASE_URL)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+configure_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Async engine for replica reads (see app.db.routing); the primary when no replica is configured
+if settings.DATABASE_READ_URL:
+    ASYNC_DATABASE_READ_URL = settings.ASYNC_DATABASE_READ_URL or to_async_url(settings.DATABASE_READ_URL)
+    read_async_engine = create_async_engine(
+        ASYNC_DATABASE_READ_URL, **engine_options(ASYNC_DATABASE_READ_URL, is_async=True)
+    )
+    configure_engine(read_async_engine.sync_engine)
+else:
+    read_async_engine = async_engine
+AsyncReadSessionLocal = async_sessionmaker(
+    read_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # Dependency to get DB session
@@ -23,4 +144,95 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats(engine: Engine) -> dict:
+    """
+    Connection counts for an engine's pool; counters a pool class does not
+    track are reported as None
+    """
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    for key, method in (
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        counter = getattr(pool, method, None)
+        stats[key] = counter() if callable(counter) else None
+    if stats["overflow"] is not None:
+        # QueuePool counts up from -pool_size; only connections beyond the pool are overflow
+        stats["overflow"] = max(stats["overflow"], 0)
+    stats["status"] = pool.status()
+    return stats
+
+
+def _async_engines() -> list:
+    return [async_engine] if read_async_engine is async_engine else [async_engine, read_async_engine]
+
+
+async def ping_database(timeout: float = 2.0) -> bool:
+    """
+    Whether the database, and the read replica if configured, answer SELECT 1 within `timeout`
+    """
+    async def ping(target):
+        async with target.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(asyncio.gather(*(ping(target) for target in _async_engines())), timeout)
+    except Exception:
+        return False
+    return True
+
+
+async def wait_for_database(timeout: float) -> None:
+    """
+    Retry SELECT 1 with backoff until the database answers, raising
+    RuntimeError after `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while not await ping_database():
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Database not reachable after {timeout:g}s")
+        logger.warning("Waiting for the database")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 2.0)
+
+
+async def warm_pool(connections: int) -> int:
+    """
+    Open up to `connections` pooled connections on each async engine (never
+    more than DB_POOL_SIZE) so the first requests skip the connect handshake.
+    Returns how many were opened.
+    """
+    count = max(0, min(connections, settings.DB_POOL_SIZE))
+    opened = 0
+    for target in _async_engines():
+        if not count or pool_stats(target.sync_engine)["size"] is None:
+            continue
+        connections_held = [await target.connect() for _ in range(count)]
+        for connection in connections_held:
+            await connection.close()
+        opened += count
+    return opened
+
+
+def dispose_pools() -> None:
+    """
+    Drop pooled connections inherited from a parent process without closing
+    them, so a forked worker opens its own (see app.server)
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if read_async_engine is not async_engine:
+        read_async_engine.sync_engine.dispose(close=False)
@@ -0,0 +1,83 @@
+"""
+Read-replica routing for the heavy GET endpoints.
+
+With DATABASE_READ_URL set, endpoints that depend on get_async_read_db read
+from the replica; everything else keeps using the primary through
+get_async_db. A replica lags the primary, so a client that has just written
+would not see its own change there. ReadYourWritesMiddleware therefore sets a
+short-lived cookie on every successful write, and while it is present that
+client's reads go to the primary for READ_YOUR_WRITES_SECONDS.
+"""
+import time
+from typing import AsyncIterator
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncReadSessionLocal, AsyncSessionLocal, async_engine, read_async_engine
+
+WROTE_COOKIE = "axc_wrote"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def replica_enabled() -> bool:
+    return read_async_engine is not async_engine
+
+
+def wrote_recently(request: Request) -> bool:
+    """
+    Whether the client sent a write cookie from inside the read-your-writes window
+    """
+    try:
+        wrote_at = float(request.cookies.get(WROTE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - wrote_at < settings.READ_YOUR_WRITES_SECONDS
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Session on the read replica, or on the primary when no replica is
+    configured or the client wrote within READ_YOUR_WRITES_SECONDS
+    """
+    factory = AsyncSessionLocal
+    if replica_enabled() and not wrote_recently(request):
+        factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+
+def replica_lag(db: AsyncSession) -> float:
+    """
+    How stale a session's reads may be: READ_YOUR_WRITES_SECONDS on the
+    replica, 0 on the primary. Passed to callback_cache.begin_read.
+    """
+    if replica_enabled() and db.bind is read_async_engine:
+        return settings.READ_YOUR_WRITES_SECONDS
+    return 0
+
+
+class ReadYourWritesMiddleware:
+    """
+    Set the write cookie on successful non-GET responses
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{WROTE_COOKIE}={time.time():.3f}; Max-Age={max(1, round(settings.READ_YOUR_WRITES_SECONDS))}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
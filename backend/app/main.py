@@ -1,13 +1,18 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
 from app.api.api import api_router
+from app.core import metrics, runtime
 from app.core.config import settings
-from app.db.database import Base, engine
-
-# Create tables in the database
-Base.metadata.create_all(bind=engine)
+from app.core.proxy import TrustedProxyMiddleware
+from app.crud.jobs import queue_depth
+from app.db.database import Base, SessionLocal, async_engine, engine, pool_stats, ping_database, read_async_engine, wait_for_database, warm_pool
+from app.db.routing import ReadYourWritesMiddleware, replica_enabled
+from app.services.callback_jobs import worker as job_worker
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -21,16 +26,115 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# Route a client's reads to the primary right after its own writes
+if replica_enabled():
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-route latency and SQL timing; added last so it wraps CORS as well
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Outermost: X-Forwarded-* from trusted proxies (see app.core.proxy)
+app.add_middleware(TrustedProxyMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.on_event("startup")
+async def prepare_database():
+    """
+    Wait for the database, create tables in development, and open pooled
+    connections before the worker reports ready
+    """
+    await wait_for_database(settings.DB_STARTUP_TIMEOUT)
+    if settings.AUTO_CREATE_TABLES:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    await warm_pool(settings.DB_POOL_WARMUP)
+
+
+if settings.JOBS_ENABLED and settings.JOBS_IN_PROCESS:
+    @app.on_event("startup")
+    async def start_job_worker():
+        job_worker.start()
+
+    @app.on_event("shutdown")
+    async def stop_job_worker():
+        await job_worker.stop()
+
+
+# Registered last so it runs after the other startup handlers
+@app.on_event("startup")
+async def report_ready():
+    runtime.mark_ready()
+
+
 @app.get("/")
 def root():
     return {"message": f"Welcome to {settings.APP_NAME}"}
 
 
+@app.get("/healthz", include_in_schema=False)
+async def liveness():
+    """
+    Liveness probe: the process is serving requests
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness():
+    """
+    Readiness probe: start-up finished and the database answers
+    """
+    if not runtime.is_ready():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if not await ping_database():
+        return JSONResponse({"status": "database unavailable"}, status_code=503)
+    return {"status": "ready"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def read_metrics():
+        """
+        Prometheus scrape endpoint
+        """
+        gauges = ["# HELP db_pool_checked_out Connections currently checked out", "# TYPE db_pool_checked_out gauge"]
+        engines = [("async", async_engine.sync_engine), ("sync", engine)]
+        if replica_enabled():
+            engines.append(("replica", read_async_engine.sync_engine))
+        for name, pool_engine in engines:
+            checked_out = pool_stats(pool_engine)["checked_out"]
+            if checked_out is not None:
+                gauges.append(f'db_pool_checked_out{{engine="{name}"}} {checked_out}')
+        if settings.JOBS_ENABLED:
+            gauges += ["# HELP jobs_queued Background jobs by kind and status", "# TYPE jobs_queued gauge"]
+            db = SessionLocal()
+            try:
+                depth = queue_depth(db)
+            finally:
+                db.close()
+            for kind, statuses in sorted(depth.items()):
+                for status, count in sorted(statuses.items()):
+                    gauges.append(f'jobs_queued{{kind="{kind}",status="{status}"}} {count}')
+        process = runtime.snapshot()
+        gauges += ["# HELP process_resident_memory_bytes Resident memory of this worker",
+                   "# TYPE process_resident_memory_bytes gauge"]
+        if process["rss_bytes"] is not None:
+            gauges.append(f'process_resident_memory_bytes {process["rss_bytes"]}')
+        gauges += ["# HELP app_startup_seconds Process start to ready, for this worker", "# TYPE app_startup_seconds gauge"]
+        if process["startup_seconds"] is not None:
+            gauges.append(f'app_startup_seconds {process["startup_seconds"]}')
+        return PlainTextResponse(metrics.render_metrics(gauges), media_type="text/plain; version=0.0.4")
+
+
+runtime.mark_imported()
+
+
+# Development server with auto-reload; production uses `python -m app.server`
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,3 +1,9 @@
 from app.models.callback import Callback
+from app.models.callback_archive import CallbackArchive
+from app.models.callback_history import CallbackHistory
+from app.models.callback_stats import CallbackStat
+from app.models.callback_tombstone import CallbackTombstone
+from app.models.callback_reminder import CallbackReminder
+from app.models.job import Job
 
-__all__ = ["Callback"]
\ No newline at end of file
+__all__ = ["Callback", "CallbackArchive", "CallbackHistory", "CallbackStat", "CallbackTombstone", "CallbackReminder", "Job"]
\ No newline at end of file
@@ -1,13 +1,45 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Float, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Text, Date, DateTime, Float, ForeignKey, Index, DDL, bindparam, event, false, literal_column, text
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# Statuses that still need an agent to act on them
+OPEN_STATUSES = ("Pending", "No Answer", "Follow-up Later")
+OPEN_STATUS_CLAUSE = "status IN ('Pending', 'No Answer', 'Follow-up Later')"
+
+# Inputs of the server-side lead score; changing any of them queues a rescore
+SCORING_FIELDS = ("product", "vehicle_year", "car_make", "car_model", "zip_code")
+
 
 class Callback(Base):
     """
     SQLAlchemy model for Callbacks table
     """
     __tablename__ = "callbacks"
+    __table_args__ = (
+        # Matches the list/search sort order so keyset pages are index seeks
+        Index("ix_callbacks_follow_up_keyset", "follow_up_date", "last_modified", "id"),
+        # /callbacks/changes reads rows modified after a (last_modified, id) high-water mark
+        Index("ix_callbacks_last_modified_keyset", "last_modified", "id"),
+        # Dashboard filters: equality columns first, then the same sort key, so a
+        # filtered page is a seek plus an ordered range read with no sort step
+        Index("ix_callbacks_status_keyset", "status", "follow_up_date", "last_modified", "id"),
+        Index("ix_callbacks_agent_keyset", "agent_name", "follow_up_date", "last_modified", "id"),
+        Index("ix_callbacks_agent_status_keyset", "agent_name", "status", "follow_up_date", "last_modified", "id"),
+        # Small index over callbacks still being worked, for due/overdue follow-up scans
+        Index(
+            "ix_callbacks_open_follow_up", "follow_up_date", "id",
+            sqlite_where=text(OPEN_STATUS_CLAUSE), postgresql_where=text(OPEN_STATUS_CLAUSE)
+        ),
+        # /claim-next queue order over the same callbacks: soonest follow-up,
+        # then best lead score with unscored last (see claim_order)
+        Index(
+            "ix_callbacks_claim_queue", "follow_up_date", text("coalesce(lead_score, -1) DESC"), "id",
+            sqlite_where=text(OPEN_STATUS_CLAUSE), postgresql_where=text(OPEN_STATUS_CLAUSE)
+        ),
+        # Ids are never reused on SQLite either: history, tombstones and the
+        # archive keep the ids of deleted and archived callbacks
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product = Column(String(255), nullable=True)
@@ -17,11 +49,79 @@ class Callback(Base):
     zip_code = Column(String(10), nullable=True)
     customer_name = Column(String(255), nullable=False)
     callback_number = Column(String(20), nullable=False, index=True)
+    # callback_number in E.164 (see app.core.phone), the key for duplicate lookups
+    phone_normalized = Column(String(20), nullable=True, index=True)
     follow_up_date = Column(Date, nullable=True)
     status = Column(String(50), default="Pending")  # Pending, Sale, No Answer, Follow-up Later
     agent_name = Column(String(100), nullable=True)
     lead_score = Column(Float, nullable=True)
+    # The score was given by a client rather than computed; the scoring job leaves it alone
+    lead_score_manual = Column(Boolean, nullable=False, default=False, server_default=false())
     comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_modified = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    last_modified_by = Column(String(100), nullable=True)
\ No newline at end of file
+    last_modified_by = Column(String(100), nullable=True)
+    # Agent working the callback through /claim-next, until claimed_until passes
+    claimed_by = Column(String(100), nullable=True)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+
+
+def open_status_filter():
+    """
+    status IN OPEN_STATUSES, rendered with literal values: SQLite only uses the
+    ix_callbacks_open_follow_up partial index when the query repeats its constants
+    """
+    return Callback.status.in_(bindparam("open_statuses", list(OPEN_STATUSES), expanding=True, literal_execute=True))
+
+
+def claim_order():
+    """
+    ORDER BY of the /claim-next queue, spelled as in ix_callbacks_claim_queue.
+    Scores run 0-10, so coalescing to -1 puts unscored callbacks last on both
+    SQLite and PostgreSQL; -1 is a literal because an index expression only
+    matches the same constant, not a bound parameter.
+    """
+    return Callback.follow_up_date, func.coalesce(Callback.lead_score, literal_column("-1")).desc(), Callback.id
+
+
+# Search index for /callbacks/search/. SQLite keeps an FTS5 trigram table in sync
+# through triggers; trigrams keep the substring semantics of the old ILIKE search.
+# callback_digits holds the number stripped of punctuation for phone lookups.
+_SQLITE_DIGITS = (
+    "replace(replace(replace(replace(replace(replace("
+    "{row}.callback_number, '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+)
+_SQLITE_FTS_INSERT = (
+    "INSERT INTO callbacks_fts(rowid, customer_name, car_make, car_model, callback_number, comments, callback_digits) "
+    "VALUES (new.id, new.customer_name, new.car_make, new.car_model, new.callback_number, new.comments, "
+    + _SQLITE_DIGITS.format(row="new") + ");"
+)
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS callbacks_fts USING fts5("
+    "customer_name, car_make, car_model, callback_number, comments, callback_digits, tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS callbacks_fts_ai AFTER INSERT ON callbacks BEGIN "
+    + _SQLITE_FTS_INSERT + " END",
+    "CREATE TRIGGER IF NOT EXISTS callbacks_fts_ad AFTER DELETE ON callbacks BEGIN "
+    "DELETE FROM callbacks_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS callbacks_fts_au AFTER UPDATE OF "
+    "customer_name, car_make, car_model, callback_number, comments ON callbacks BEGIN "
+    "DELETE FROM callbacks_fts WHERE rowid = old.id; " + _SQLITE_FTS_INSERT + " END",
+]
+
+# PostgreSQL indexes the ILIKE predicates directly with pg_trgm GIN indexes.
+POSTGRESQL_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_customer_name_trgm ON callbacks USING gin (customer_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_car_make_trgm ON callbacks USING gin (car_make gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_car_model_trgm ON callbacks USING gin (car_model gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_callback_number_trgm ON callbacks USING gin (callback_number gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_comments_trgm ON callbacks USING gin (comments gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_callbacks_callback_digits_trgm ON callbacks "
+    "USING gin ((regexp_replace(callback_number, '\\D', '', 'g')) gin_trgm_ops)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Callback.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Callback.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Float, Index
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.db.database import Base
+
+
+class CallbackArchive(Base):
+    """
+    SQLAlchemy model for callbacks_archive: closed callbacks moved out of the
+    callbacks table by archive_callbacks, with the same columns and ids.
+    The primary key includes created_at so that, with ARCHIVE_PARTITIONED,
+    PostgreSQL can range-partition the table by it (one partition per year).
+    """
+    __tablename__ = "callbacks_archive"
+    __table_args__ = (
+        # Same sort key as the hot table, for include_archived list pages
+        Index("ix_callbacks_archive_follow_up_keyset", "follow_up_date", "last_modified", "id"),
+        Index("ix_callbacks_archive_phone_normalized", "phone_normalized"),
+        {"postgresql_partition_by": "RANGE (created_at)"} if settings.ARCHIVE_PARTITIONED else {},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    product = Column(String(255), nullable=True)
+    vehicle_year = Column(Integer, nullable=True)
+    car_make = Column(String(100), nullable=True)
+    car_model = Column(String(100), nullable=True)
+    zip_code = Column(String(10), nullable=True)
+    customer_name = Column(String(255), nullable=False)
+    callback_number = Column(String(20), nullable=False)
+    phone_normalized = Column(String(20), nullable=True)
+    follow_up_date = Column(Date, nullable=True)
+    status = Column(String(50))
+    agent_name = Column(String(100), nullable=True)
+    lead_score = Column(Float, nullable=True)
+    comments = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True)
+    last_modified = Column(DateTime(timezone=True))
+    last_modified_by = Column(String(100), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class CallbackHistory(Base):
+    """
+    SQLAlchemy model for callback_history: one append-only row per callback
+    write, holding the changed fields as {field: [old, new]}. Status changes
+    are also kept in from_status/to_status for transition reports.
+    """
+    __tablename__ = "callback_history"
+    __table_args__ = (
+        # History of one callback, newest first
+        Index("ix_callback_history_callback", "callback_id", "id"),
+        # Transition counts over a time range, answered from the index alone
+        Index("ix_callback_history_transitions", "changed_at", "from_status", "to_status", "agent_name"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    callback_id = Column(Integer, nullable=False)
+    action = Column(String(20), nullable=False)  # created, updated, deleted, merged, archived
+    changes = Column(JSON(none_as_null=True), nullable=True)
+    # Set only when the write changed the status (from_status is None on create, to_status on delete)
+    from_status = Column(String(50), nullable=True)
+    to_status = Column(String(50), nullable=True)
+    # The callback's agent after the write (before it, for deletes)
+    agent_name = Column(String(100), nullable=True)
+    changed_by = Column(String(100), nullable=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class CallbackReminder(Base):
+    """
+    SQLAlchemy model for follow-up reminders, generated by the
+    follow_up_reminders job for open callbacks due on a date
+    """
+    __tablename__ = "callback_reminders"
+    __table_args__ = (
+        UniqueConstraint("callback_id", "remind_on", name="uq_callback_reminders_callback_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    callback_id = Column(Integer, nullable=False)
+    agent_name = Column(String(100), nullable=True, index=True)
+    remind_on = Column(Date, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float
+from app.db.database import Base
+
+
+class CallbackStat(Base):
+    """
+    SQLAlchemy model for the callback_stats summary table.
+    One row per (dimension, value), kept current by the callback CRUD writes:
+    dimension is "total", "status", "agent" or "follow_up_date" and value the
+    status, agent name or ISO date ("" when the callback has none).
+    """
+    __tablename__ = "callback_stats"
+
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    lead_score_sum = Column(Float, nullable=False, default=0.0)
+    lead_score_count = Column(Integer, nullable=False, default=0)
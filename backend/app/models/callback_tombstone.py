@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class CallbackTombstone(Base):
+    """
+    SQLAlchemy model for callback_tombstones: one row per deleted callback, so
+    /callbacks/changes can report deletions. Purged after SYNC_TOMBSTONE_DAYS.
+    """
+    __tablename__ = "callback_tombstones"
+    __table_args__ = (
+        Index("ix_callback_tombstones_deleted_keyset", "deleted_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    callback_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job(Base):
+    """
+    SQLAlchemy model for the background job queue.
+    Rows are claimed by the in-process workers (see app.services.job_worker);
+    failed attempts are retried with backoff until max_attempts.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers claim the oldest due jobs of a kind
+        Index("ix_jobs_claim", "status", "kind", "run_after", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default=QUEUED)
+    # Only one queued job per dedupe key, e.g. one reminder run per date
+    dedupe_key = Column(String(100), nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -5,7 +5,20 @@ from app.schemas.callback import (
     CallbackInDB,
     CallbackResponse,
     CallbackFilterParams,
+    CallbackImportError,
+    CallbackImportResult,
+    CallbackStats,
+    CallbackChanges,
+    CallbackBulkSelection,
+    CallbackBulkUpdate,
+    CallbackBulkResult,
+    CallbackDuplicateGroup,
+    CallbackMerge,
+    CallbackScoreRequest,
+    CallbackJobAccepted,
+    CallbackReminderResponse,
 )
+from app.schemas.system import JobStats, PoolStats, RuntimeStats, SlowQuery
 
 __all__ = [
     "CallbackBase",
@@ -14,4 +27,20 @@ __all__ = [
     "CallbackInDB",
     "CallbackResponse",
     "CallbackFilterParams",
+    "CallbackImportError",
+    "CallbackImportResult",
+    "CallbackStats",
+    "CallbackChanges",
+    "CallbackBulkSelection",
+    "CallbackBulkUpdate",
+    "CallbackBulkResult",
+    "CallbackDuplicateGroup",
+    "CallbackMerge",
+    "CallbackScoreRequest",
+    "CallbackJobAccepted",
+    "CallbackReminderResponse",
+    "JobStats",
+    "PoolStats",
+    "RuntimeStats",
+    "SlowQuery",
 ]
\ No newline at end of file
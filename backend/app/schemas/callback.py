@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
 from datetime import date, datetime
 
 
@@ -75,4 +75,182 @@ class CallbackFilterParams(BaseModel):
     follow_up_date_start: Optional[date] = None
     follow_up_date_end: Optional[date] = None
     status: Optional[str] = None
-    agent_name: Optional[str] = None
\ No newline at end of file
+    agent_name: Optional[str] = None
+
+
+class CallbackImportError(BaseModel):
+    """
+    Validation or database errors for one row of a bulk import
+    """
+    row: int
+    errors: List[str]
+
+
+class CallbackImportResult(BaseModel):
+    """
+    Summary of a bulk import
+    """
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[CallbackImportError] = []
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+
+class CallbackStats(BaseModel):
+    """
+    Dashboard totals for callbacks.
+    Callbacks without a status or agent are counted under "".
+    """
+    total: int
+    by_status: Dict[str, int]
+    by_agent: Dict[str, int]
+    by_follow_up: Dict[str, int]
+    average_lead_score: Optional[float] = None
+
+
+class CallbackChanges(BaseModel):
+    """
+    Delta since a high-water mark: apply deletes, then upserts, then pass
+    `next` back as `since`. `reset` means the mark is too old and the client
+    must resync from scratch (omit `since`).
+    """
+    upserts: List[CallbackResponse]
+    deletes: List[int]
+    next: Optional[str] = None
+    has_more: bool
+    reset: bool = False
+
+
+class CallbackBulkSelection(BaseModel):
+    """
+    Callbacks targeted by a bulk operation: either an explicit ID list or
+    list filters with at least one condition
+    """
+    ids: Optional[List[int]] = None
+    filters: Optional[CallbackFilterParams] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide exactly one of ids or filters")
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            raise ValueError("filters must include at least one condition")
+        return self
+
+
+class CallbackBulkUpdate(CallbackBulkSelection):
+    """
+    Fields set on every selected callback
+    """
+    status: Optional[str] = None
+    agent_name: Optional[str] = None
+    follow_up_date: Optional[date] = None
+    last_modified_by: Optional[str] = None
+
+
+class CallbackBulkResult(BaseModel):
+    """
+    Number of callbacks a bulk operation changed
+    """
+    affected: int
+
+
+class CallbackDuplicateGroup(BaseModel):
+    """
+    Callbacks sharing a normalized phone number, most recently modified first
+    """
+    phone_normalized: str
+    ids: List[int]
+
+
+class CallbackMerge(BaseModel):
+    """
+    Duplicates to fold into keep_id
+    """
+    keep_id: int
+    merge_ids: List[int] = Field(..., min_length=1)
+
+
+class CallbackClaimRequest(BaseModel):
+    """
+    Agent asking for the next callback to dial
+    """
+    agent_name: str = Field(..., min_length=1, max_length=100)
+    ttl_seconds: Optional[int] = Field(None, ge=30, le=86400, description="Defaults to CLAIM_TTL_SECONDS")
+
+
+class CallbackRelease(BaseModel):
+    """
+    Agent giving back a claimed callback
+    """
+    agent_name: str = Field(..., min_length=1, max_length=100)
+
+
+class CallbackClaim(CallbackResponse):
+    """
+    A callback claimed by an agent until claimed_until
+    """
+    claimed_by: str
+    claimed_until: datetime
+
+
+class CallbackScoreRequest(BaseModel):
+    """
+    Callbacks to rescore; omit ids to score every callback without a lead_score
+    """
+    ids: Optional[List[int]] = Field(None, min_length=1)
+
+
+class CallbackJobAccepted(BaseModel):
+    """
+    A queued background job
+    """
+    job_id: Optional[int] = None
+    kind: str
+    status: str
+
+
+class CallbackReminderResponse(BaseModel):
+    """
+    A follow-up due for an agent on a day
+    """
+    id: int
+    callback_id: int
+    agent_name: Optional[str] = None
+    remind_on: date
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CallbackHistoryEntry(BaseModel):
+    """
+    One recorded write to a callback; changes maps each changed field to [old, new]
+    """
+    id: int
+    callback_id: int
+    action: str
+    changes: Optional[Dict[str, List[Any]]] = None
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    agent_name: Optional[str] = None
+    changed_by: Optional[str] = None
+    changed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CallbackStatusTransition(BaseModel):
+    """
+    How many callbacks of an agent moved from one status to another
+    (from_status None: created; to_status None: removed)
+    """
+    agent_name: Optional[str] = None
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    count: int
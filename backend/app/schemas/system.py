@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class PoolStats(BaseModel):
+    """
+    Connection pool counters for one engine
+    """
+    engine: str
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    status: str
+
+
+class SlowQuery(BaseModel):
+    """
+    A statement that ran longer than SLOW_QUERY_MS; parameters only with SLOW_QUERY_PARAMETERS
+    """
+    statement: str
+    parameters: Optional[str] = None
+    duration_ms: float
+    at: float
+
+
+class JobStats(BaseModel):
+    """
+    Background job queue depth (all workers, by kind and status) and this
+    process's worker pool throughput
+    """
+    depth: Dict[str, Dict[str, int]]
+    running: bool
+    concurrency: int
+    processed: Dict[str, Dict[str, int]]
+    throughput_per_second: float
+
+
+class RuntimeStats(BaseModel):
+    """
+    Start-up timing (seconds since the process started) and memory of one worker
+    """
+    pid: int
+    started_at: float
+    import_seconds: Optional[float] = None
+    startup_seconds: Optional[float] = None
+    uptime_seconds: float
+    rss_bytes: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
@@ -0,0 +1,153 @@
+"""
+Production server entry point.
+
+Usage:
+    python -m app.server [--workers 4] [--host 0.0.0.0] [--port 8000]
+
+Runs Gunicorn with Uvicorn workers. The app is imported once in the master
+(preload) and the workers are forked from it, so a new worker skips the
+imports and shares the master's loaded code pages until it writes to them.
+Each worker drops the pooled connections it inherited and opens its own.
+Where Gunicorn is not available (Windows), falls back to Uvicorn's own
+process manager, which imports the app in every worker.
+
+The schema is not touched here: run `alembic upgrade head` before starting.
+
+X-Forwarded-* headers are left to the app (app.core.proxy), which needs to
+know whether the connecting peer is a trusted proxy, so both servers run with
+their own proxy header handling turned off.
+
+Some state lives in each worker process, and with more than one worker it
+must be shared or turned off (see share_process_state):
+- The in-memory response cache: a write on one worker would leave the others
+  serving the old page, and answering 304 to it, for up to CACHE_TTL_SECONDS.
+  It is turned off unless CACHE_BACKEND names a shared backend.
+- The in-memory event broker: SSE clients would only hear about writes made
+  by their own worker. A warning is logged unless EVENTS_BROKER names a
+  shared broker, such as the opt-in LISTEN/NOTIFY one on PostgreSQL.
+- The job worker pool runs in every worker. That is safe, since jobs are
+  claimed from the jobs table and periodic jobs are deduplicated there.
+
+The rest stays per worker and is left as is:
+- Metrics: /metrics and /api/v1/system/* describe whichever worker answered.
+  Scrape each worker, or run one worker per container and scale containers.
+- Rate limits: each worker keeps its own token buckets, so a client may make
+  up to WEB_CONCURRENCY times RATE_LIMIT_PER_SECOND / RATE_LIMIT_BURST
+  requests before the API answers 429. Size the limits per worker.
+- Request coalescing: identical concurrent reads only share a query when the
+  same worker serves them, so N workers may run the same query N times.
+"""
+import argparse
+import logging
+import os
+import sys
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+try:
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    # No Gunicorn (Windows)
+    pass
+else:
+    class Worker(UvicornWorker):
+        """
+        Uvicorn worker leaving X-Forwarded-* to the app's TrustedProxyMiddleware
+        """
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "proxy_headers": False}
+
+
+def _post_fork(server, worker) -> None:
+    from app.db.database import dispose_pools
+    dispose_pools()
+
+
+def share_process_state(workers: int) -> None:
+    """
+    Turn off per-process state that goes stale across several workers, and
+    warn about what cannot be turned off. Both the settings (for preloaded
+    Gunicorn workers) and the environment (for Uvicorn workers, which
+    re-import the app) are updated.
+    """
+    if workers <= 1:
+        return
+    if settings.CACHE_ENABLED and not settings.CACHE_BACKEND:
+        logger.warning(
+            "Running %d workers with the in-memory response cache: each worker would serve stale pages "
+            "after writes on the others. Disabling the cache; set CACHE_BACKEND to a shared backend to keep it.",
+            workers
+        )
+        settings.CACHE_ENABLED = False
+        os.environ["CACHE_ENABLED"] = "false"
+    if settings.EVENTS_ENABLED and not settings.EVENTS_BROKER:
+        logger.warning(
+            "Running %d workers with the in-memory event broker: /callbacks/events clients only see writes "
+            "made by their own worker. Set EVENTS_BROKER to a shared broker (on PostgreSQL, "
+            "app.core.events.PostgresBroker), or run a single worker.",
+            workers
+        )
+
+
+def gunicorn_options(workers: int, host: str, port: int) -> dict:
+    """
+    Gunicorn settings for the API, from the server settings
+    """
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "app.server.Worker",
+        "preload_app": True,
+        "post_fork": _post_fork,
+        "timeout": settings.WORKER_TIMEOUT,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "keepalive": settings.KEEPALIVE_SECONDS,
+        "loglevel": settings.LOG_LEVEL,
+        "accesslog": "-" if settings.LOG_LEVEL in ("debug", "info") else None,
+    }
+
+
+def run_gunicorn(options: dict) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    Application().run()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.server", description="Run the AutoXpress CRM API")
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY, help="Defaults to WEB_CONCURRENCY")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=settings.LOG_LEVEL.upper(), format="%(levelname)s: %(message)s")
+    share_process_state(args.workers)
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        uvicorn.run(
+            APP, host=args.host, port=args.port, workers=args.workers,
+            log_level=settings.LOG_LEVEL, timeout_keep_alive=settings.KEEPALIVE_SECONDS,
+            proxy_headers=False
+        )
+        return 0
+    run_gunicorn(gunicorn_options(args.workers, args.host, args.port))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
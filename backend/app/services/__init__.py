@@ -0,0 +1,4 @@
+# Services package initialization
+from app.services.callback_import import CallbackImporter, make_record_parser
+
+__all__ = ["CallbackImporter", "make_record_parser"]
@@ -0,0 +1,55 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import AsyncIterable, AsyncIterator, List, Sequence
+
+from app.services.callback_serialization import RESPONSE_COLUMNS, dumps
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Same fields, in the same order, as CallbackResponse
+EXPORT_COLUMNS: List[str] = RESPONSE_COLUMNS
+
+def ndjson_chunk(rows: Sequence[tuple], columns: List[str] = EXPORT_COLUMNS) -> bytes:
+    """
+    Serialize row tuples to NDJSON, one CallbackResponse-shaped object per line
+    """
+    return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def csv_header(columns: List[str] = EXPORT_COLUMNS) -> bytes:
+    """
+    CSV header row for an export
+    """
+    return csv_chunk([columns])
+
+
+def csv_chunk(rows: Sequence[tuple]) -> bytes:
+    """
+    Serialize row tuples to CSV lines
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, (date, datetime)) else value for value in row)
+    return buffer.getvalue().encode()
+
+
+async def aiter_export(
+    batches: AsyncIterable[Sequence[tuple]],
+    fmt: str,
+    columns: List[str] = EXPORT_COLUMNS
+) -> AsyncIterator[bytes]:
+    """
+    Serialize batches of row tuples from an async source, one chunk per batch.
+    The CSV header goes out before the first row is fetched.
+    """
+    if fmt == "csv":
+        yield csv_header(columns)
+    async for rows in batches:
+        yield csv_chunk(rows) if fmt == "csv" else ndjson_chunk(rows, columns)
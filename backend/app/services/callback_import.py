@@ -0,0 +1,250 @@
+import codecs
+import csv
+import io
+import json
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.crud.callback import bulk_create_callbacks
+from app.schemas.callback import CallbackCreate, CallbackImportError, CallbackImportResult
+
+IMPORT_FORMATS = ("csv", "ndjson", "json")
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "json",
+}
+
+
+class InvalidRecord(str):
+    """
+    Placeholder for a record that could not be decoded, carrying the reason
+    """
+
+
+class RecordParser:
+    """
+    Incremental parser turning chunks of an upload into row dicts.
+    feed() returns the records completed by a chunk and close() the remainder,
+    so only a partial record is ever held in memory.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._buffer += self._decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[dict]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> List[dict]:
+        raise NotImplementedError
+
+
+class NDJSONRecordParser(RecordParser):
+    """
+    One JSON object per line
+    """
+
+    def _parse(self, final: bool) -> List[dict]:
+        lines = self._buffer.split("\n")
+        self._buffer = "" if final else lines.pop()
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                records.append(InvalidRecord(f"invalid JSON: {exc.msg}"))
+        return records
+
+
+class JSONArrayRecordParser(RecordParser):
+    """
+    A top-level JSON array of objects, decoded one element at a time
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._json = json.JSONDecoder()
+        self._started = False
+
+    def _parse(self, final: bool) -> List[dict]:
+        records = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,]":
+                pos += 1
+            if pos < len(buffer) and not self._started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array of callbacks")
+                self._started = True
+                pos += 1
+                continue
+            if pos >= len(buffer):
+                break
+            try:
+                record, end = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            records.append(record)
+            pos = end
+        self._buffer = buffer[pos:]
+        return records
+
+
+class CSVRecordParser(RecordParser):
+    """
+    CSV with a header row. Records are only handed to the csv module once their
+    quotes balance, so quoted fields may span lines and chunk boundaries.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._fieldnames: Optional[List[str]] = None
+
+    def _parse(self, final: bool) -> List[dict]:
+        if final:
+            complete, self._buffer = self._buffer, ""
+        else:
+            end = 0
+            quotes = 0
+            start = 0
+            while True:
+                newline = self._buffer.find("\n", start)
+                if newline == -1:
+                    break
+                quotes += self._buffer.count('"', start, newline)
+                start = newline + 1
+                if quotes % 2 == 0:
+                    end = start
+            complete, self._buffer = self._buffer[:end], self._buffer[end:]
+
+        if not complete.strip():
+            return []
+        rows = csv.reader(io.StringIO(complete))
+        records = []
+        try:
+            if self._fieldnames is None:
+                self._fieldnames = [name.strip() for name in next(rows, [])]
+            for row in rows:
+                if not any(value.strip() for value in row):
+                    continue
+                # Empty cells are treated as missing so schema defaults apply
+                records.append({
+                    name: value for name, value in zip(self._fieldnames, row) if name and value != ""
+                })
+        except csv.Error as exc:
+            raise ValueError(str(exc)) from exc
+        return records
+
+
+def make_record_parser(fmt: str) -> RecordParser:
+    """
+    Get an incremental parser for one of IMPORT_FORMATS
+    """
+    parsers = {
+        "csv": CSVRecordParser,
+        "ndjson": NDJSONRecordParser,
+        "json": JSONArrayRecordParser,
+    }
+    if fmt not in parsers:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    return parsers[fmt]()
+
+
+def iter_records(parser: RecordParser, chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Run a parser over a synchronous stream of chunks
+    """
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class CallbackImporter:
+    """
+    Validate rows with CallbackCreate and write them in batches, one
+    transaction per batch, collecting per-row errors and throughput.
+    """
+
+    def __init__(self, upsert: bool = False, max_errors: int = 1000):
+        self.upsert = upsert
+        self.max_errors = max_errors
+        self.result = CallbackImportResult()
+        self._started = time.perf_counter()
+
+    def _add_error(self, row: int, errors: List[str]) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append(CallbackImportError(row=row, errors=errors))
+
+    def import_batch(self, db: Session, records: List[Tuple[int, dict]]) -> None:
+        """
+        Import (row number, record) pairs as one batch.
+        Takes the session first so it can run under AsyncSession.run_sync.
+        """
+        valid: List[CallbackCreate] = []
+        rows: List[int] = []
+        for row, record in records:
+            self.result.processed += 1
+            if isinstance(record, InvalidRecord):
+                self._add_error(row, [str(record)])
+                continue
+            try:
+                valid.append(CallbackCreate.model_validate(record))
+                rows.append(row)
+            except ValidationError as exc:
+                self._add_error(row, [
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                    for error in exc.errors()
+                ])
+
+        if not valid:
+            return
+        try:
+            inserted, updated = bulk_create_callbacks(db, valid, upsert=self.upsert)
+        except SQLAlchemyError as exc:
+            message = str(exc.orig if getattr(exc, "orig", None) else exc)
+            for row in rows:
+                self._add_error(row, [f"batch failed: {message}"])
+            return
+        self.result.inserted += inserted
+        self.result.updated += updated
+
+    def run(self, db: Session, records: Iterable[dict], batch_size: int = 1000) -> CallbackImportResult:
+        """
+        Import every record from a synchronous iterable
+        """
+        batch: List[Tuple[int, dict]] = []
+        for row, record in enumerate(records, start=1):
+            batch.append((row, record))
+            if len(batch) >= batch_size:
+                self.import_batch(db, batch)
+                batch = []
+        if batch:
+            self.import_batch(db, batch)
+        return self.finish()
+
+    def finish(self) -> CallbackImportResult:
+        """
+        Stamp the elapsed time and throughput on the result
+        """
+        elapsed = time.perf_counter() - self._started
+        self.result.elapsed_seconds = round(elapsed, 3)
+        self.result.rows_per_second = round(self.result.processed / elapsed, 1) if elapsed else 0.0
+        return self.result
@@ -0,0 +1,143 @@
+"""
+Background jobs for callbacks: lead scoring, follow-up reminders, merging
+duplicate leads and archiving closed callbacks.
+
+The CRUD functions enqueue a score_leads job in the same transaction as the
+write, so scores are recomputed off the request path. The worker claims
+queued scoring jobs in batches and scores all their callbacks together, in
+chunks of LEAD_SCORING_CHUNK rows.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import callback_cache, callback_events, callback_stats, jobs
+from app.crud.callback import SCORE_JOB
+from app.crud.callback_archive import ARCHIVE_JOB, archive_callbacks
+from app.crud.callback_duplicates import DEDUPE_JOB, dedupe_callbacks
+from app.crud.callback_reminders import create_follow_up_reminders
+from app.models.callback import Callback, SCORING_FIELDS
+from app.models.job import Job
+from app.services.lead_scoring import score_leads
+from app.services.job_worker import JobHandler, JobWorker
+
+REMINDERS_JOB = "follow_up_reminders"
+
+
+def score_callbacks(db: Session, ids: Optional[List[int]] = None, limit: Optional[int] = None) -> int:
+    """
+    Recompute lead_score for the given callbacks, or for up to `limit`
+    callbacks that have no score yet. Rows are read and scored in one pass and
+    the changed scores written with a single executemany. Scores set by a
+    client (lead_score_manual) are skipped, and last_modified is left alone:
+    a computed score is not an edit, so it does not reorder lists or show up
+    in /changes. Returns the number of rows scored.
+    """
+    columns = [getattr(Callback, name) for name in SCORING_FIELDS]
+    query = db.query(
+        *columns, Callback.id, Callback.status, Callback.agent_name, Callback.follow_up_date, Callback.lead_score
+    ).filter(Callback.lead_score_manual.is_(False))
+    if ids is not None:
+        query = query.filter(Callback.id.in_(ids))
+    else:
+        query = query.filter(Callback.lead_score.is_(None)).order_by(Callback.id).limit(limit)
+    # Locked until the scores are written, so a concurrent edit or merge waits (PostgreSQL)
+    rows = query.with_for_update().all()
+    if not rows:
+        db.rollback()
+        return 0
+
+    changed = [
+        (row, score) for row, score in zip(rows, score_leads(rows))
+        if row.lead_score is None or abs(row.lead_score - score) > 1e-9
+    ]
+    if changed:
+        removed = [callback_stats.stats_snapshot(row._asdict()) for row, _ in changed]
+        added = [{**snapshot, "lead_score": score} for snapshot, (_, score) in zip(removed, changed)]
+        try:
+            # Core executemany: a row deleted since the read is skipped rather than an error
+            db.execute(
+                update(Callback.__table__).where(Callback.id == bindparam("row_id"))
+                .values(lead_score=bindparam("score"), last_modified=Callback.last_modified),
+                [{"row_id": row.id, "score": score} for row, score in changed]
+            )
+            callback_stats.record_changes(db, removed=removed, added=added)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        ids_changed = [row.id for row, _ in changed]
+        callback_cache.invalidate(ids_changed, rows=[callback_cache.filter_snapshot(row) for row in removed])
+        callback_events.publish(callback_events.SCORED, removed, count=len(changed), ids=ids_changed)
+    else:
+        db.rollback()
+    return len(rows)
+
+
+def run_score_leads(db: Session, batch: List[Job]) -> None:
+    """
+    Score the callbacks named by a batch of jobs; an {"unscored": true} job
+    scores every callback that has no score yet
+    """
+    chunk = settings.LEAD_SCORING_CHUNK
+    ids = sorted({callback_id for job in batch for callback_id in job.payload.get("ids", ())})
+    for start in range(0, len(ids), chunk):
+        score_callbacks(db, ids=ids[start:start + chunk])
+    if any(job.payload.get("unscored") for job in batch):
+        while score_callbacks(db, limit=chunk):
+            pass
+
+
+def run_follow_up_reminders(db: Session, batch: List[Job]) -> None:
+    """
+    Create the reminders for each date named by the batch (today by default)
+    """
+    days = {job.payload.get("date") or date.today().isoformat() for job in batch}
+    for day in sorted(days):
+        create_follow_up_reminders(db, date.fromisoformat(day))
+
+
+def run_dedupe(db: Session, batch: List[Job]) -> None:
+    """
+    Merge every group of duplicate callbacks; one run covers the whole batch
+    """
+    dedupe_callbacks(db)
+
+
+def run_archive(db: Session, batch: List[Job]) -> None:
+    """
+    Move closed callbacks to the archive; one run covers the whole batch
+    """
+    archive_callbacks(db)
+
+
+def enqueue_reminders(db: Session, remind_on: Optional[date] = None) -> None:
+    """
+    Queue the reminders job for a day, once
+    """
+    remind_on = remind_on or date.today()
+    jobs.enqueue(db, REMINDERS_JOB, {"date": remind_on.isoformat()}, dedupe_key=f"reminders:{remind_on.isoformat()}")
+
+
+def enqueue_periodic(db: Session) -> None:
+    """
+    Queue today's reminders and, with ARCHIVE_ENABLED, an archive run; the
+    worker calls this every REMINDERS_INTERVAL_SECONDS
+    """
+    enqueue_reminders(db)
+    if settings.ARCHIVE_ENABLED:
+        jobs.enqueue(db, ARCHIVE_JOB, dedupe_key=ARCHIVE_JOB)
+
+
+HANDLERS = {
+    SCORE_JOB: JobHandler(run_score_leads, batch_size=100),
+    REMINDERS_JOB: JobHandler(run_follow_up_reminders, batch_size=10),
+    DEDUPE_JOB: JobHandler(run_dedupe, batch_size=10),
+    ARCHIVE_JOB: JobHandler(run_archive, batch_size=10),
+}
+
+# The process-wide pool, started with the app when JOBS_IN_PROCESS is set
+worker = JobWorker(HANDLERS, periodic=enqueue_periodic)
@@ -0,0 +1,50 @@
+"""
+Direct JSON serialization of callback row tuples for the list and search endpoints.
+
+Validating every ORM object into CallbackResponse and encoding the result costs
+more than an indexed page query. The endpoints instead select the response
+columns as plain tuples and encode them here with orjson. The output is
+byte-for-byte what CallbackResponse would produce, with UTC timestamps ending in "Z".
+"""
+from typing import List, Optional, Sequence
+
+import orjson
+
+from app.schemas.callback import CallbackResponse
+
+# Same fields, in the same order, as CallbackResponse
+RESPONSE_COLUMNS: List[str] = list(CallbackResponse.model_fields)
+
+# Always returned by a projection so clients can address the row
+REQUIRED_COLUMNS = ("id",)
+
+_OPTIONS = orjson.OPT_UTC_Z
+
+
+def select_columns(fields: Optional[str]) -> List[str]:
+    """
+    Columns for a comma-separated `fields` projection, in response order.
+    None or an empty value selects every column; unknown names raise ValueError.
+    """
+    if not fields or not fields.strip():
+        return RESPONSE_COLUMNS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(RESPONSE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.update(REQUIRED_COLUMNS)
+    return [name for name in RESPONSE_COLUMNS if name in requested]
+
+
+def dumps(value) -> bytes:
+    """
+    Encode a value with the options used for callback responses
+    """
+    return orjson.dumps(value, option=_OPTIONS)
+
+
+def rows_to_json(rows: Sequence[tuple], columns: List[str] = RESPONSE_COLUMNS) -> bytes:
+    """
+    Serialize row tuples to a JSON array of CallbackResponse-shaped objects
+    """
+    return orjson.dumps([dict(zip(columns, row)) for row in rows], option=_OPTIONS)
@@ -0,0 +1,177 @@
+"""
+In-process worker pool for the persistent job queue (app.crud.jobs).
+
+JobWorker runs JOBS_CONCURRENCY asyncio tasks on the API's event loop. Each
+task claims a batch of due jobs of a kind and hands the whole batch to the
+kind's handler in a thread, so handlers use the sync session and never block
+request handling. A per-kind limit caps how many batches of one kind run at
+once. A maintenance task requeues jobs orphaned by a dead worker, purges old
+finished jobs and runs the caller's periodic hook (e.g. enqueueing the daily
+reminders job).
+
+Several API processes can run a pool against the same database; on
+PostgreSQL claims use SKIP LOCKED so each job goes to exactly one of them.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.crud import jobs
+from app.db.database import SessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Window for the throughput figure in stats()
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class JobHandler(NamedTuple):
+    """
+    How to run one kind of job: func(db, jobs) processes a claimed batch and
+    raises to fail it; batch_size jobs are claimed at a time and at most
+    concurrency batches of the kind run at once
+    """
+    func: Callable[[Session, List[Job]], None]
+    batch_size: int = 1
+    concurrency: int = 1
+
+
+class JobWorker:
+    """
+    Asyncio pool that drains the job queue with the given handlers
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        periodic: Optional[Callable[[Session], None]] = None,
+        concurrency: Optional[int] = None
+    ):
+        self.handlers = handlers
+        self.periodic = periodic
+        self.concurrency = concurrency or settings.JOBS_CONCURRENCY
+        self._running: Dict[str, int] = {kind: 0 for kind in handlers}
+        self._tasks: List[asyncio.Task] = []
+        self._processed: Dict[Tuple[str, str], int] = {}
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def run_batch(self, kind: str) -> int:
+        """
+        Claim and process one batch of `kind`; returns the number of jobs claimed.
+        Runs in a worker thread.
+        """
+        handler = self.handlers[kind]
+        db = SessionLocal()
+        try:
+            claimed = jobs.claim_jobs(db, kind, handler.batch_size)
+            if not claimed:
+                return 0
+            started = time.perf_counter()
+            try:
+                handler.func(db, claimed)
+            except Exception as exc:
+                db.rollback()
+                logger.exception("%s batch of %d jobs failed", kind, len(claimed))
+                jobs.fail_jobs(db, claimed, f"{type(exc).__name__}: {exc}")
+                outcome = "failed"
+            else:
+                jobs.complete_jobs(db, claimed)
+                outcome = "done"
+            metrics.job_batch_duration.observe(time.perf_counter() - started, kind)
+            self._record(kind, outcome, len(claimed))
+            return len(claimed)
+        finally:
+            db.close()
+
+    def maintain(self) -> None:
+        """
+        Requeue stale jobs, purge old ones and run the periodic hook. Runs in a worker thread.
+        """
+        db = SessionLocal()
+        try:
+            requeued = jobs.requeue_stale_jobs(db)
+            if requeued:
+                logger.warning("Requeued %d jobs left running by a stopped worker", requeued)
+            jobs.purge_finished_jobs(db)
+            if self.periodic is not None:
+                self.periodic(db)
+                db.commit()
+        finally:
+            db.close()
+
+    def _record(self, kind: str, outcome: str, count: int) -> None:
+        metrics.jobs_processed.inc(count, kind, outcome)
+        now = time.monotonic()
+        with self._lock:
+            self._processed[(kind, outcome)] = self._processed.get((kind, outcome), 0) + count
+            self._recent.append((now, count))
+            while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+                self._recent.popleft()
+
+    def stats(self) -> dict:
+        """
+        Jobs finished by this process, by kind and outcome, and jobs per second over the last minute
+        """
+        now = time.monotonic()
+        with self._lock:
+            processed: Dict[str, Dict[str, int]] = {}
+            for (kind, outcome), count in self._processed.items():
+                processed.setdefault(kind, {})[outcome] = count
+            recent = sum(count for at, count in self._recent if at >= now - THROUGHPUT_WINDOW_SECONDS)
+        return {
+            "running": bool(self._tasks),
+            "concurrency": self.concurrency,
+            "processed": processed,
+            "throughput_per_second": round(recent / THROUGHPUT_WINDOW_SECONDS, 3),
+        }
+
+    async def _work(self) -> None:
+        while True:
+            claimed = 0
+            for kind, handler in self.handlers.items():
+                if self._running[kind] >= handler.concurrency:
+                    continue
+                self._running[kind] += 1
+                try:
+                    claimed += await asyncio.to_thread(self.run_batch, kind)
+                except Exception:
+                    logger.exception("Claiming %s jobs failed", kind)
+                finally:
+                    self._running[kind] -= 1
+            if not claimed:
+                await asyncio.sleep(settings.JOBS_POLL_SECONDS)
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.maintain)
+            except Exception:
+                logger.exception("Job queue maintenance failed")
+            await asyncio.sleep(settings.REMINDERS_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """
+        Start the pool on the running event loop
+        """
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+
+    async def stop(self) -> None:
+        """
+        Cancel the pool; batches already in a thread finish and are recorded
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
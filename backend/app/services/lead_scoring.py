@@ -0,0 +1,77 @@
+"""
+Server-side lead scoring on the 0-10 scale the dashboard uses.
+
+The score is a fixed-weight model over what the lead tells us up front: the
+part, the vehicle's age, the make and model, and whether a zip code was given.
+score_leads() scores a whole chunk of rows in one pass so the job handler can
+update them with a single executemany.
+"""
+from datetime import date
+from typing import Iterable, List, Optional, Sequence
+
+from app.models.callback import SCORING_FIELDS
+
+# Higher-ticket parts close more often and are worth more
+PRODUCT_WEIGHTS = {
+    "engine": 3.0,
+    "transmission": 2.8,
+    "transfer case": 2.0,
+    "ac compressor": 1.5,
+    "axle": 1.4,
+    "alternator": 1.2,
+    "starter": 1.2,
+    "radiator": 1.0,
+}
+DEFAULT_PRODUCT_WEIGHT = 0.8
+
+# Makes with the deepest inventory, where quotes convert best
+MAKE_WEIGHTS = {
+    "toyota": 1.5, "honda": 1.5, "ford": 1.4, "chevrolet": 1.4, "nissan": 1.2,
+    "jeep": 1.2, "dodge": 1.1, "hyundai": 1.0, "subaru": 1.0, "bmw": 0.8,
+}
+DEFAULT_MAKE_WEIGHT = 0.6
+
+# Vehicles in this age window (years) are the usual used-part buyers
+PRIME_AGE = (5, 15)
+
+
+def _age_weight(vehicle_year: Optional[int], current_year: int) -> float:
+    if not vehicle_year:
+        return 0.5
+    age = current_year - vehicle_year
+    if age < 0:
+        return 0.3
+    if PRIME_AGE[0] <= age <= PRIME_AGE[1]:
+        return 2.5
+    if age < PRIME_AGE[0]:
+        return 1.5
+    return max(0.5, 2.5 - (age - PRIME_AGE[1]) * 0.2)
+
+
+def score_lead(
+    product: Optional[str],
+    vehicle_year: Optional[int],
+    car_make: Optional[str],
+    car_model: Optional[str],
+    zip_code: Optional[str],
+    current_year: Optional[int] = None
+) -> float:
+    """
+    Score one lead from 0 to 10
+    """
+    current_year = current_year or date.today().year
+    score = 1.0
+    score += PRODUCT_WEIGHTS.get((product or "").strip().lower(), DEFAULT_PRODUCT_WEIGHT if product else 0.0)
+    score += _age_weight(vehicle_year, current_year)
+    score += MAKE_WEIGHTS.get((car_make or "").strip().lower(), DEFAULT_MAKE_WEIGHT if car_make else 0.0)
+    score += 0.7 if car_model else 0.0
+    score += 0.8 if zip_code and zip_code.strip() else 0.0
+    return round(min(score, 10.0), 1)
+
+
+def score_leads(rows: Iterable[Sequence]) -> List[float]:
+    """
+    Score rows whose first columns are SCORING_FIELDS, in one pass
+    """
+    current_year = date.today().year
+    return [score_lead(*row[:5], current_year=current_year) for row in rows]
@@ -0,0 +1,6 @@
+"""
+Synthetic data generator and load/benchmark harness for the callbacks API.
+
+    python -m benchmarks.seed --rows 10000
+    python -m benchmarks.run --output results.json [--baseline previous.json]
+"""
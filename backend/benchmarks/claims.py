@@ -0,0 +1,121 @@
+"""
+Concurrency benchmark for POST /callbacks/claim-next.
+
+Usage:
+    python -m benchmarks.claims [--base-url http://localhost:8000] [--claims 2000] [--concurrency 64]
+                                [--reset] [--output claims.json]
+
+Many agents claim at once, round-robin over the seeded agent names, and every
+claim is held for the whole run. Reports claim latency percentiles and claims
+per second, and checks that no callback was handed out twice. Exits with
+status 1 on a double assignment or any error. Without --base-url the app runs
+in-process against DATABASE_URL; --reset first clears every claim there.
+Seed data first with benchmarks.seed so plenty of callbacks are due.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks.data import AGENTS
+from benchmarks.run import API, make_client, percentile
+
+
+def reset_claims() -> None:
+    from sqlalchemy import update
+
+    from app.db.database import engine
+    from app.models.callback import Callback
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(Callback).where(Callback.claimed_by.isnot(None))
+            .values(claimed_by=None, claimed_until=None, last_modified=Callback.last_modified)
+        )
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    counter = itertools.count()
+    latencies: List[float] = []
+    claimed: List[int] = []
+    outcomes = Counter()
+
+    async with make_client(args.base_url, cache=True) as client:
+        async def agent_worker():
+            while True:
+                i = next(counter)
+                if i >= args.claims:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        f"{API}/claim-next", json={"agent_name": AGENTS[i % args.agents], "ttl_seconds": args.ttl}
+                    )
+                except Exception:
+                    # Transport errors, or server errors raised by the in-process app
+                    outcomes["error"] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                if response.status_code == 200:
+                    claimed.append(response.json()["id"])
+                    outcomes["claimed"] += 1
+                elif response.status_code == 204:
+                    outcomes["empty"] += 1
+                else:
+                    outcomes["error"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(agent_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    duplicates = sorted(callback_id for callback_id, count in Counter(claimed).items() if count > 1)
+    return {
+        "target": args.base_url or "in-process",
+        "concurrency": args.concurrency,
+        "agents": args.agents,
+        "requests": len(latencies),
+        "claimed": outcomes["claimed"],
+        "empty": outcomes["empty"],
+        "errors": outcomes["error"],
+        "double_assigned": len(duplicates),
+        "double_assigned_ids": duplicates[:20],
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "claims_per_second": round(outcomes["claimed"] / elapsed, 2) if elapsed else 0.0,
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.claims", description="Benchmark concurrent claim-next")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--claims", type=int, default=2000, help="claim-next calls in total")
+    parser.add_argument("--concurrency", type=int, default=64, help="Claims in flight at once")
+    parser.add_argument("--agents", type=int, default=len(AGENTS), help=f"Distinct agents, up to {len(AGENTS)}")
+    parser.add_argument("--ttl", type=int, default=3600, help="Claim lifetime; longer than the run so claims stay held")
+    parser.add_argument("--reset", action="store_true", help="Clear existing claims first (in-process only)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+    args.agents = max(1, min(args.agents, len(AGENTS)))
+
+    if args.reset:
+        if args.base_url:
+            parser.error("--reset only works in-process")
+        reset_claims()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 1 if results["double_assigned"] or results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
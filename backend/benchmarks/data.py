@@ -0,0 +1,33 @@
+"""
+Vocabulary for synthetic callbacks, shared by the seeder and the benchmarks
+"""
+MAKES_AND_MODELS = {
+    "Toyota": ["Camry", "Corolla", "RAV4", "Tacoma", "Highlander", "Sienna", "Tundra"],
+    "Honda": ["Civic", "Accord", "CR-V", "Pilot", "Odyssey", "Fit"],
+    "Ford": ["F-150", "Escape", "Explorer", "Focus", "Fusion", "Mustang", "Ranger"],
+    "Chevrolet": ["Silverado", "Malibu", "Equinox", "Tahoe", "Impala", "Cruze"],
+    "Nissan": ["Altima", "Sentra", "Rogue", "Pathfinder", "Frontier", "Maxima"],
+    "Jeep": ["Wrangler", "Grand Cherokee", "Cherokee", "Liberty", "Compass"],
+    "Dodge": ["Ram 1500", "Charger", "Durango", "Grand Caravan", "Journey"],
+    "Hyundai": ["Elantra", "Sonata", "Tucson", "Santa Fe"],
+    "BMW": ["3 Series", "5 Series", "X3", "X5"],
+    "Subaru": ["Outback", "Forester", "Impreza", "Legacy"],
+}
+PRODUCTS = ["Engine", "Transmission", "Alternator", "Starter", "Radiator", "AC Compressor", "Transfer Case", "Axle"]
+# Weighted so the common statuses dominate, as in production data
+STATUSES = ["Pending"] * 40 + ["No Answer"] * 20 + ["Follow-up Later"] * 15 + ["Sale"] * 10 + \
+    ["Not Interested"] * 8 + ["Wrong Number"] * 4 + ["Invalid"] * 3
+AGENTS = ["John Smith", "Emily Johnson", "Michael Brown", "Sarah Davis", "Robert Wilson"]
+FIRST_NAMES = ["James", "Mary", "Luis", "Patricia", "Ahmed", "Jennifer", "Wei", "Linda", "Carlos", "Aisha",
+               "David", "Maria", "Kevin", "Nancy", "Jamal", "Karen", "Raj", "Susan", "Tyrone", "Olga"]
+LAST_NAMES = ["Garcia", "Smith", "Nguyen", "Johnson", "Khan", "Williams", "Brown", "Martinez", "Lee", "Davis",
+              "Rodriguez", "Miller", "Wilson", "Patel", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "White"]
+COMMENTS = [
+    "Customer wants a quote with shipping included.",
+    "Asked for warranty details, call back after 5pm.",
+    "Comparing prices with a local yard.",
+    "Needs the part before the end of the month.",
+    "Left voicemail.",
+    "Wants low mileage only, sent pictures by text.",
+    "Mechanic will confirm the engine code.",
+]
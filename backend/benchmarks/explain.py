@@ -0,0 +1,181 @@
+"""
+Check that every dashboard filter combination is served by an index.
+
+Usage:
+    python -m benchmarks.explain
+
+Runs get_callbacks for each combination of the list filters, first page and
+cursor page, captures the SQL it sends, and EXPLAINs each statement against
+DATABASE_URL (SQLite or PostgreSQL). A plan fails when it scans callbacks
+without an index, walks an index without seeking on the filters, or sorts rows
+instead of reading them in index order. The
+open-follow-up scan and the claim-next queue must use their partial indexes. Exits with status 1 on any
+failure. Seed some data first so a cursor page exists; statistics are
+refreshed with ANALYZE before planning.
+"""
+import itertools
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, select, text
+
+from app.crud.callback import get_callbacks
+from app.crud.callback_claims import claim_queue
+from app.db.database import Base, SessionLocal, engine
+from app.models.callback import Callback, open_status_filter
+from app.schemas.callback import CallbackFilterParams
+from benchmarks.data import AGENTS
+
+
+def filter_combinations() -> Iterator[Tuple[str, CallbackFilterParams]]:
+    today = date.today()
+    choices = {
+        "status": {"status": "Pending"},
+        "agent": {"agent_name": AGENTS[0]},
+        "dates": {"follow_up_date_start": today - timedelta(days=7), "follow_up_date_end": today + timedelta(days=7)},
+    }
+    for size in range(len(choices) + 1):
+        for names in itertools.combinations(choices, size):
+            values = {}
+            for name in names:
+                values.update(choices[name])
+            yield "+".join(names) or "none", CallbackFilterParams(**values)
+
+
+@contextmanager
+def captured_statements(connection) -> Iterator[List[Tuple[str, object]]]:
+    """
+    Record the SELECTs sent on a connection while the block runs
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+
+def sqlite_problems(connection, statement: str, parameters, seek: bool, ordered: bool) -> Tuple[List[str], str]:
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    details = [row[-1] for row in rows]
+    problems = [
+        detail for detail in details
+        if (detail.startswith("SCAN callbacks ") or detail == "SCAN callbacks") and "INDEX" not in detail
+        or ordered and "TEMP B-TREE" in detail
+    ]
+    if seek and not any(detail.startswith("SEARCH callbacks") for detail in details):
+        problems.append("filters are not used to seek into an index")
+    return problems, "\n".join(details)
+
+
+def postgresql_problems(connection, statement: str, parameters, seek: bool, ordered: bool) -> Tuple[List[str], str]:
+    # Small tables make a sequential scan cheapest; we want to know an index *can* serve the query
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    problems = []
+    seeks = []
+
+    def walk(node: Dict):
+        if node.get("Relation Name") == "callbacks" and node["Node Type"] == "Seq Scan":
+            problems.append("Seq Scan on callbacks")
+        if node.get("Relation Name") == "callbacks" and "Index Cond" in node:
+            seeks.append(node["Index Cond"])
+        if ordered and node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.append(f"{node['Node Type']} on {node.get('Sort Key')}")
+        for child in node.get("Plans", ()):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    if seek and not seeks:
+        problems.append("filters are not used to seek into an index")
+    return problems, json.dumps(plan[0]["Plan"], indent=1)
+
+
+def explain(connection, statement: str, parameters, seek: bool = True, ordered: bool = True) -> Tuple[List[str], str]:
+    """
+    Plan problems for a statement, and the plan itself. With seek, reading the
+    whole table in index order is not enough: a WHERE term has to bound the scan.
+    With ordered, rows must come out of an index in order rather than through a
+    sort; ranked search results are sorted by relevance and pass ordered=False.
+    """
+    if connection.dialect.name == "postgresql":
+        return postgresql_problems(connection, statement, parameters, seek, ordered)
+    return sqlite_problems(connection, statement, parameters, seek, ordered)
+
+
+def open_follow_up_statement():
+    # Due and overdue follow-ups still being worked, soonest first
+    return (
+        select(Callback.id, Callback.follow_up_date)
+        .where(open_status_filter(), Callback.follow_up_date <= date.today())
+        .order_by(Callback.follow_up_date, Callback.id)
+        .limit(100)
+    )
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    failures = 0
+    db = SessionLocal()
+    try:
+        connection = db.connection()
+        # Plan with current statistics, as after the filter-index migration
+        connection.exec_driver_sql("ANALYZE callbacks")
+        for name, filters in filter_combinations():
+            first_page, cursor = get_callbacks(db, limit=1, filters=filters, columns=["id"])
+            with captured_statements(connection) as statements:
+                get_callbacks(db, limit=1, filters=filters, columns=["id"])
+                if cursor:
+                    get_callbacks(db, limit=1, filters=filters, cursor=cursor, columns=["id"])
+            if not first_page:
+                print(f"warning: no rows match list[{name}]; seed data to check the cursor plan", file=sys.stderr)
+            for n, (statement, parameters) in enumerate(statements):
+                label = f"list[{name}] {'first page' if n == 0 else 'cursor page'}"
+                # An unfiltered first page may walk the keyset index from the top
+                seek = name != "none" or n > 0
+                problems, plan = explain(connection, statement, parameters, seek)
+                failures += _report(label, problems, plan)
+
+        with captured_statements(connection) as statements:
+            db.execute(open_follow_up_statement()).all()
+        for statement, parameters in statements:
+            problems, plan = explain(connection, statement, parameters)
+            if "ix_callbacks_open_follow_up" not in plan:
+                problems.append("partial index ix_callbacks_open_follow_up not used")
+            failures += _report("open follow-ups", problems, plan)
+
+        with captured_statements(connection) as statements:
+            db.execute(claim_queue(db, AGENTS[0]).limit(1)).all()
+        for statement, parameters in statements:
+            problems, plan = explain(connection, statement, parameters)
+            if "ix_callbacks_claim_queue" not in plan:
+                problems.append("partial index ix_callbacks_claim_queue not used")
+            failures += _report("claim queue", problems, plan)
+    finally:
+        db.rollback()
+        db.close()
+
+    print(f"{failures} plan(s) without index support" if failures else "every plan is index-backed")
+    return 1 if failures else 0
+
+
+def _report(label: str, problems: List[str], plan: str) -> int:
+    if not problems:
+        print(f"ok   {label}")
+        return 0
+    print(f"FAIL {label}: {'; '.join(problems)}\n{plan}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
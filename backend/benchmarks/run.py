@@ -0,0 +1,271 @@
+"""
+Latency and throughput benchmarks for the callbacks API.
+
+Usage:
+    python -m benchmarks.run [--base-url http://localhost:8000] [--requests 200] [--concurrency 8]
+                             [--scenario list] [--output results.json]
+                             [--baseline previous.json --tolerance 0.2]
+
+Without --base-url the app is driven in-process through httpx's ASGI transport,
+against DATABASE_URL, with the response cache disabled so reads reach the
+database (pass --cache to keep it). Seed data first with benchmarks.seed.
+
+Every scenario reports p50/p95/p99 latency and throughput. With --baseline the
+run is compared scenario by scenario and exits with status 1 when a p95 grew by
+more than the tolerance, so CI can fail on a regression.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.data import AGENTS, STATUSES
+
+API = "/api/v1/callbacks"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Step = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+async def run_scenario(client: httpx.AsyncClient, step: Step, requests: int, concurrency: int, warmup: int) -> Dict:
+    """
+    Issue `requests` calls of `step` from `concurrency` workers and summarize them
+    """
+    for i in range(warmup):
+        await step(client, i)
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            started = time.perf_counter()
+            try:
+                response = await step(client, i)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def list_filter_combinations() -> Dict[str, Dict]:
+    """
+    Query params for every combination of the list filters, keyed by scenario name
+    """
+    today = date.today()
+    choices = {
+        "status": lambda i: {"status": STATUSES[i % len(STATUSES)]},
+        "agent": lambda i: {"agent_name": AGENTS[i % len(AGENTS)]},
+        "dates": lambda i: {
+            "follow_up_date_start": (today - timedelta(days=7 + i % 7)).isoformat(),
+            "follow_up_date_end": (today + timedelta(days=7)).isoformat(),
+        },
+    }
+    combinations = {}
+    for size in range(len(choices) + 1):
+        for names in itertools.combinations(choices, size):
+            combinations["list[" + "+".join(names) + "]" if names else "list[none]"] = {
+                name: choices[name] for name in names
+            }
+    return combinations
+
+
+def build_scenarios(total_rows: int, created_ids: List[int]) -> Dict[str, Step]:
+    scenarios: Dict[str, Step] = {}
+
+    for name, params in list_filter_combinations().items():
+        def list_step(client, i, params=params):
+            query = {"limit": 100}
+            for build in params.values():
+                query.update(build(i))
+            return client.get(f"{API}/", params=query)
+        scenarios[name] = list_step
+
+    deep_offset = max(total_rows - 100, 0)
+
+    def offset_step(client, i):
+        # Pages near the end of the table, where OFFSET has to skip the most rows
+        return client.get(f"{API}/", params={"skip": deep_offset - (i * 100) % max(deep_offset, 1), "limit": 100})
+    scenarios["paginate[offset-deep]"] = offset_step
+
+    cursor_state = {"cursor": None}
+
+    async def cursor_step(client, i):
+        # Walks the table page by page; restarts from the top when it runs out
+        params = {"limit": 100}
+        if cursor_state["cursor"]:
+            params["cursor"] = cursor_state["cursor"]
+        response = await client.get(f"{API}/", params=params)
+        cursor_state["cursor"] = response.headers.get(NEXT_CURSOR_HEADER)
+        return response
+    scenarios["paginate[cursor]"] = cursor_step
+
+    search_terms = ["Garcia", "Toyota", "Grand Cherokee", "warranty", "555", "Ahmed Khan"]
+
+    def search_step(client, i):
+        return client.get(f"{API}/search/", params={"query": search_terms[i % len(search_terms)], "limit": 100})
+    scenarios["search"] = search_step
+
+    def search_phone_step(client, i):
+        return client.get(f"{API}/search/", params={"query": f"{i % 10000:04d}", "limit": 100})
+    scenarios["search[phone]"] = search_phone_step
+
+    async def create_step(client, i):
+        response = await client.post(f"{API}/", json={
+            "customer_name": f"Benchmark Lead {i}",
+            "callback_number": f"(800) 555-{i % 10000:04d}",
+            "car_make": "Toyota",
+            "car_model": "Camry",
+            "status": "Pending",
+            "agent_name": AGENTS[i % len(AGENTS)],
+        })
+        if response.status_code == 200:
+            created_ids.append(response.json()["id"])
+        return response
+    scenarios["create-burst"] = create_step
+
+    def update_step(client, i):
+        callback_id = created_ids[i % len(created_ids)] if created_ids else 1
+        return client.put(f"{API}/{callback_id}", json={
+            "status": STATUSES[i % len(STATUSES)],
+            "last_modified_by": "benchmark",
+        })
+    scenarios["update-burst"] = update_step
+
+    return scenarios
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, metric: str = "p95_ms") -> List[str]:
+    """
+    Scenarios whose `metric` grew by more than `tolerance` over the baseline
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = current[metric] / previous[metric]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]} (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def make_client(base_url: Optional[str], cache: bool) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+    if not cache:
+        os.environ["CACHE_ENABLED"] = "false"
+    # Every benchmark request comes from one address; measure the API, not the limiter
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60)
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    async with make_client(args.base_url, args.cache) as client:
+        stats = (await client.get(f"{API}/stats")).json()
+        created_ids: List[int] = []
+        scenarios = build_scenarios(stats["total"], created_ids)
+        selected = [name for name in scenarios if not args.scenario or any(s in name for s in args.scenario)]
+
+        results = {
+            "meta": {
+                "target": args.base_url or "in-process",
+                "database": _database_name(args.base_url),
+                "rows": stats["total"],
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "cache": bool(args.base_url) or args.cache,
+                "python": platform.python_version(),
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "scenarios": {},
+        }
+        for name in selected:
+            summary = await run_scenario(client, scenarios[name], args.requests, args.concurrency, args.warmup)
+            results["scenarios"][name] = summary
+            print(
+                f"{name:32} p50 {summary['p50_ms']:9.2f}ms  p95 {summary['p95_ms']:9.2f}ms  "
+                f"p99 {summary['p99_ms']:9.2f}ms  {summary['throughput_rps']:8.1f} req/s  errors {summary['errors']}",
+                file=sys.stderr,
+            )
+    return results
+
+
+def _database_name(base_url: Optional[str]) -> str:
+    if base_url:
+        return "remote"
+    from app.db.database import engine
+    return engine.dialect.name
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark the callbacks API")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests before each scenario")
+    parser.add_argument("--scenario", action="append", help="Only run scenarios whose name contains this; repeatable")
+    parser.add_argument("--cache", action="store_true", help="Keep the in-process response cache enabled")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth over the baseline")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if any(summary["errors"] for summary in results["scenarios"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
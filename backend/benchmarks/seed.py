@@ -0,0 +1,111 @@
+"""
+Seed the callbacks table with realistic synthetic leads.
+
+Usage:
+    python -m benchmarks.seed --rows 10000 [--batch-size 10000] [--seed 42] [--truncate]
+
+Targets DATABASE_URL like the app does, so the same command seeds SQLite or
+PostgreSQL. Rows are generated lazily and written with executemany, one
+transaction per batch, so 10M rows never sit in memory. The callback_stats
+summary table is rebuilt at the end.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+from sqlalchemy import delete, insert
+
+from app.core.phone import normalize_phone
+from app.crud.callback_stats import rebuild_callback_stats
+from app.db.database import Base, SessionLocal, engine
+from app.models.callback import Callback
+from benchmarks.data import AGENTS, COMMENTS, FIRST_NAMES, LAST_NAMES, MAKES_AND_MODELS, PRODUCTS, STATUSES
+
+
+def generate_callbacks(rows: int, seed: int = 42, today: date = None) -> Iterator[Dict]:
+    """
+    Yield `rows` callback dicts; the same seed always yields the same data
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    makes = list(MAKES_AND_MODELS)
+    for n in range(rows):
+        make = rng.choice(makes)
+        created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+        modified_at = min(now, created_at + timedelta(seconds=rng.randint(0, 30 * 24 * 3600)))
+        follow_up_date = None if rng.random() < 0.3 else today + timedelta(days=rng.randint(-60, 60))
+        number = f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{n % 10000:04d}"
+        yield {
+            "product": rng.choice(PRODUCTS),
+            "vehicle_year": rng.randint(1998, 2024),
+            "car_make": make,
+            "car_model": rng.choice(MAKES_AND_MODELS[make]),
+            "zip_code": f"{rng.randint(1000, 99950):05d}",
+            "customer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "callback_number": number,
+            "phone_normalized": normalize_phone(number),
+            "follow_up_date": follow_up_date,
+            "status": rng.choice(STATUSES),
+            "agent_name": rng.choice(AGENTS) if rng.random() < 0.9 else None,
+            "lead_score": round(rng.uniform(0, 10), 1) if rng.random() < 0.7 else None,
+            "comments": rng.choice(COMMENTS) if rng.random() < 0.6 else None,
+            "created_at": created_at,
+            "last_modified": modified_at,
+            "last_modified_by": rng.choice(AGENTS),
+        }
+
+
+def seed_callbacks(rows: int, batch_size: int = 10000, seed: int = 42, truncate: bool = False) -> float:
+    """
+    Insert `rows` synthetic callbacks and rebuild the stats table; returns seconds taken
+    """
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    if truncate:
+        with engine.begin() as conn:
+            conn.execute(delete(Callback))
+
+    statement = insert(Callback)
+    batch: List[Dict] = []
+    written = 0
+    for row in generate_callbacks(rows, seed=seed):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with engine.begin() as conn:
+                conn.execute(statement, batch)
+            written += len(batch)
+            batch = []
+            print(f"\r{written:,}/{rows:,} rows", end="", file=sys.stderr, flush=True)
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(statement, batch)
+        written += len(batch)
+    print(f"\r{written:,}/{rows:,} rows", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        rebuild_callback_stats(db)
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description="Seed synthetic callbacks")
+    parser.add_argument("--rows", type=int, default=10000, help="e.g. 10000, 1000000 or 10000000")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Delete existing callbacks first")
+    args = parser.parse_args(argv)
+
+    elapsed = seed_callbacks(args.rows, batch_size=args.batch_size, seed=args.seed, truncate=args.truncate)
+    print(f"Seeded {args.rows:,} callbacks into {engine.url.render_as_string(hide_password=True)} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Start-up time and per-worker memory of the production server.
+
+Usage:
+    python -m benchmarks.startup [--workers 4] [--port 8765] [--runs 3] [--output startup.json]
+
+Starts `python -m app.server` against DATABASE_URL, polls /readyz until it
+answers 200 and records the time, then reads the resident memory of the
+master and of every worker from /proc (Linux). Repeats for --runs cold
+starts and reports the median time to ready and the memory of the last run.
+The schema must already exist (alembic upgrade head or benchmarks.seed).
+"""
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as listing:
+                children += [int(child) for child in listing.read().split()]
+        except OSError:
+            continue
+    return children
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_once(workers: int, port: int, timeout: float) -> Dict:
+    """
+    Start the server, wait for it to be ready, measure it and stop it
+    """
+    env = {**os.environ, "JOBS_IN_PROCESS": os.environ.get("JOBS_IN_PROCESS", "false"), "LOG_LEVEL": "warning"}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        env=env
+    )
+    url = f"http://127.0.0.1:{port}/readyz"
+    try:
+        ready = None
+        while ready is None:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"Server not ready after {timeout:g}s")
+            try:
+                if httpx.get(url, timeout=1).status_code == 200:
+                    ready = time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+
+        # Every worker must have booted before their memory means anything
+        deadline = time.perf_counter() + timeout
+        worker_pids = _children(server.pid)
+        while len(worker_pids) < workers and time.perf_counter() < deadline:
+            time.sleep(0.1)
+            worker_pids = _children(server.pid)
+        time.sleep(0.5)
+        worker_rss = [_rss_bytes(pid) for pid in worker_pids]
+        return {
+            "ready_seconds": round(ready, 3),
+            "master_rss_mb": round((_rss_bytes(server.pid) or 0) / 1048576, 1),
+            "worker_rss_mb": [round((rss or 0) / 1048576, 1) for rss in worker_rss],
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Measure server start-up")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    runs = [start_once(args.workers, args.port, args.timeout) for _ in range(args.runs)]
+    last = runs[-1]
+    results = {
+        "workers": args.workers,
+        "runs": args.runs,
+        "ready_seconds": {
+            "median": round(statistics.median(run["ready_seconds"] for run in runs), 3),
+            "max": max(run["ready_seconds"] for run in runs),
+        },
+        "master_rss_mb": last["master_rss_mb"],
+        "worker_rss_mb": last["worker_rss_mb"],
+        "total_rss_mb": round(last["master_rss_mb"] + sum(last["worker_rss_mb"]), 1),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
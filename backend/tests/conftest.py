@@ -0,0 +1,39 @@
+"""
+Shared fixtures. Tests run against a throwaway SQLite database; the
+environment is set up before any app module reads its settings.
+"""
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="autoxpress-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/primary.db"
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["JOBS_IN_PROCESS"] = "false"
+
+import pytest
+
+from app.db.database import Base, SessionLocal, engine
+from app.main import app  # noqa: F401  (registers every model on Base.metadata)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    """
+    Session on the test database; every table is emptied afterwards
+    """
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.crud import callback as crud, callback_archive
+from app.main import app
+from app.models.callback import Callback
+from app.schemas.callback import CallbackCreate
+
+LAST_YEAR = datetime(2025, 1, 5, 9, 30)
+
+
+def _create(db, status):
+    callback = crud.create_callback(db, CallbackCreate(
+        customer_name="Ann Lee", callback_number="5551230000", car_make="Honda", car_model="Civic", status=status
+    ))
+    db.execute(update(Callback).where(Callback.id == callback.id).values(last_modified=LAST_YEAR))
+    db.commit()
+    return callback.id
+
+
+def test_archiving_is_opt_in():
+    assert settings.ARCHIVE_ENABLED is False
+    assert "No Answer" not in settings.ARCHIVE_STATUSES
+
+
+def test_open_statuses_are_never_archived(db, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_STATUSES", ["Sale", "No Answer"])
+    sale_id = _create(db, "Sale")
+    open_id = _create(db, "No Answer")
+
+    assert callback_archive.archive_callbacks(db, older_than_days=1) == 1
+    assert callback_archive.is_archived(db, sale_id)
+    assert crud.get_callback(db, open_id) is not None
+
+
+def test_archived_callback_answers_gone(db):
+    sale_id = _create(db, "Sale")
+    assert callback_archive.archive_callbacks(db, older_than_days=1) == 1
+
+    with TestClient(app) as client:
+        for method in ("get", "delete"):
+            assert client.request(method, f"/api/v1/callbacks/{sale_id}").status_code == 410
+        assert client.put(f"/api/v1/callbacks/{sale_id}", json={"notes": "late"}).status_code == 410
+        assert client.get(f"/api/v1/callbacks/{sale_id + 1000}").status_code == 404
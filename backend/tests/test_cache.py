@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.crud import callback_cache
+from app.main import app
+
+LEAD = {"customer_name": "Ann Lee", "callback_number": "5551230000", "car_make": "Honda", "car_model": "Civic"}
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    backend = cache.MemoryCache()
+    monkeypatch.setattr(cache, "_backend", backend)
+    return backend
+
+
+def test_write_invalidates_cached_list_and_detail(db, memory_cache):
+    with TestClient(app) as client:
+        callback_id = client.post("/api/v1/callbacks/", json=LEAD).json()["id"]
+        list_url, detail_url = "/api/v1/callbacks/?status=Pending", f"/api/v1/callbacks/{callback_id}"
+
+        listed, detail = client.get(list_url), client.get(detail_url)
+        assert memory_cache.get(callback_cache.detail_cache_key(callback_id)) is not None
+        assert list(memory_cache.iter_keys(callback_cache.LIST_PREFIX))
+        for url, response in ((list_url, listed), (detail_url, detail)):
+            assert client.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+        assert client.put(detail_url, json={"comments": "Wants a test drive"}).status_code == 200
+        assert memory_cache.get(callback_cache.detail_cache_key(callback_id)) is None
+        assert not list(memory_cache.iter_keys(callback_cache.LIST_PREFIX))
+
+        relisted = client.get(list_url, headers={"If-None-Match": listed.headers["ETag"]})
+        reread = client.get(detail_url, headers={"If-None-Match": detail.headers["ETag"]})
+
+    for before, after in ((listed, relisted), (detail, reread)):
+        assert after.status_code == 200
+        assert after.headers["ETag"] != before.headers["ETag"]
+    assert relisted.json()[0]["comments"] == reread.json()["comments"] == "Wants a test drive"
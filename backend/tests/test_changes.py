@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.crud import callback as crud, callback_sync
+from app.schemas.callback import CallbackCreate
+
+
+def _clock(days_ahead: int):
+    """
+    Stand-in for callback_sync._db_time on a database clock days_ahead days from now
+    """
+    def db_time(db, seconds_ago):
+        moment = datetime.utcnow() + timedelta(days=days_ahead, seconds=-seconds_ago)
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
+    return db_time
+
+
+def test_continuous_sync_without_deletes_is_never_reset(db, monkeypatch):
+    crud.create_callback(db, CallbackCreate(customer_name="Ann Lee", callback_number="5551230000"))
+    changes = callback_sync.get_changes(db)
+    assert changes["upserts"] and not changes["reset"]
+
+    # A client syncing daily for longer than the tombstone retention while nothing is deleted
+    for day in range(1, settings.SYNC_TOMBSTONE_DAYS + 10):
+        monkeypatch.setattr(callback_sync, "_db_time", _clock(day))
+        changes = callback_sync.get_changes(db, since=changes["next"])
+        assert not changes["reset"], f"reset on day {day}"
+        assert changes["deletes"] == []
+
+
+def test_since_older_than_retention_is_reset(db):
+    since = (datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS + 1)).isoformat()
+    assert callback_sync.get_changes(db, since=since)["reset"]
@@ -0,0 +1,61 @@
+import threading
+from datetime import date, timedelta
+
+from app.crud import callback as crud, callback_claims
+from app.db.database import SessionLocal
+from app.schemas.callback import CallbackCreate
+
+YESTERDAY = date.today() - timedelta(days=1)
+
+
+def _create(db, name):
+    return crud.create_callback(db, CallbackCreate(
+        customer_name=name, callback_number="5551230000", follow_up_date=YESTERDAY
+    )).id
+
+
+def test_bulk_status_change_releases_claims(db):
+    callback_id = _create(db, "Ann Lee")
+    assert callback_claims.claim_next_callback(db, "Agent A").id == callback_id
+
+    assert crud.bulk_update_callbacks(db, {"status": "No Answer"}, ids=[callback_id]) == 1
+    db.expire_all()
+    callback = crud.get_callback(db, callback_id)
+    assert callback.claimed_by is None and callback.claimed_until is None
+    assert callback_claims.claim_next_callback(db, "Agent B").id == callback_id
+
+
+def test_bulk_update_without_status_keeps_claims(db):
+    callback_id = _create(db, "Ann Lee")
+    callback_claims.claim_next_callback(db, "Agent A")
+
+    crud.bulk_update_callbacks(db, {"comments": "left a voicemail"}, ids=[callback_id])
+    db.expire_all()
+    assert crud.get_callback(db, callback_id).claimed_by == "Agent A"
+
+
+def test_concurrent_claims_never_hand_out_the_same_row(db):
+    callback_ids = {_create(db, f"Lead {number}") for number in range(20)}
+    agents = 8
+    start = threading.Barrier(agents)
+    claimed = {}
+
+    def claim_all(agent_name):
+        session = SessionLocal()
+        try:
+            start.wait()
+            claimed[agent_name] = []
+            while (callback := callback_claims.claim_next_callback(session, agent_name)) is not None:
+                claimed[agent_name].append(callback.id)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=claim_all, args=(f"Agent {number}",)) for number in range(agents)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    handed_out = [callback_id for ids in claimed.values() for callback_id in ids]
+    assert len(claimed) == agents
+    assert sorted(handed_out) == sorted(callback_ids)
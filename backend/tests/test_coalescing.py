@@ -0,0 +1,33 @@
+import asyncio
+
+import httpx
+
+from app.api.endpoints import callbacks as endpoints
+from app.crud import callback as crud
+from app.main import app
+from app.schemas.callback import CallbackCreate
+
+
+def test_concurrent_identical_reads_share_one_query(db, monkeypatch):
+    crud.create_callback(db, CallbackCreate(customer_name="Ann Lee", callback_number="5551230000"))
+    queries = []
+    get_callbacks = endpoints.get_callbacks
+
+    async def slow_get_callbacks(*args, **kwargs):
+        queries.append(kwargs.get("filters"))
+        # Keep the first read in flight until every request has arrived
+        await asyncio.sleep(0.1)
+        return await get_callbacks(*args, **kwargs)
+
+    monkeypatch.setattr(endpoints, "get_callbacks", slow_get_callbacks)
+
+    async def read_concurrently():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/api/v1/callbacks/?status=Pending") for _ in range(5)))
+
+    responses = asyncio.run(read_concurrently())
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len({response.content for response in responses}) == 1
+    assert len(responses[0].json()) == 1
+    assert len(queries) == 1
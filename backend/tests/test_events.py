@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from app.core import events
+from app.crud import callback_events
+
+
+class RecordingBroker(events.MemoryBroker):
+    """
+    MemoryBroker noting which threads its possibly-blocking methods run on
+    """
+
+    def __init__(self):
+        super().__init__(history=10)
+        self.threads = set()
+
+    def subscribe(self, listener):
+        self.threads.add(threading.get_ident())
+        return super().subscribe(listener)
+
+    def replay(self, after_id):
+        self.threads.add(threading.get_ident())
+        return super().replay(after_id)
+
+    def last_id(self):
+        self.threads.add(threading.get_ident())
+        return super().last_id()
+
+
+def test_listen_keeps_broker_queries_off_the_event_loop(monkeypatch):
+    broker = RecordingBroker()
+    monkeypatch.setattr(events, "_broker", broker)
+    broker.publish({"type": callback_events.CREATED, "scopes": []})
+    broker.publish({"type": callback_events.UPDATED, "scopes": []})
+
+    async def resume():
+        stream = callback_events.listen(last_event_id=1)
+        event = await stream.__anext__()
+        await stream.aclose()
+        return event, threading.get_ident()
+
+    event, loop_thread = asyncio.run(resume())
+    assert event["type"] == callback_events.UPDATED
+    assert broker.threads and loop_thread not in broker.threads
+
+
+def test_listen_resets_when_the_gap_is_gone(monkeypatch):
+    broker = RecordingBroker()
+    monkeypatch.setattr(events, "_broker", broker)
+    for _ in range(20):
+        broker.publish({"type": callback_events.CREATED, "scopes": []})
+
+    async def resume():
+        return [event async for event in callback_events.listen(last_event_id=2)]
+
+    assert asyncio.run(resume()) == [{"id": 20, "type": callback_events.RESET}]
@@ -0,0 +1,36 @@
+from app.crud import callback as crud, callback_history
+from app.schemas.callback import CallbackCreate, CallbackUpdate
+
+
+def _create(db, name):
+    return crud.create_callback(db, CallbackCreate(customer_name=name, callback_number="5551230000")).id
+
+
+def test_ids_of_deleted_callbacks_are_not_reused(db):
+    _create(db, "Ann Lee")
+    deleted_id = _create(db, "Bob Hart")
+    assert crud.delete_callback(db, deleted_id)
+
+    new_id = _create(db, "Cy Moss")
+    assert new_id > deleted_id
+    assert [entry.action for entry in callback_history.get_history(db, new_id)] == [callback_history.CREATED]
+
+
+def test_create_update_and_delete_are_recorded(db):
+    callback_id = _create(db, "Ann Lee")
+    crud.update_callback(db, callback_id, CallbackUpdate(status="Sale", agent_name="Sarah Davis"))
+    crud.update_callback(db, callback_id, CallbackUpdate(status="Sale"))
+    assert crud.delete_callback(db, callback_id)
+
+    deleted, updated, created = callback_history.get_history(db, callback_id)
+    assert created.action == callback_history.CREATED
+    assert created.changes["customer_name"] == [None, "Ann Lee"]
+    assert (created.from_status, created.to_status) == (None, "Pending")
+
+    assert updated.action == callback_history.UPDATED
+    assert updated.changes == {"status": ["Pending", "Sale"], "agent_name": [None, "Sarah Davis"]}
+    assert (updated.from_status, updated.to_status, updated.agent_name) == ("Pending", "Sale", "Sarah Davis")
+
+    assert deleted.action == callback_history.DELETED
+    assert deleted.changes is None
+    assert (deleted.from_status, deleted.to_status, deleted.agent_name) == ("Sale", None, "Sarah Davis")
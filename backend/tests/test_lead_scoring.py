@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.crud import callback as crud
+from app.models.callback import Callback
+from app.schemas.callback import CallbackCreate, CallbackUpdate
+from app.services.callback_jobs import score_callbacks
+
+LAST_WEEK = datetime(2026, 1, 5, 9, 30)
+
+
+def _create(db, **fields):
+    callback = crud.create_callback(db, CallbackCreate(
+        customer_name="Ann Lee", callback_number="5551230000", product="Engine", vehicle_year=2019,
+        car_make="Honda", car_model="Civic", zip_code="10001", **fields
+    ))
+    db.execute(update(Callback).where(Callback.id == callback.id).values(last_modified=LAST_WEEK))
+    db.commit()
+    return callback.id
+
+
+def test_scoring_does_not_touch_last_modified(db):
+    callback_id = _create(db)
+    assert score_callbacks(db, ids=[callback_id]) == 1
+    db.expire_all()
+    callback = crud.get_callback(db, callback_id)
+    assert callback.lead_score is not None
+    assert callback.last_modified.replace(tzinfo=None) == LAST_WEEK
+
+
+def test_scoring_keeps_scores_set_by_a_client(db):
+    callback_id = _create(db, lead_score=9.5)
+    assert score_callbacks(db, ids=[callback_id]) == 0
+    assert crud.get_callback(db, callback_id).lead_score == 9.5
+
+    # Clearing the score hands the callback back to the scoring job
+    crud.update_callback(db, callback_id, CallbackUpdate(lead_score=None))
+    assert score_callbacks(db, ids=[callback_id]) == 1
+    db.expire_all()
+    assert crud.get_callback(db, callback_id).lead_score is not None
@@ -0,0 +1,37 @@
+from collections import deque
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.config import settings
+from app.main import app
+
+STATEMENT = "SELECT * FROM callbacks WHERE callback_number = ?"
+
+
+@pytest.fixture
+def slow_queries(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(metrics, "slow_queries", deque(maxlen=settings.SLOW_QUERY_SAMPLES))
+    return metrics.slow_queries
+
+
+def _listed():
+    with TestClient(app) as client:
+        response = client.get("/api/v1/system/slow-queries")
+    assert response.status_code == 200
+    return [row for row in response.json() if row["statement"] == STATEMENT]
+
+
+def test_slow_query_parameters_are_redacted_by_default(slow_queries):
+    assert settings.SLOW_QUERY_PARAMETERS is False
+    metrics.record_statement(STATEMENT, ("5551230000",), 0.5)
+    assert slow_queries[-1]["parameters"] is None
+    assert [row["parameters"] for row in _listed()] == [None]
+
+
+def test_slow_query_parameters_are_kept_on_request(slow_queries, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_PARAMETERS", True)
+    metrics.record_statement(STATEMENT, ("5551230000",), 0.5)
+    assert [row["parameters"] for row in _listed()] == ["('5551230000',)"]
@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.util.exc import AutogenerateDiffsDetected
+from sqlalchemy import create_engine, text
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def alembic_config(tmp_path, monkeypatch):
+    """
+    Alembic pointed at an empty database of its own; env.py reads DATABASE_URL
+    """
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/migrated.db")
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    return config
+
+
+def _autogenerate_diffs(config: Config) -> str:
+    """
+    What `alembic check` would put in a new migration
+    """
+    try:
+        command.check(config)
+    except AutogenerateDiffsDetected as exc:
+        return str(exc)
+    return ""
+
+
+def test_autogenerate_keeps_search_index(alembic_config):
+    command.upgrade(alembic_config, "head")
+    diffs = _autogenerate_diffs(alembic_config)
+    assert "callbacks_fts" not in diffs
+    assert "_trgm" not in diffs
+
+
+@pytest.mark.filterwarnings("ignore:.*expression-based index")
+def test_migrations_match_models(alembic_config):
+    command.upgrade(alembic_config, "head")
+    assert _autogenerate_diffs(alembic_config) == ""
+
+
+def test_existing_scores_count_as_set_by_clients(alembic_config):
+    command.upgrade(alembic_config, "e1c7a3f95b20")
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO callbacks (customer_name, callback_number, lead_score) VALUES ('Ann', '5551230000', 7.5), ('Bob', '5551230001', NULL)"
+        ))
+    command.upgrade(alembic_config, "head")
+    with engine.connect() as connection:
+        manual = connection.execute(text("SELECT customer_name, lead_score_manual FROM callbacks ORDER BY id")).all()
+    engine.dispose()
+    assert [(name, bool(flag)) for name, flag in manual] == [("Ann", True), ("Bob", False)]
+
+
+def test_sqlite_never_reuses_callback_ids(alembic_config):
+    command.upgrade(alembic_config, "f7a2c9d4e168")
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO callbacks (customer_name, callback_number) VALUES ('Ann', '5551230000'), ('Bob', '5551230001')"
+        ))
+        connection.execute(text("DELETE FROM callbacks WHERE id = 2"))
+        connection.execute(text("INSERT INTO callback_tombstones (callback_id) VALUES (2)"))
+    command.upgrade(alembic_config, "head")
+    with engine.begin() as connection:
+        new_id = connection.execute(text(
+            "INSERT INTO callbacks (customer_name, callback_number) VALUES ('Cyrus', '5551230002') RETURNING id"
+        )).scalar()
+        found = connection.execute(text("SELECT rowid FROM callbacks_fts WHERE callbacks_fts MATCH '\"Cyrus\"'")).scalars().all()
+    engine.dispose()
+    # The search triggers survive the table rebuild
+    assert new_id == 3 and found == [3]
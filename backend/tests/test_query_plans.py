@@ -0,0 +1,89 @@
+"""
+The hot queries must be served by indexes: none of them may scan the whole
+callbacks table. Plans come from benchmarks.explain against seeded data.
+"""
+import pytest
+
+from app.crud import callback as crud, callback_claims, callback_sync
+from app.db.database import Base, SessionLocal, engine
+from benchmarks.data import AGENTS
+from benchmarks.explain import captured_statements, explain, filter_combinations
+from benchmarks.seed import seed_callbacks
+
+
+@pytest.fixture(scope="module")
+def connection():
+    seed_callbacks(2000, batch_size=1000)
+    session = SessionLocal()
+    try:
+        connection = session.connection()
+        connection.exec_driver_sql("ANALYZE callbacks")
+        yield session, connection
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+def _problems(connection, statements, **options):
+    assert statements
+    return [
+        (problems, plan)
+        for statement, parameters in statements
+        for problems, plan in [explain(connection, statement, parameters, **options)]
+        if problems
+    ]
+
+
+FILTERS = list(filter_combinations())
+
+
+@pytest.mark.parametrize("name,filters", FILTERS, ids=[name for name, _ in FILTERS])
+def test_list_pages_use_indexes(connection, name, filters):
+    db, connection = connection
+    _, cursor = crud.get_callbacks(db, limit=1, filters=filters, columns=["id"])
+    assert cursor, f"no rows match list[{name}]"
+    with captured_statements(connection) as first_page:
+        crud.get_callbacks(db, limit=1, filters=filters, columns=["id"])
+    with captured_statements(connection) as cursor_page:
+        crud.get_callbacks(db, limit=1, filters=filters, cursor=cursor, columns=["id"])
+
+    # An unfiltered first page may walk the keyset index from the top
+    assert _problems(connection, first_page, seek=name != "none") == []
+    assert _problems(connection, cursor_page) == []
+
+
+@pytest.mark.parametrize("term", ["Honda", "(555) 123"])
+def test_search_uses_indexes(connection, term):
+    db, connection = connection
+    with captured_statements(connection) as statements:
+        crud.search_callbacks(db, term, limit=20, columns=["id"])
+    assert _problems(connection, statements, seek=False, ordered=False) == []
+
+
+def test_claim_queue_uses_partial_index(connection):
+    db, connection = connection
+    with captured_statements(connection) as statements:
+        db.execute(callback_claims.claim_queue(db, AGENTS[0]).limit(1)).all()
+    assert _problems(connection, statements) == []
+    assert all(
+        "ix_callbacks_claim_queue" in explain(connection, statement, parameters)[1]
+        for statement, parameters in statements
+    )
+
+
+def test_changes_use_indexes(connection):
+    db, connection = connection
+    token = callback_sync.get_changes(db, limit=100)["next"]
+    with captured_statements(connection) as statements:
+        callback_sync.get_changes(db, since=token, limit=100)
+    upserts = [(statement, parameters) for statement, parameters in statements if "FROM callbacks" in statement]
+    deletes = [(statement, parameters) for statement, parameters in statements if "FROM callback_tombstones" in statement]
+    assert _problems(connection, upserts) == []
+    assert _problems(connection, deletes, seek=False) == []
+    assert all(
+        "ix_callback_tombstones_deleted_keyset" in explain(connection, statement, parameters)[1]
+        for statement, parameters in deletes
+    )
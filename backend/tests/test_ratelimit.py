@@ -0,0 +1,64 @@
+import asyncio
+
+from starlette.requests import Request
+
+from app.core import proxy, ratelimit
+from app.core.config import settings
+
+
+def _scope(headers=None, host="10.0.0.1"):
+    return {
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": (host, 1234),
+    }
+
+
+def _request(headers=None, host="10.0.0.1", trusted=False):
+    scope = _scope(headers, host)
+    scope[proxy.TRUSTED_PROXY] = trusted
+    return Request(scope)
+
+
+def _through_proxies(scope, trusted_hosts):
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen.update(scope)
+
+    middleware = proxy.TrustedProxyMiddleware(app, trusted_hosts=trusted_hosts)
+    asyncio.run(middleware(scope, None, None))
+    return Request(seen)
+
+
+def test_bucket_rejects_over_burst_with_wait():
+    limiter = ratelimit.TokenBucketLimiter(rate=1, burst=2, max_keys=10)
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == 0
+    assert 0 < limiter.acquire("a") <= 1
+    assert limiter.acquire("b") == 0
+
+
+def test_client_key_prefers_configured_header_from_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_HEADER", "X-Agent-Name")
+    assert ratelimit.client_key(_request({"X-Agent-Name": "Sarah Davis"}, trusted=True)) == "id:Sarah Davis"
+    assert ratelimit.client_key(_request(trusted=True)) == "10.0.0.1"
+
+
+def test_client_key_ignores_header_sent_by_client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_HEADER", "X-Agent-Name")
+    assert ratelimit.client_key(_request({"X-Agent-Name": "Sarah Davis"})) == "10.0.0.1"
+
+
+def test_proxy_middleware_trusts_only_listed_peers(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_HEADER", "X-Agent-Name")
+    headers = {"X-Agent-Name": "Sarah Davis", "X-Forwarded-For": "203.0.113.7"}
+
+    via_proxy = _through_proxies(_scope(headers, host="127.0.0.1"), trusted_hosts="127.0.0.1")
+    assert via_proxy.client.host == "203.0.113.7"
+    assert ratelimit.client_key(via_proxy) == "id:Sarah Davis"
+
+    direct = _through_proxies(_scope(headers, host="10.0.0.1"), trusted_hosts="127.0.0.1")
+    assert direct.client.host == "10.0.0.1"
+    assert ratelimit.client_key(direct) == "10.0.0.1"
+
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.crud import callback as crud
+from app.db import routing
+from app.db.database import Base
+from app.main import app
+from app.models.callback import Callback
+from app.schemas.callback import CallbackCreate
+
+CALLBACK = {"callback_number": "5551230000", "car_make": "Honda", "car_model": "Civic"}
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """
+    A second SQLite file standing in for the replica, holding a different callback than the primary
+    """
+    url = f"sqlite:///{tmp_path}/replica.db"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sync_engine.begin() as connection:
+        connection.execute(insert(Callback).values(customer_name="Replica Copy", **CALLBACK))
+    sync_engine.dispose()
+
+    read_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    monkeypatch.setattr(routing, "read_async_engine", read_engine)
+    monkeypatch.setattr(
+        routing, "AsyncReadSessionLocal",
+        async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    )
+    yield read_engine
+
+
+@pytest.fixture
+def client(db, replica):
+    crud.create_callback(db, CallbackCreate(customer_name="Primary Copy", **CALLBACK))
+    # main only installs the middleware when DATABASE_READ_URL is set at import
+    with TestClient(routing.ReadYourWritesMiddleware(app)) as client:
+        yield client
+
+
+def _names(response):
+    assert response.status_code == 200, response.text
+    return sorted(row["customer_name"] for row in response.json())
+
+
+def test_heavy_reads_go_to_the_replica(client):
+    assert routing.replica_enabled()
+    assert _names(client.get("/api/v1/callbacks/")) == ["Replica Copy"]
+    assert _names(client.get("/api/v1/callbacks/search/", params={"query": "Copy"})) == ["Replica Copy"]
+    # Writes and unrouted reads stay on the primary
+    assert client.get("/api/v1/callbacks/stats").json()["total"] == 1
+
+
+def test_reads_after_a_write_go_to_the_primary(client):
+    response = client.post("/api/v1/callbacks/", json={"customer_name": "New Copy", **CALLBACK})
+    assert response.status_code in (200, 201), response.text
+    assert routing.WROTE_COOKIE in response.cookies
+    assert _names(client.get("/api/v1/callbacks/")) == ["New Copy", "Primary Copy"]
+
+
+def test_write_cookie_expires(client):
+    expired = time.time() - settings.READ_YOUR_WRITES_SECONDS - 1
+    client.cookies.set(routing.WROTE_COOKIE, f"{expired:.3f}")
+    assert _names(client.get("/api/v1/callbacks/")) == ["Replica Copy"]
+    client.cookies.set(routing.WROTE_COOKIE, f"{time.time():.3f}")
+    assert _names(client.get("/api/v1/callbacks/")) == ["Primary Copy"]
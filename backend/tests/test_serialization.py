@@ -0,0 +1,22 @@
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+
+from app.crud import callback as crud
+from app.models.callback import Callback
+from app.schemas.callback import CallbackCreate, CallbackResponse
+from app.services.callback_serialization import RESPONSE_COLUMNS, rows_to_json
+
+
+def test_rows_encode_like_the_response_model(db):
+    callback = crud.create_callback(db, CallbackCreate(
+        customer_name="Zoë Müller", callback_number="5551230000", car_make="Škoda",
+        follow_up_date=date(2026, 10, 20), lead_score=62.5
+    ))
+    assert callback.created_at is not None and callback.agent_name is None
+
+    row = db.execute(select(*(getattr(Callback, name) for name in RESPONSE_COLUMNS))).one()
+    expected = JSONResponse(jsonable_encoder([CallbackResponse.model_validate(callback)])).body
+    assert rows_to_json([tuple(row)]) == expected
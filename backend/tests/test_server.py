@@ -0,0 +1,42 @@
+from app import server
+from app.core.config import settings
+
+
+def _defaults(monkeypatch, database_url):
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "")
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", True)
+    monkeypatch.setattr(settings, "EVENTS_BROKER", "")
+    # Restored after the test, since share_process_state exports its choices
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("EVENTS_BROKER", "")
+
+
+def test_single_worker_keeps_process_state(monkeypatch):
+    _defaults(monkeypatch, "sqlite:///crm.db")
+    server.share_process_state(1)
+    assert settings.CACHE_ENABLED and settings.EVENTS_BROKER == ""
+
+
+def test_several_workers_disable_memory_cache(monkeypatch):
+    _defaults(monkeypatch, "sqlite:///crm.db")
+    server.share_process_state(4)
+    assert settings.CACHE_ENABLED is False
+    assert settings.EVENTS_BROKER == ""
+
+
+def test_shared_event_broker_is_opt_in(monkeypatch, caplog):
+    _defaults(monkeypatch, "postgresql://crm@db/crm")
+    # Alembic's logging setup in other tests disables loggers created before it
+    monkeypatch.setattr(server.logger, "disabled", False)
+    server.share_process_state(4)
+    assert settings.EVENTS_BROKER == ""
+    assert "EVENTS_BROKER" in caplog.text
+
+
+def test_shared_cache_backend_is_kept(monkeypatch):
+    _defaults(monkeypatch, "sqlite:///crm.db")
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "myapp.cache.RedisCache")
+    server.share_process_state(4)
+    assert settings.CACHE_ENABLED is True
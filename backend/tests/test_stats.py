@@ -0,0 +1,58 @@
+from datetime import date
+
+from sqlalchemy import String, cast, func, literal, select
+
+from app.crud import callback as crud
+from app.crud.callback_stats import DIMENSIONS
+from app.models.callback import Callback
+from app.models.callback_stats import CallbackStat
+from app.schemas.callback import CallbackCreate, CallbackUpdate
+
+
+def _recount(db):
+    """
+    callback_stats as a GROUP BY over callbacks would compute it
+    """
+    totals = {}
+    for dimension, field in [("total", None)] + list(DIMENSIONS.items()):
+        value = func.coalesce(cast(getattr(Callback, field), String), "") if field else literal("")
+        query = select(value, func.count(), func.coalesce(func.sum(Callback.lead_score), 0.0), func.count(Callback.lead_score))
+        if field:
+            query = query.group_by(value)
+        for key, count, score_sum, score_count in db.execute(query):
+            if count:
+                totals[(dimension, key)] = (count, score_sum, score_count)
+    return totals
+
+
+def _stats(db):
+    return {
+        (stat.dimension, stat.value): (stat.count, stat.lead_score_sum, stat.lead_score_count)
+        for stat in db.query(CallbackStat).filter(CallbackStat.count > 0)
+    }
+
+
+def test_stats_match_a_recount_after_every_kind_of_write(db):
+    def lead(name, number, **fields):
+        return CallbackCreate(customer_name=name, callback_number=number, car_make="Honda", car_model="Civic", **fields)
+
+    ann = crud.create_callback(db, lead("Ann Lee", "5551230000", agent_name="Sarah Davis", lead_score=40))
+    bob = crud.create_callback(db, lead("Bob Ray", "5551230001", follow_up_date=date(2026, 10, 20)))
+    assert _stats(db) == _recount(db)
+
+    crud.update_callback(db, ann.id, CallbackUpdate(status="No Answer", lead_score=70, follow_up_date=date(2026, 10, 21)))
+    assert _stats(db) == _recount(db)
+
+    assert crud.bulk_update_callbacks(db, {"agent_name": "Mike Chen", "status": "Follow-up Later"}, ids=[ann.id, bob.id]) == 2
+    assert _stats(db) == _recount(db)
+
+    assert crud.delete_callback(db, bob.id)
+    assert _stats(db) == _recount(db)
+
+    inserted, updated = crud.bulk_create_callbacks(db, [
+        lead("Ann Lee", "(555) 123-0000", status="Sale", lead_score=90),
+        lead("Cyrus Vance", "5551230002", agent_name="Sarah Davis", lead_score=15),
+    ], upsert=True)
+    assert (inserted, updated) == (1, 1)
+    assert _stats(db) == _recount(db)
+    assert _stats(db)[("total", "")] == (2, 105.0, 2)
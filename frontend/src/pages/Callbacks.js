@@ -50,6 +50,14 @@ export default function Callbacks() {
     }
   );
 
+  // Refetch when another agent changes a callback in the current view instead of polling
+  useEffect(() => {
+    return callbacksApi.subscribeToChanges(
+      { status: filters.status, agent_name: filters.agent_name },
+      () => queryClient.invalidateQueries('callbacks')
+    );
+  }, [filters.status, filters.agent_name, queryClient]);
+
   // Dashboard summary stats
   const pendingCallbacks = callbacks.filter(c => c.status === 'Pending').length;
   const todayCallbacks = callbacks.filter(c => {
@@ -5,6 +5,8 @@ const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api
 
 const api = axios.create({
   baseURL: API_BASE_URL,
+  // Carries the API's write cookie so our reads see our own updates when a read replica is in use
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -47,6 +49,19 @@ export const callbacksApi = {
     const { data } = await api.get(`/callbacks/search?query=${encodeURIComponent(query)}`);
     return data;
   },
+
+  // Subscribe to server-sent change events; returns a function that closes the stream.
+  // The browser reconnects on its own and resumes with Last-Event-ID.
+  subscribeToChanges: ({ status, agent_name } = {}, onEvent) => {
+    const params = new URLSearchParams();
+    if (status) params.set('status', status);
+    if (agent_name) params.set('agent_name', agent_name);
+    const source = new EventSource(`${API_BASE_URL}/callbacks/events?${params}`);
+    const eventTypes = ['created', 'updated', 'deleted', 'bulk_updated', 'bulk_deleted', 'imported', 'scored', 'merged', 'archived', 'reset'];
+    const handler = (message) => onEvent(message.type, JSON.parse(message.data));
+    eventTypes.forEach((type) => source.addEventListener(type, handler));
+    return () => source.close();
+  },
 };
 
 export default api;
\ No newline at end of file